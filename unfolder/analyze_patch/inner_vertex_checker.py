@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class BoundingRect:
     def __init__(self):
         self._left   = None
@@ -6,7 +9,7 @@ class BoundingRect:
         self._bottom = None
 
     def add(self, vertex):
-        if self._left:
+        if self._left is not None:
             self._left   = min(x(vertex), self._left)
             self._top    = max(y(vertex), self._top)
             self._right  = max(x(vertex), self._right)
@@ -20,12 +23,24 @@ class BoundingRect:
     def contains(self, vertex):
         return self._left < x(vertex) < self._right and self._bottom < y(vertex) < self._top
 
+    def containsAll(self, vertices):
+        """ Whether each of the vertices (M x 2) is strictly inside, an empty rect contains nothing. """
+        if self._left is None:
+            return np.zeros(len(vertices), dtype=bool)
+        return (self._left < vertices[:, 0]) & (vertices[:, 0] < self._right) \
+            & (self._bottom < vertices[:, 1]) & (vertices[:, 1] < self._top)
+
 
 class InnerVertexChecker:
+    """ Test points against the polygon bounded by a set of edges.
+
+    The edges do not have to be in loop order, a point is inside if a ray
+    from it to the left crosses an odd number of edges. Points outside of
+    the bounding rectangle, or on its border, are outside right away.
+    """
 
     def __init__(self, edges):
-        upwardEdges = [makeEdgeUpward(edge) for edge in edges]
-        self._edges = sorted(upwardEdges, key=fstY)
+        self._edges = np.array(edges, dtype=float).reshape(-1, 2, 2)
         boundingRect = BoundingRect()
         for edge in edges:
             boundingRect.add(fst(edge))
@@ -33,15 +48,58 @@ class InnerVertexChecker:
         self._boundingRect = boundingRect
 
     def isInnerVertex(self, vertex):
-        if not self._boundingRect.contains(vertex):
-            return False
-        scanlineY = y(vertex)
-        intersectingEdges = getIntersectingEdges(scanlineY, self._edges)
-        numIntersectionsLeftOfVertex = 0
-        for edge in intersectingEdges:
-            if xIntersection(scanlineY, edge) < x(vertex):
-                numIntersectionsLeftOfVertex += 1
-        return numIntersectionsLeftOfVertex % 2 != 0
+        return bool(self.areInnerVertices([(x(vertex), y(vertex))])[0])
+
+    def areInnerVertices(self, vertices):
+        """ Whether the vertices (M x 2) are inside, one flag per vertex. """
+        vertices = np.asarray(vertices, dtype=float).reshape(-1, 2)
+        retval = np.zeros(len(vertices), dtype=bool)
+        candidates = np.flatnonzero(self._boundingRect.containsAll(vertices))
+        crossings = _crosses(vertices[candidates, np.newaxis], self._edges[np.newaxis, :, 0],
+                             self._edges[np.newaxis, :, 1])
+        retval[candidates] = np.count_nonzero(crossings, axis=1) % 2 == 1
+        return retval
+
+
+def pointsInPolygons(points, polygons):
+    """ Which points are inside which polygons, an M x K boolean matrix.
+
+    The polygons are a list of vertex loops, a single N x 2 loop is one
+    polygon. Only the points inside the bounding box of a polygon are tested
+    against its edges, with the crossing number of a ray to the left. Points
+    on the boundary may end up inside or outside.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if isinstance(polygons, np.ndarray) and polygons.ndim == 2:
+        polygons = [polygons]
+    polygons = [np.asarray(polygon, dtype=float).reshape(-1, 2) for polygon in polygons]
+    retval = np.zeros((len(points), len(polygons)), dtype=bool)
+    sizes = np.array([len(polygon) for polygon in polygons], dtype=np.int64)
+    polygons = [polygon for polygon in polygons if len(polygon)]
+    if not polygons or not len(points):
+        return retval
+    offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    begins = np.concatenate(polygons)
+    # edge i runs from vertex i to the next vertex of its loop
+    following = np.arange(1, len(begins) + 1)
+    hasVertices = sizes > 0
+    following[offsets[1:][hasVertices] - 1] = offsets[:-1][hasVertices]
+    ends = begins[following]
+
+    lows = np.full((len(sizes), 2), np.inf)
+    highs = np.full((len(sizes), 2), -np.inf)
+    lows[hasVertices] = np.minimum.reduceat(begins, offsets[:-1][hasVertices])
+    highs[hasVertices] = np.maximum.reduceat(begins, offsets[:-1][hasVertices])
+    (pointIndices, polygonIndices) = np.nonzero(np.all((lows <= points[:, np.newaxis])
+                                                       & (points[:, np.newaxis] <= highs), axis=2))
+    counts = sizes[polygonIndices]
+    pairs = np.repeat(np.arange(len(pointIndices)), counts)
+    edges = np.repeat(offsets[polygonIndices] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+    crossings = _crosses(points[pointIndices[pairs]], begins[edges], ends[edges])
+    inside = np.bincount(pairs, crossings, len(pointIndices)) % 2 == 1
+    retval[pointIndices[inside], polygonIndices[inside]] = True
+    return retval
 
 
 def xIntersection(p_y, edge):
@@ -70,7 +128,7 @@ def fstY(edge):
 
 
 def makeEdgeUpward(edge):
-    if y(snd(edge)) < y(snd(edge)):
+    if y(snd(edge)) < y(fst(edge)):
         return [snd(edge), fst(edge)]
     else:
         return edge
@@ -89,4 +147,16 @@ def x(vertex):
 
 
 def y(vertex):
-    return vertex[1]
\ No newline at end of file
+    return vertex[1]
+
+
+# private
+
+
+def _crosses(points, begins, ends):
+    """ Whether the edges cross the rays from the points to the left, broadcasting all arguments. """
+    (pointX, pointY) = (points[..., 0], points[..., 1])
+    (beginX, beginY, endX, endY) = (begins[..., 0], begins[..., 1], ends[..., 0], ends[..., 1])
+    isBetween = (beginY > pointY) != (endY > pointY)
+    heights = np.where(isBetween, endY - beginY, 1.)
+    return isBetween & ((pointY - beginY) * (endX - beginX) / heights + beginX < pointX)
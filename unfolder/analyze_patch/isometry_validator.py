@@ -0,0 +1,136 @@
+import numpy as np
+
+from unfolder.mesh.mesh_impl import MeshImpl
+from unfolder.model.model import Model
+
+
+def validateIsometry(mesh: MeshImpl, model: Model, numWorstFaces=10):
+    """ Compare an unfolded model with its mesh, see IsometryValidator. """
+    return IsometryValidator(mesh, numWorstFaces).validate(model)
+
+
+class IsometryValidator:
+    """ Check that unfolded models are congruent to their mesh face by face.
+
+    Every patch boundary edge is mapped back to the mesh edge it was unfolded
+    from (ModelImpl.edgeSources). Its length is compared with the length of
+    the mesh edge and the angle it makes with the next boundary edge with
+    the angle between the corresponding mesh edges. Length errors are
+    relative to the mesh edge length, angle errors are in radians. The error
+    of a face is the largest length or angle error of its patch.
+
+    The mesh arrays are set up once, so validating each of many models
+    unfolded from the same mesh costs a few array operations.
+    """
+    def __init__(self, mesh: MeshImpl, numWorstFaces=10):
+        self.numWorstFaces = numWorstFaces
+        self._vertices = np.array(mesh.vertices, dtype=float).reshape(-1, 3)
+        self._edgeVertices = np.array([edge.vertices for edge in mesh.edges], dtype=np.int64).reshape(-1, 2)
+
+    def validate(self, model: Model):
+        impl = model.impl
+        loopOffsets = impl.loopOffsets
+        loopSizes = np.diff(loopOffsets)
+        loopEdges = impl.loopEdges
+        meshEdges = impl.edgeSources[loopEdges]
+        if np.any(meshEdges < 0):
+            raise ValueError('Error the model does not know the mesh edges of all its edges')
+        # vertex i of a loop is shared by edge i and the next edge
+        nextEdges = np.arange(1, len(loopEdges) + 1)
+        hasEdges = loopSizes > 0
+        nextEdges[loopOffsets[1:][hasEdges] - 1] = loopOffsets[:-1][hasEdges]
+
+        modelVertices = _padTo3d(impl.vertexArray)
+        modelLengths = _edgeLengths(modelVertices, impl.edgeVertices[loopEdges])
+        meshLengths = _edgeLengths(self._vertices, self._edgeVertices[meshEdges])
+        lengthErrors = np.abs(modelLengths - meshLengths) / np.where(meshLengths > 0, meshLengths, 1.)
+
+        modelAngles = _cornerAngles(modelVertices, impl.edgeVertices[loopEdges],
+                                    impl.edgeVertices[loopEdges[nextEdges]], impl.loopVertices)
+        meshCorners = self._sharedVertices(meshEdges, meshEdges[nextEdges])
+        meshAngles = _cornerAngles(self._vertices, self._edgeVertices[meshEdges],
+                                   self._edgeVertices[meshEdges[nextEdges]], meshCorners)
+        angleErrors = np.abs(modelAngles - meshAngles)
+
+        patchErrors = np.zeros(len(loopSizes))
+        if np.any(hasEdges):
+            patchErrors[hasEdges] = np.maximum.reduceat(np.maximum(lengthErrors, angleErrors),
+                                                        loopOffsets[:-1][hasEdges])
+        faces = np.array([patch.name for patch in impl.patches], dtype=np.int64)
+        worst = np.argsort(-patchErrors, kind='stable')[:self.numWorstFaces]
+        return IsometryReport(lengthErrors, angleErrors, faces, patchErrors, faces[worst], patchErrors[worst])
+
+    # private
+
+    def _sharedVertices(self, fstEdges, sndEdges):
+        (fst, snd) = (self._edgeVertices[fstEdges], self._edgeVertices[sndEdges])
+        isFirst = (fst[:, 0] == snd[:, 0]) | (fst[:, 0] == snd[:, 1])
+        return np.where(isFirst, fst[:, 0], fst[:, 1])
+
+
+class IsometryReport:
+    """ The errors of an unfolded model, see IsometryValidator.
+
+    lengthErrors     the relative length error of every patch boundary edge, in the order of ModelImpl.loopEdges
+    angleErrors      the angle error at every patch boundary vertex, in the order of ModelImpl.loopVertices
+    faces            the face of every patch
+    faceErrors       the largest error of every patch
+    worstFaces       the faces with the largest errors, worst first
+    worstFaceErrors  their errors
+    """
+    def __init__(self, lengthErrors, angleErrors, faces, faceErrors, worstFaces, worstFaceErrors):
+        self.lengthErrors = lengthErrors
+        self.angleErrors = angleErrors
+        self.faces = faces
+        self.faceErrors = faceErrors
+        self.worstFaces = worstFaces
+        self.worstFaceErrors = worstFaceErrors
+
+    @property
+    def maxLengthError(self):
+        return float(self.lengthErrors.max(initial=0.))
+
+    @property
+    def rmsLengthError(self):
+        return _rms(self.lengthErrors)
+
+    @property
+    def maxAngleError(self):
+        return float(self.angleErrors.max(initial=0.))
+
+    @property
+    def rmsAngleError(self):
+        return _rms(self.angleErrors)
+
+    def isValid(self, tolerance=1e-6):
+        return self.maxLengthError <= tolerance and self.maxAngleError <= tolerance
+
+    def __repr__(self):
+        return 'length error max %g rms %g, angle error max %g rms %g, worst faces %r' \
+            % (self.maxLengthError, self.rmsLengthError, self.maxAngleError, self.rmsAngleError,
+               self.worstFaces.tolist())
+
+
+# private
+
+
+def _padTo3d(vertices):
+    vertices = np.asarray(vertices, dtype=float).reshape(len(vertices), -1)
+    return np.pad(vertices, ((0, 0), (0, 3 - vertices.shape[1]))) if vertices.shape[1] < 3 else vertices
+
+
+def _edgeLengths(vertices, edgeVertices):
+    return np.linalg.norm(vertices[edgeVertices[:, 1]] - vertices[edgeVertices[:, 0]], axis=1)
+
+
+def _cornerAngles(vertices, fstEdges, sndEdges, corners):
+    """ The angles at the corners between the edges meeting there, in [0, pi]. """
+    fstOthers = fstEdges.sum(axis=1) - corners
+    sndOthers = sndEdges.sum(axis=1) - corners
+    fst = vertices[fstOthers] - vertices[corners]
+    snd = vertices[sndOthers] - vertices[corners]
+    return np.arctan2(np.linalg.norm(np.cross(fst, snd), axis=1), np.einsum('ij,ij->i', fst, snd))
+
+
+def _rms(errors):
+    return float(np.sqrt(np.mean(np.square(errors)))) if len(errors) else 0.
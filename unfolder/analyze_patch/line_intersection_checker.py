@@ -8,8 +8,9 @@ def intersect(edge1, edge2):
         return False
 
 def intersection(edge1, edge2):
-    v = connector(edge1)
-    w = connector(edge2)
+    """ The parameters (x, y) of the intersection edge1(x) = edge2(y) of the lines through the edges, None if they are parallel. """
+    v = edgeVector(edge1)
+    w = edgeVector(edge2)
     xi = cross(v, w)
 
     if xi == 0:
@@ -25,16 +26,16 @@ def f(c, mu):
     return x(c) * y(mu) - y(c) * x(mu)
 
 def xi(v, w):
-    x(v) * y(w)
+    return x(v) * y(w)
 
 def cross(a, b):
-    x(a) * y(b) - x(b) * y(a)
+    return x(a) * y(b) - x(b) * y(a)
 
 def connector(start, end):
-    (x(end) - x(start), y(end) - y(start))
+    return (x(end) - x(start), y(end) - y(start))
 
 def edgeVector(edge):
-    connector(snd(edge), fst(edge))
+    return connector(fst(edge), snd(edge))
 
 def fst(edge):
     return edge[0]
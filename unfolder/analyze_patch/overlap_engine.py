@@ -0,0 +1,155 @@
+import numpy as np
+
+from unfolder.analyze_patch.polygon_overlap import convexPolygonsOverlap, triangulate
+from unfolder.model.model import Model
+from unfolder.util.uniform_grid import boxPairs
+
+
+def findOverlappingPatches(model: Model, tolerance=1e-7):
+    """ The index pairs (i, j), i < j, of the overlapping patches of a model, see OverlapEngine. """
+    return OverlapEngine.fromModel(model, tolerance).findOverlaps()
+
+
+class OverlapEngine:
+    """ Find the overlapping polygons of an unfolded sheet.
+
+    The broad phase pairs the polygons whose bounding boxes overlap with a
+    uniform grid (see boxPairs). The narrow phase splits every polygon into
+    convex pieces, a convex polygon is its own piece and concave ones are
+    triangulated once, and runs separating axis tests on all piece pairs of
+    the candidate pairs at once (see convexPolygonsOverlap). Two pieces
+    overlap if their projections onto every edge normal of both overlap by
+    at least tolerance. So polygons sharing a hinge edge or a vertex, or
+    overlapping by less than tolerance, do not overlap.
+
+    The polygons are given in CSR form, the vertex loop of polygon i is
+    vertices[offsets[i]:offsets[i + 1]].
+    """
+    def __init__(self, vertices, offsets, tolerance=1e-7):
+        self.tolerance = tolerance
+        self.vertices = np.asarray(vertices, dtype=float).reshape(-1, 2)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        sizes = np.diff(self.offsets)
+        self._boxes = np.full((len(sizes), 2, 2), np.nan)
+        hasVertices = sizes > 0
+        if np.any(hasVertices):
+            begins = self.offsets[:-1][hasVertices]
+            self._boxes[hasVertices, 0] = np.minimum.reduceat(self.vertices, begins)
+            self._boxes[hasVertices, 1] = np.maximum.reduceat(self.vertices, begins)
+        self._splitIntoPieces()
+
+    @classmethod
+    def fromPolygons(cls, polygons, tolerance=1e-7):
+        polygons = [np.asarray(polygon, dtype=float).reshape(-1, 2) for polygon in polygons]
+        offsets = np.zeros(len(polygons) + 1, dtype=np.int64)
+        np.cumsum([len(polygon) for polygon in polygons], out=offsets[1:])
+        return cls(np.concatenate(polygons) if polygons else np.empty((0, 2)), offsets, tolerance)
+
+    @classmethod
+    def fromModel(cls, model: Model, tolerance=1e-7):
+        """ The engine for the patches of a model, patches without a boundary loop have no area. """
+        impl = model.impl
+        return cls(impl.vertexArray[impl.loopVertices, :2], impl.loopOffsets, tolerance)
+
+    def findOverlaps(self):
+        """ All overlapping pairs (i, j), i < j, as P x 2 array. """
+        hasArea = np.flatnonzero(np.diff(self._polygonPieces) > 0)
+        pairs = hasArea[boxPairs(self._boxes[hasArea])]
+        return pairs[self.overlap(pairs[:, 0], pairs[:, 1])]
+
+    def overlap(self, fstPolygons, sndPolygons):
+        """ Whether the polygon pairs overlap, one flag per pair. """
+        fstPolygons = np.asarray(fstPolygons, dtype=np.int64)
+        sndPolygons = np.asarray(sndPolygons, dtype=np.int64)
+        fstCounts = np.diff(self._polygonPieces)[fstPolygons]
+        sndCounts = np.diff(self._polygonPieces)[sndPolygons]
+        # all combinations of the pieces of each pair
+        counts = fstCounts * sndCounts
+        pairs = np.repeat(np.arange(len(fstPolygons)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        fstPieces = self._pieces[self._polygonPieces[fstPolygons][pairs] + local // sndCounts[pairs]]
+        sndPieces = self._pieces[self._polygonPieces[sndPolygons][pairs] + local % sndCounts[pairs]]
+        overlaps = self._piecesOverlap(fstPieces, sndPieces)
+        return np.bincount(pairs[overlaps], minlength=len(fstPolygons)) > 0
+
+    # private
+
+    def _splitIntoPieces(self):
+        """ The convex pieces of the polygons, polygon i consists of pieces[polygonPieces[i]:polygonPieces[i + 1]].
+
+        Convex polygons are the first pieces, the triangles of the concave
+        ones are appended.
+        """
+        (offsets, vertices) = (self.offsets, self.vertices)
+        sizes = np.diff(offsets)
+        isConvex = (sizes >= 3) & _areConvex(vertices, offsets)
+        isConcave = (sizes >= 3) & ~isConvex
+        triangles = [triangulate(vertices[offsets[polygon]:offsets[polygon + 1]].tolist())
+                     for polygon in np.flatnonzero(isConcave).tolist()]
+        numPieces = np.where(isConvex, 1, 0)
+        numPieces[isConcave] = [len(polygonTriangles) for polygonTriangles in triangles]
+        self._polygonPieces = np.zeros(len(sizes) + 1, dtype=np.int64)
+        np.cumsum(numPieces, out=self._polygonPieces[1:])
+        self._pieces = np.zeros(self._polygonPieces[-1], dtype=np.int64)
+        self._pieces[self._polygonPieces[:-1][isConvex]] = np.flatnonzero(isConvex)
+        self._pieces[np.repeat(isConcave, numPieces)] = len(sizes) + np.arange(int(numPieces[isConcave].sum()))
+
+        triangleVertices = np.array([vertex for polygonTriangles in triangles for triangle in polygonTriangles
+                                     for vertex in triangle], dtype=float).reshape(-1, 2)
+        self._pieceSizes = np.concatenate((sizes, [len(triangle) for polygonTriangles in triangles
+                                                   for triangle in polygonTriangles])).astype(np.int64)
+        self._pieceOffsets = np.zeros(len(self._pieceSizes) + 1, dtype=np.int64)
+        np.cumsum(self._pieceSizes, out=self._pieceOffsets[1:])
+        self._pieceVertices = np.concatenate((vertices, triangleVertices))
+        self._pieceBoxes = np.full((len(self._pieceSizes), 2, 2), np.nan)
+        hasVertices = np.flatnonzero(self._pieceSizes > 0)
+        if len(hasVertices):
+            begins = self._pieceOffsets[hasVertices]
+            self._pieceBoxes[hasVertices, 0] = np.minimum.reduceat(self._pieceVertices, begins)
+            self._pieceBoxes[hasVertices, 1] = np.maximum.reduceat(self._pieceVertices, begins)
+
+    def _piecesOverlap(self, fstPieces, sndPieces):
+        """ Separating axis tests of piece pairs, batched by the padded size of the larger piece. """
+        # overlapping boxes are necessary, this drops pieces that only touch right away
+        (fstBoxes, sndBoxes) = (self._pieceBoxes[fstPieces], self._pieceBoxes[sndPieces])
+        overlaps = np.all(np.minimum(fstBoxes[:, 1], sndBoxes[:, 1]) - np.maximum(fstBoxes[:, 0], sndBoxes[:, 0])
+                          > self.tolerance, axis=1)
+        candidates = np.flatnonzero(overlaps)
+        sizes = np.maximum(self._pieceSizes[fstPieces[candidates]], self._pieceSizes[sndPieces[candidates]])
+        paddedSizes = _padSizes(sizes)
+        for paddedSize in np.unique(paddedSizes).tolist():
+            batch = candidates[paddedSizes == paddedSize]
+            overlaps[batch] = convexPolygonsOverlap(self._padPieces(fstPieces[batch], paddedSize),
+                                                    self._padPieces(sndPieces[batch], paddedSize), self.tolerance)
+        return overlaps
+
+    def _padPieces(self, pieces, paddedSize):
+        """ The vertices of pieces padded by repeating the last vertex. """
+        sizes = self._pieceSizes[pieces][:, np.newaxis]
+        positions = np.arange(paddedSize)[np.newaxis, :]
+        return self._pieceVertices[self._pieceOffsets[pieces][:, np.newaxis] + np.minimum(positions, sizes - 1)]
+
+
+# private
+
+
+def _areConvex(vertices, offsets):
+    """ Whether the polygons turn in one direction only, collinear edges are fine. """
+    sizes = np.diff(offsets)
+    hasVertices = sizes > 0
+    following = np.arange(1, len(vertices) + 1)
+    following[offsets[1:][hasVertices] - 1] = offsets[:-1][hasVertices]
+    edges = vertices[following] - vertices
+    nextEdges = edges[following]
+    turns = edges[:, 0] * nextEdges[:, 1] - edges[:, 1] * nextEdges[:, 0]
+    retval = np.ones(len(sizes), dtype=bool)
+    if np.any(hasVertices):
+        begins = offsets[:-1][hasVertices]
+        retval[hasVertices] = (np.minimum.reduceat(turns, begins) >= 0) | (np.maximum.reduceat(turns, begins) <= 0)
+    return retval
+
+
+def _padSizes(sizes):
+    """ The sizes rounded up to powers of two, at least 4. """
+    return np.maximum(4, 1 << np.ceil(np.log2(np.maximum(sizes, 1))).astype(np.int64))
+
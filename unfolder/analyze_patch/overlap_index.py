@@ -0,0 +1,141 @@
+import math
+
+from unfolder.analyze_patch.polygon_overlap import polygonsOverlap
+
+# what OverlapIndex.add does about an overlap
+ABORT = 'abort'
+RECORD = 'record'
+CALLBACK = 'callback'
+
+
+class OverlapError(Exception):
+    def __init__(self, key, others):
+        super().__init__('Error ' + repr(key) + ' overlaps ' + repr(others))
+        self.key = key
+        self.others = others
+
+
+class OverlapIndex:
+    """ The polygons placed so far, every new one is tested against them right away.
+
+    The polygons are kept in a hash grid, a dict from cell to the keys of
+    the polygons whose bounding boxes cover the cell. A new polygon is only
+    tested against the polygons sharing a cell with it and having an
+    overlapping bounding box, see polygonsOverlap for the exact test. So
+    faces touching in hinge edges or vertices do not overlap.
+
+    On an overlap add follows the policy: ABORT raises an OverlapError,
+    RECORD appends the (key, other key) pairs to overlaps and CALLBACK calls
+    callback(key, other keys). Polygons can be removed again, so a search
+    can undo placements.
+
+    The cell size defaults to the largest extent of the first polygon, faces
+    of a mesh are about the same size. treeToModel and unfoldTree set it to
+    the mean face extent of the mesh instead (see useFaceExtent).
+    """
+    def __init__(self, policy=ABORT, callback=None, tolerance=1e-9, cellSize=None):
+        if policy not in (ABORT, RECORD, CALLBACK):
+            raise ValueError('Error unknown overlap policy ' + repr(policy))
+        if policy == CALLBACK and callback is None:
+            raise ValueError('Error the callback policy needs a callback')
+        self.policy = policy
+        self.callback = callback
+        self.tolerance = tolerance
+        self.cellSize = cellSize
+        self.overlaps = []
+        self._polygons = {}
+        self._boxes = {}
+        self._cells = {}
+        # the number of the add that placed a polygon
+        self._placements = {}
+        self._numPlacements = 0
+
+    def useFaceExtent(self, faceExtent):
+        """ Use faceExtent as cell size, unless a cell size is set already. """
+        if self.cellSize is None and faceExtent > 0:
+            self.cellSize = faceExtent
+
+    def __len__(self):
+        return len(self._polygons)
+
+    def __contains__(self, key):
+        return key in self._polygons
+
+    def getPolygon(self, key):
+        return self._polygons[key]
+
+    def findOverlaps(self, polygon):
+        """ The keys of the placed polygons overlapping polygon, in the order they were added. """
+        polygon = _toList(polygon)
+        if not polygon or self.cellSize is None:
+            return []
+        box = _boundingBox(polygon)
+        candidates = set()
+        for cell in self._coveredCells(box):
+            candidates.update(self._cells.get(cell, ()))
+        return [key for key in sorted(candidates, key=self._placements.__getitem__)
+                if _boxesOverlap(box, self._boxes[key])
+                and polygonsOverlap(self._polygons[key], polygon, self.tolerance)]
+
+    def add(self, key, polygon):
+        """ Place a polygon, returns the keys of the placed polygons it overlaps. """
+        if key in self._polygons:
+            raise ValueError('Error ' + repr(key) + ' is already placed')
+        polygon = _toList(polygon)
+        if self.cellSize is None and polygon:
+            box = _boundingBox(polygon)
+            extent = max(box[2] - box[0], box[3] - box[1])
+            self.cellSize = extent if extent > 0 else 1.
+        others = self.findOverlaps(polygon)
+        if others and self.policy == ABORT:
+            raise OverlapError(key, others)
+        self._polygons[key] = polygon
+        self._placements[key] = self._numPlacements
+        self._numPlacements += 1
+        if polygon:
+            box = self._boxes[key] = _boundingBox(polygon)
+            for cell in self._coveredCells(box):
+                self._cells.setdefault(cell, []).append(key)
+        if others:
+            if self.policy == RECORD:
+                self.overlaps.extend((key, other) for other in others)
+            else:
+                self.callback(key, others)
+        return others
+
+    def remove(self, key):
+        polygon = self._polygons.pop(key)
+        del self._placements[key]
+        if not polygon:
+            return
+        for cell in self._coveredCells(self._boxes.pop(key)):
+            keys = self._cells[cell]
+            keys.remove(key)
+            if not keys:
+                del self._cells[cell]
+
+    # private
+
+    def _coveredCells(self, box):
+        (minX, minY, maxX, maxY) = box
+        cellSize = self.cellSize
+        rows = range(math.floor(minY / cellSize), math.floor(maxY / cellSize) + 1)
+        return [(column, row) for column in range(math.floor(minX / cellSize), math.floor(maxX / cellSize) + 1)
+                for row in rows]
+
+
+# private
+
+
+def _toList(polygon):
+    return polygon.tolist() if hasattr(polygon, 'tolist') else [tuple(vertex) for vertex in polygon]
+
+
+def _boundingBox(polygon):
+    xs = [vertex[0] for vertex in polygon]
+    ys = [vertex[1] for vertex in polygon]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _boxesOverlap(fst, snd):
+    return fst[0] < snd[2] and snd[0] < fst[2] and fst[1] < snd[3] and snd[1] < fst[3]
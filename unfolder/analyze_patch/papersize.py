@@ -1,4 +1,5 @@
 import maya.OpenMaya as om
+import numpy as np
 
 from unfolder.util.plane_coordinate_system import PlaneCoordinateSystem
 from unfolder.model.model_builder_old import MeshPatchBuilder
@@ -11,16 +12,15 @@ def boundingRects(mappingPlaneNormal, vertices):
         e2 = e1 ^ om.MVector(mappingPlaneNormal)
         e2.normalize()
 
-        return PlaneCoordinateSystem(vertex1, e1, e2)
+        return PlaneCoordinateSystem((vertex1.x, vertex1.y, vertex1.z), (e1.x, e1.y, e1.z), (e2.x, e2.y, e2.z))
 
     def getBoundingRect(coordinateSystem):
-        boundingRect = om.MBoundingBox()
-
-        for vertex in vertices:
-            (x, y) = coordinateSystem.toLocal(vertex)
-            boundingRect.expand(om.MPoint(x, y, 0))
-        return boundingRect
+        localPositions = coordinateSystem.toLocalMany(positions)
+        (minX, minY) = localPositions.min(axis=0)
+        (maxX, maxY) = localPositions.max(axis=0)
+        return om.MBoundingBox(om.MPoint(minX, minY, 0), om.MPoint(maxX, maxY, 0))
 
+    positions = np.array([(vertex.x, vertex.y, vertex.z) for vertex in vertices])
 
     for i, vertex1 in enumerate(vertices):
         for vertex2 in vertices[i + 1:]:
@@ -79,10 +79,10 @@ def fitObjectsInSelectionListOnPaper(selectionListIter):
         rectMax = rect.max()
 
         vertices = om.MPointArray()
-        vertices.append(om.MPoint(coords.toGlobal((rectMin[0], rectMin[1]))))
-        vertices.append(om.MPoint(coords.toGlobal((rectMax[0], rectMin[1]))))
-        vertices.append(om.MPoint(coords.toGlobal((rectMax[0], rectMax[1]))))
-        vertices.append(om.MPoint(coords.toGlobal((rectMin[0], rectMax[1]))))
+        vertices.append(om.MPoint(*coords.toGlobal((rectMin[0], rectMin[1]))))
+        vertices.append(om.MPoint(*coords.toGlobal((rectMax[0], rectMin[1]))))
+        vertices.append(om.MPoint(*coords.toGlobal((rectMax[0], rectMax[1]))))
+        vertices.append(om.MPoint(*coords.toGlobal((rectMin[0], rectMax[1]))))
 
         builder = MeshPatchBuilder()
         builder.addFace(0, vertices)
@@ -0,0 +1,195 @@
+import math
+
+import numpy as np
+
+
+def polygonsOverlap(fst, snd, tolerance=1e-9):
+    """ Check whether the interiors of two simple polygons overlap.
+
+    Polygons touching in edges or vertices, like faces sharing a hinge edge,
+    do not overlap. The overlap has to exceed tolerance times the area of the
+    smaller polygon.
+    """
+    if not boundingBoxesOverlap(fst, snd):
+        return False
+    minArea = min(abs(polygonArea(fst)), abs(polygonArea(snd)))
+    return intersectionArea(fst, snd) > tolerance * minArea
+
+
+def convexPolygonsOverlap(fst, snd, tolerance=0.):
+    """ Separating axis tests of pairs of convex polygons, one flag per pair.
+
+    fst and snd are P x N x 2 and P x M x 2 vertex loops, segments are
+    2-gons and shorter polygons are padded by repeating their last vertex.
+    A pair overlaps if its projections onto every edge normal of both
+    polygons overlap by at least tolerance. So with the default of 0
+    touching polygons overlap and a segment can hit a polygon, although its
+    projection onto its own normal is a point.
+    """
+    fst = np.asarray(fst, dtype=float)
+    snd = np.asarray(snd, dtype=float)
+    if not len(fst):
+        return np.zeros(0, dtype=bool)
+    edges = np.concatenate((np.roll(fst, -1, axis=1) - fst, np.roll(snd, -1, axis=1) - snd), axis=1)
+    lengths = np.hypot(edges[..., 0], edges[..., 1])
+    # the unit edge normals, the zero length edges of padding are no axes
+    axes = np.stack((-edges[..., 1], edges[..., 0]), axis=-1) / np.where(lengths > 0, lengths, 1.)[..., np.newaxis]
+    (fstProjections, sndProjections) = (_project(axes, fst), _project(axes, snd))
+    overlapLengths = np.minimum(fstProjections.max(axis=2), sndProjections.max(axis=2)) \
+        - np.maximum(fstProjections.min(axis=2), sndProjections.min(axis=2))
+    return np.all((overlapLengths >= tolerance) | (lengths == 0), axis=1)
+
+
+def boundingBoxesOverlap(fst, snd):
+    return min(x(v) for v in fst) < max(x(v) for v in snd) and min(x(v) for v in snd) < max(x(v) for v in fst) \
+        and min(y(v) for v in fst) < max(y(v) for v in snd) and min(y(v) for v in snd) < max(y(v) for v in fst)
+
+
+def intersectionArea(fst, snd):
+    """ The area of the intersection of two simple polygons. """
+    if isConvex(snd):
+        return abs(polygonArea(clipByConvex(fst, snd)))
+    if isConvex(fst):
+        return abs(polygonArea(clipByConvex(snd, fst)))
+    return sum(abs(polygonArea(clipByConvex(fst, triangle))) for triangle in triangulate(snd))
+
+
+def polygonArea(polygon):
+    """ The signed area, positive for counter clockwise polygons. """
+    if not polygon:
+        return 0.
+    area = 0.
+    prev = polygon[-1]
+    for vertex in polygon:
+        area += x(prev) * y(vertex) - x(vertex) * y(prev)
+        prev = vertex
+    return area / 2.
+
+
+def isConvex(polygon):
+    sign = 0
+    numVertices = len(polygon)
+    for index in range(numVertices):
+        turn = cross(polygon[index - 1], polygon[index], polygon[(index + 1) % numVertices])
+        if turn != 0:
+            if sign * turn < 0:
+                return False
+            sign = turn
+    return True
+
+
+def clipByConvex(subject, clip):
+    """ Sutherland-Hodgman clipping of any simple polygon by a convex polygon. """
+    if polygonArea(clip) < 0:
+        clip = clip[::-1]
+    output = [tuple(vertex) for vertex in subject]
+    prevClipVertex = clip[-1]
+    for clipVertex in clip:
+        if not output:
+            break
+        clipInput = output
+        output = []
+        prev = clipInput[-1]
+        prevInside = cross(prevClipVertex, clipVertex, prev) >= 0
+        for vertex in clipInput:
+            inside = cross(prevClipVertex, clipVertex, vertex) >= 0
+            if inside != prevInside:
+                output.append(lineIntersection(prev, vertex, prevClipVertex, clipVertex))
+            if inside:
+                output.append(vertex)
+            (prev, prevInside) = (vertex, inside)
+        prevClipVertex = clipVertex
+    return output
+
+
+def triangulate(polygon, tolerance=1e-12):
+    """ Ear clipping triangulation of a simple polygon, a list of triangles.
+
+    Collinear vertices are no ear tips and may block the ears of their
+    neighbors, so they are removed first and whenever clipping an ear leaves
+    some. A vertex counts as collinear if the cross product of its edges is
+    at most tolerance times the product of their lengths, the same tolerance
+    keeps vertices on the diagonal of an ear from slipping out of it by
+    rounding. Raises a ValueError if no ear is left, which only happens for
+    polygons that are not simple.
+    """
+    vertices = removeCollinear([tuple(vertex) for vertex in polygon], tolerance)
+    if polygonArea(vertices) < 0:
+        vertices.reverse()
+    triangles = []
+    while len(vertices) > 3:
+        for index in range(len(vertices)):
+            triangle = (vertices[index - 1], vertices[index], vertices[(index + 1) % len(vertices)])
+            if isEar(triangle, vertices, tolerance):
+                triangles.append(triangle)
+                del vertices[index]
+                break
+        else:
+            raise ValueError('Error polygon ' + repr(polygon) + ' is not simple, no ear is left')
+        vertices = removeCollinear(vertices, tolerance)
+    if len(vertices) == 3:
+        triangles.append(tuple(vertices))
+    return triangles
+
+
+# private
+
+
+def isEar(triangle, vertices, tolerance=0.):
+    """ Whether no other vertex lies in the triangle or closer than tolerance (relative) to its edges. """
+    (a, b, c) = triangle
+    if cross(a, b, c) <= 0:
+        return False
+    for vertex in vertices:
+        if vertex not in triangle and isLeftOf(a, b, vertex, tolerance) and isLeftOf(b, c, vertex, tolerance) \
+                and isLeftOf(c, a, vertex, tolerance):
+            return False
+    return True
+
+
+def isLeftOf(begin, end, vertex, tolerance):
+    """ Whether vertex is left of or on the line from begin to end, rounding errors up to tolerance included. """
+    return cross(begin, end, vertex) >= -tolerance * math.dist(begin, end) * math.dist(begin, vertex)
+
+
+def removeCollinear(vertices, tolerance):
+    """ The vertices without the ones collinear with their neighbors, duplicates and spikes included. """
+    while len(vertices) >= 3:
+        numVertices = len(vertices)
+        kept = [vertex for index, vertex in enumerate(vertices)
+                if not isCollinear(vertices[index - 1], vertex, vertices[(index + 1) % numVertices], tolerance)]
+        if len(kept) == numVertices:
+            break
+        vertices = kept
+    return vertices if len(vertices) >= 3 else []
+
+
+def isCollinear(prev, vertex, nextVertex, tolerance):
+    return abs(cross(prev, vertex, nextVertex)) <= tolerance * math.dist(prev, vertex) * math.dist(vertex, nextVertex)
+
+
+def lineIntersection(p1, p2, q1, q2):
+    """ The intersection of the line through p1, p2 with the line through q1, q2. """
+    d1 = cross(q1, q2, p1)
+    d2 = cross(q1, q2, p2)
+    t = d1 / (d1 - d2)
+    return (x(p1) + t * (x(p2) - x(p1)), y(p1) + t * (y(p2) - y(p1)))
+
+
+def _project(axes, vertices):
+    """ The projections of the vertices onto the axes, P x A x N. """
+    return axes[:, :, np.newaxis, 0] * vertices[:, np.newaxis, :, 0] \
+        + axes[:, :, np.newaxis, 1] * vertices[:, np.newaxis, :, 1]
+
+
+def cross(o, a, b):
+    """ The z component of (a - o) x (b - o). """
+    return (x(a) - x(o)) * (y(b) - y(o)) - (y(a) - y(o)) * (x(b) - x(o))
+
+
+def x(vertex):
+    return vertex[0]
+
+
+def y(vertex):
+    return vertex[1]
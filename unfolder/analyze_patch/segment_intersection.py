@@ -0,0 +1,248 @@
+import heapq
+from fractions import Fraction
+
+import numpy as np
+
+from unfolder.model.model import Model
+from unfolder.util.treap import Treap
+
+# the events at one point are handled in this order
+_SWAP = 0
+_REMOVE = 1
+_INSERT = 2
+# a segment of zero length is removed right after it was inserted
+_REMOVE_POINT = 3
+
+# a float cross product of two differences larger than this times the sum of its products has the right sign
+_ERROR_BOUND = (3. + 16. * 2. ** -53) * 2. ** -53
+
+
+def findIntersectingEdges(model: Model):
+    """ The index pairs (i, j), i < j, of the intersecting patch boundary edges of a model, see SegmentSweep.
+
+    A hinge is a single edge of both patches, so the patches it connects
+    only share the endpoints of their boundary edges.
+    """
+    impl = model.impl
+    edges = np.unique(impl.loopEdges)
+    segments = impl.vertexArray[impl.edgeVertices[edges], :2]
+    return edges[SegmentSweep(segments).intersections()]
+
+
+def segmentsIntersect(fst, snd):
+    """ Whether two segments ((x, y), (x, y)) share a point other than an endpoint of both. """
+    return _intersect(_normalize(fst), _normalize(snd))
+
+
+class SegmentSweep:
+    """ Find the intersecting pairs of many line segments.
+
+    Two segments intersect if they share a point, except for segments that
+    only share an endpoint, like the edges meeting at a patch corner or at
+    the end of a hinge. Segments crossing, touching in the interior of
+    either one or overlapping collinear do intersect.
+
+    A vertical line sweeps over the sheet from left to right and stops at
+    the endpoints and crossings. The segments it cuts are kept in a treap
+    ordered from bottom to top, only segments next to each other in this
+    order can intersect further right. anyIntersection is the Shamos-Hoey
+    sweep, it stops at the first intersection and takes O(n log n) for n
+    segments. intersections is the Bentley-Ottmann sweep, crossing segments
+    trade places in the order at their crossing, which takes O((n + k) log n)
+    for k intersecting pairs.
+
+    All decisions are exact for the float coordinates. Orientations are
+    computed with floats and recomputed with fractions when rounding could
+    flip their sign, crossings are fractions. So segments meeting in one
+    point, which is common in sheets, do not confuse the order.
+    """
+    def __init__(self, segments):
+        segments = np.asarray(segments, dtype=float).reshape(-1, 2, 2)
+        # every segment runs from its left endpoint, the lower one if it is vertical
+        isReversed = (segments[:, 0, 0] > segments[:, 1, 0]) \
+            | ((segments[:, 0, 0] == segments[:, 1, 0]) & (segments[:, 0, 1] > segments[:, 1, 1]))
+        self.segments = np.where(isReversed[:, np.newaxis, np.newaxis], segments[:, ::-1], segments)
+        self._coords = self.segments.reshape(-1, 4).tolist()
+
+    def anyIntersection(self):
+        """ The index pair (i, j), i < j, of two intersecting segments, None if there are none. """
+        pairs = self._sweep(stopAtFirst=True)
+        return min(pairs) if pairs else None
+
+    def intersections(self):
+        """ All index pairs (i, j), i < j, of intersecting segments as sorted P x 2 array. """
+        return np.array(sorted(self._sweep(stopAtFirst=False)), dtype=np.int64).reshape(-1, 2)
+
+    # private
+
+    def _sweep(self, stopAtFirst):
+        coords = self._coords
+        self._events = [(x0, y0, _INSERT, index, -1) for (index, (x0, y0, _, _)) in enumerate(coords)] \
+            + [(x1, y1, _REMOVE if (x0, y0) != (x1, y1) else _REMOVE_POINT, index, -1)
+               for (index, (x0, y0, x1, y1)) in enumerate(coords)]
+        heapq.heapify(self._events)
+        self._status = Treap(seed=0)
+        self._nodes = [None] * len(coords)
+        self._pairs = set()
+        while self._events and not (stopAtFirst and self._pairs):
+            (x, y, kind, fst, snd) = heapq.heappop(self._events)
+            if kind == _INSERT:
+                self._insert(fst, x, y)
+            elif kind == _SWAP:
+                self._swap(fst, snd)
+            else:
+                self._remove(fst, x, y)
+        return self._pairs
+
+    def _insert(self, segment, x, y):
+        node = self._status.insert(segment, lambda other: self._isBelow(segment, other, x, y))
+        self._nodes[segment] = node
+        self._addPassingThrough(node, x, y)
+        self._checkNeighbors(self._status.predecessor(node), node)
+        self._checkNeighbors(node, self._status.successor(node))
+
+    def _remove(self, segment, x, y):
+        node = self._nodes[segment]
+        self._addPassingThrough(node, x, y)
+        below = self._status.predecessor(node)
+        above = self._status.successor(node)
+        self._status.remove(node)
+        self._nodes[segment] = None
+        self._checkNeighbors(below, above)
+
+    def _swap(self, lower, upper):
+        """ Let two segments trade places at their crossing, unless they are no longer next to each other. """
+        (lowerNode, upperNode) = (self._nodes[lower], self._nodes[upper])
+        if lowerNode is None or upperNode is None or self._status.successor(lowerNode) is not upperNode:
+            return
+        self._status.swap(lowerNode, upperNode)
+        (self._nodes[lower], self._nodes[upper]) = (upperNode, lowerNode)
+        self._checkNeighbors(self._status.predecessor(lowerNode), lowerNode)
+        self._checkNeighbors(upperNode, self._status.successor(upperNode))
+
+    def _checkNeighbors(self, lowerNode, upperNode):
+        """ Record the intersection of neighbors and schedule their swap if they cross. """
+        if lowerNode is None or upperNode is None:
+            return
+        (lower, upper) = (lowerNode.item, upperNode.item)
+        (fst, snd) = (self._coords[lower], self._coords[upper])
+        if not _intersect(fst, snd):
+            return
+        self._pairs.add((min(lower, upper), max(lower, upper)))
+        if _compareSlopes(fst, snd) > 0:
+            (x, y) = _meetingPoint(fst, snd)
+            heapq.heappush(self._events, (x, y, _SWAP, lower, upper))
+
+    def _addPassingThrough(self, node, x, y):
+        """ Record the intersections with the segments through an endpoint, they are next to the node. """
+        segment = node.item
+        for step in (self._status.predecessor, self._status.successor):
+            other = step(node)
+            while other is not None and _contains(self._coords[other.item], x, y):
+                if _intersect(self._coords[segment], self._coords[other.item]):
+                    self._pairs.add((min(segment, other.item), max(segment, other.item)))
+                other = step(other)
+
+    def _isBelow(self, segment, other, x, y):
+        """ Whether segment starting at (x, y) is below other right after (x, y). """
+        (x0, y0, x1, y1) = self._coords[other]
+        if x0 == x1:
+            # a vertical segment is at the height of the sweep as long as it is cut
+            if y != min(max(y, y0), y1):
+                return y < y0
+        else:
+            side = _orientation(x0, y0, x1, y1, x, y)
+            if side != 0:
+                return side < 0
+        slopes = _compareSlopes(self._coords[segment], self._coords[other])
+        if slopes != 0:
+            return slopes < 0
+        return segment < other
+
+
+# private
+
+
+def _normalize(segment):
+    ((x0, y0), (x1, y1)) = [(float(x), float(y)) for (x, y) in segment]
+    return [x0, y0, x1, y1] if (x0, y0) <= (x1, y1) else [x1, y1, x0, y0]
+
+
+def _orientation(x0, y0, x1, y1, x, y):
+    """ 1 if (x, y) is left of the line from (x0, y0) to (x1, y1), -1 if right and 0 on it. """
+    return _crossSign(x0, y0, x1, y1, x0, y0, x, y)
+
+
+def _compareSlopes(fst, snd):
+    """ The sign of the slope of fst minus the slope of snd, vertical segments are steepest. """
+    (isFstVertical, isSndVertical) = (fst[0] == fst[2], snd[0] == snd[2])
+    if isFstVertical or isSndVertical:
+        return isFstVertical - isSndVertical
+    return -_crossSign(*fst, *snd)
+
+
+def _crossSign(ax0, ay0, ax1, ay1, bx0, by0, bx1, by1):
+    """ The exact sign of the cross product of the vectors from a0 to a1 and from b0 to b1. """
+    (ax, ay, bx, by) = (ax1 - ax0, ay1 - ay0, bx1 - bx0, by1 - by0)
+    (left, right) = (ax * by, ay * bx)
+    cross = left - right
+    if abs(cross) <= _ERROR_BOUND * (abs(left) + abs(right)):
+        # differences of floats are 0 only for equal floats
+        if (ax == 0 or by == 0) and (ay == 0 or bx == 0):
+            return 0
+        (ax0, ay0, ax1, ay1, bx0, by0, bx1, by1) = _toIntegers(ax0, ay0, ax1, ay1, bx0, by0, bx1, by1)
+        cross = (ax1 - ax0) * (by1 - by0) - (ay1 - ay0) * (bx1 - bx0)
+    return (cross > 0) - (cross < 0)
+
+
+def _toIntegers(*values):
+    """ The floats scaled by the same power of two to integers. """
+    ratios = [value.as_integer_ratio() for value in values]
+    scale = max(denominator for (_, denominator) in ratios)
+    return [numerator * (scale // denominator) for (numerator, denominator) in ratios]
+
+
+def _contains(segment, x, y):
+    (x0, y0, x1, y1) = segment
+    return x0 <= x <= x1 and min(y0, y1) <= y <= max(y0, y1) and _orientation(x0, y0, x1, y1, x, y) == 0
+
+
+def _intersect(fst, snd):
+    """ Whether normalized segments [x0, y0, x1, y1] share a point other than an endpoint of both. """
+    (ax0, ay0, ax1, ay1) = fst
+    (bx0, by0, bx1, by1) = snd
+    if ax1 < bx0 or bx1 < ax0 or max(ay0, ay1) < min(by0, by1) or max(by0, by1) < min(ay0, ay1):
+        return False
+    o1 = _orientation(ax0, ay0, ax1, ay1, bx0, by0)
+    o2 = _orientation(ax0, ay0, ax1, ay1, bx1, by1)
+    o3 = _orientation(bx0, by0, bx1, by1, ax0, ay0)
+    o4 = _orientation(bx0, by0, bx1, by1, ax1, ay1)
+    (fstEnds, sndEnds) = (((ax0, ay0), (ax1, ay1)), ((bx0, by0), (bx1, by1)))
+    if o1 == 0 and o2 == 0 and o3 == 0 and o4 == 0:
+        # collinear, the endpoints are ordered along the line
+        low = max(fstEnds[0], sndEnds[0])
+        high = min(fstEnds[1], sndEnds[1])
+        if low != high:
+            return low < high
+        return not (low in fstEnds and low in sndEnds)
+    if o1 * o2 < 0 and o3 * o4 < 0:
+        return True
+    # the lines meet in a single point, the segments do if it is an endpoint on the other segment
+    for (orientation, point, ends, segment) in ((o1, sndEnds[0], fstEnds, fst), (o2, sndEnds[1], fstEnds, fst),
+                                                (o3, fstEnds[0], sndEnds, snd), (o4, fstEnds[1], sndEnds, snd)):
+        if orientation == 0 and _contains(segment, *point):
+            return point not in ends
+    return False
+
+
+def _meetingPoint(fst, snd):
+    """ The point where intersecting segments of different slopes meet, fractions if it is no endpoint. """
+    for (segment, other) in ((fst, snd), (snd, fst)):
+        for (x, y) in ((other[0], other[1]), (other[2], other[3])):
+            if _contains(segment, x, y):
+                return x, y
+    (ax0, ay0, ax1, ay1) = [Fraction(value) for value in fst]
+    (bx0, by0, bx1, by1) = [Fraction(value) for value in snd]
+    (dax, day, dbx, dby) = (ax1 - ax0, ay1 - ay0, bx1 - bx0, by1 - by0)
+    t = ((bx0 - ax0) * dby - (by0 - ay0) * dbx) / (dax * dby - day * dbx)
+    return ax0 + t * dax, ay0 + t * day
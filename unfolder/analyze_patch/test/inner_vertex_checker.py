@@ -0,0 +1,84 @@
+from unittest import TestCase
+
+import numpy as np
+
+from unfolder.analyze_patch.inner_vertex_checker import BoundingRect, InnerVertexChecker, pointsInPolygons
+
+SQUARE = [(0., 0.), (2., 0.), (2., 2.), (0., 2.)]
+U_SHAPE = [(0., 0.), (3., 0.), (3., 3.), (2., 3.), (2., 1.), (1., 1.), (1., 3.), (0., 3.)]
+
+
+def loopEdges(loop):
+    return [(loop[i], loop[(i + 1) % len(loop)]) for i in range(len(loop))]
+
+
+def windingNumber(point, loop):
+    (px, py) = point
+    retval = 0
+    for ((ax, ay), (bx, by)) in loopEdges(loop.tolist()):
+        side = (bx - ax) * (py - ay) - (px - ax) * (by - ay)
+        if ay <= py < by and side > 0:
+            retval += 1
+        elif by <= py < ay and side < 0:
+            retval -= 1
+    return retval
+
+
+class BoundingRectTests(TestCase):
+    def test_zeroCoordinates(self):
+        rect = BoundingRect()
+        for vertex in [(0., 0.), (-1., 2.), (0., -3.)]:
+            rect.add(vertex)
+        self.assertTrue(rect.contains((-.5, 0.)))
+        self.assertFalse(rect.contains((.5, 0.)))
+        self.assertEqual(rect.containsAll(np.array([[-.5, 1.], [0., 1.]])).tolist(), [True, False])
+
+
+class InnerVertexCheckerTests(TestCase):
+    def test_square(self):
+        checker = InnerVertexChecker(loopEdges(SQUARE))
+        self.assertTrue(checker.isInnerVertex((1., 1.)))
+        self.assertFalse(checker.isInnerVertex((3., 1.)))
+        self.assertFalse(checker.isInnerVertex((0., 1.)))
+
+    def test_concave(self):
+        # the edges do not need to be in loop order
+        checker = InnerVertexChecker(loopEdges(U_SHAPE)[::-1])
+        points = [(.5, 2.5), (1.5, 2.5), (1.5, .5), (2.5, 2.), (4., 1.)]
+        self.assertEqual(checker.areInnerVertices(points).tolist(), [True, False, True, True, False])
+        self.assertEqual([checker.isInnerVertex(point) for point in points], [True, False, True, True, False])
+
+    def test_empty(self):
+        checker = InnerVertexChecker([])
+        self.assertFalse(checker.isInnerVertex((0., 0.)))
+        self.assertEqual(checker.areInnerVertices(np.empty((0, 2))).shape, (0,))
+
+
+class PointsInPolygonsTests(TestCase):
+    def test_singlePolygon(self):
+        inside = pointsInPolygons([(1., 1.), (3., 3.)], np.array(SQUARE))
+        self.assertEqual(inside.tolist(), [[True], [False]])
+
+    def test_manyPolygons(self):
+        polygons = [SQUARE, [], U_SHAPE, [(x + 5., y) for (x, y) in SQUARE]]
+        points = [(1., .5), (1.5, 2.5), (6., 1.), (-1., 0.)]
+        self.assertEqual(pointsInPolygons(points, polygons).tolist(), [[True, False, True, False],
+                                                                       [False, False, False, False],
+                                                                       [False, False, False, True],
+                                                                       [False, False, False, False]])
+        self.assertEqual(pointsInPolygons(np.empty((0, 2)), polygons).shape, (0, 4))
+        self.assertEqual(pointsInPolygons(points, []).shape, (4, 0))
+
+    def test_random(self):
+        rng = np.random.default_rng(3)
+        polygons = []
+        for center in rng.uniform(0., 10., (20, 2)):
+            angles = np.sort(rng.uniform(0., 2 * np.pi, 7))
+            radii = rng.uniform(.5, 2., 7)
+            polygons.append(center + np.stack((radii * np.cos(angles), radii * np.sin(angles)), axis=-1))
+        points = rng.uniform(-1., 11., (200, 2))
+        inside = pointsInPolygons(points, polygons)
+        for (polygon, column) in zip(polygons, inside.T):
+            checker = InnerVertexChecker(loopEdges(polygon.tolist()))
+            self.assertEqual(column.tolist(), checker.areInnerVertices(points).tolist())
+            self.assertEqual(column.tolist(), [windingNumber(point, polygon) != 0 for point in points.tolist()])
@@ -0,0 +1,62 @@
+from unittest import TestCase
+
+from unfolder.analyze_patch.isometry_validator import IsometryValidator, validateIsometry
+from unfolder.automatic_unfold.mesh_to_graph import meshToGraph
+from unfolder.graph.graph_builder import GraphBuilder
+from unfolder.graph.spanning_tree_ranking import SpanningTreeRanking
+from unfolder.mesh.face import FaceIter
+from unfolder.mesh.mesh_arrays import MeshArrays
+from unfolder.mesh.obj_importer import ObjImporter
+from unfolder.model.model import Model
+from unfolder.model.model_impl import ModelImpl
+from unfolder.model.tree_to_model.level_unfolder import unfoldTree
+from unfolder.model.tree_to_model.tree_to_model import treeToModel
+from unfolder.tree.rooted_tree import graphToRootedTree
+
+
+class IsometryValidatorTests(TestCase):
+    def _getTrees(self, mesh, numTrees):
+        component = next(iter(meshToGraph(FaceIter(mesh), GraphBuilder()).getConnectedComponents()))
+        ranking = SpanningTreeRanking(component)
+        return [graphToRootedTree(ranking.unrank(rank))
+                for rank in range(0, ranking.count, max(1, ranking.count // numTrees))]
+
+    def test_box(self):
+        mesh = ObjImporter().read('resources/box.obj')
+        validator = IsometryValidator(mesh)
+        for tree in self._getTrees(mesh, 5):
+            report = validator.validate(treeToModel(tree, FaceIter(mesh)))
+            self.assertTrue(report.isValid())
+            self.assertEqual(len(report.lengthErrors), 24)
+            self.assertEqual(sorted(report.faces.tolist()), list(range(6)))
+
+    def test_torus(self):
+        mesh = ObjImporter().read('resources/torus.obj')
+        meshArrays = MeshArrays(mesh)
+        validator = IsometryValidator(mesh)
+        for tree in self._getTrees(mesh, 3):
+            self.assertTrue(validator.validate(treeToModel(tree, FaceIter(mesh))).isValid())
+            self.assertTrue(validator.validate(unfoldTree(tree, meshArrays)).isValid())
+
+    def test_distorted(self):
+        mesh = ObjImporter().read('resources/box.obj')
+        model = treeToModel(self._getTrees(mesh, 1)[0], FaceIter(mesh))
+        vertex = model.patches[2].vertices[0]
+        model.impl.vertexArray[vertex, :2] *= 1.01
+        report = validateIsometry(mesh, model, numWorstFaces=6)
+        self.assertFalse(report.isValid())
+        self.assertGreater(report.maxLengthError, 1e-4)
+        self.assertGreater(report.maxAngleError, 1e-4)
+        self.assertGreater(report.maxLengthError, report.rmsLengthError)
+        # only the faces around the moved vertex are distorted
+        distortedFaces = [patch.name for patch in model.patches if vertex in patch.vertices]
+        self.assertEqual(sorted(report.worstFaces[:len(distortedFaces)].tolist()), sorted(distortedFaces))
+        self.assertEqual(report.worstFaceErrors[len(distortedFaces)], 0.)
+
+    def test_unknownEdges(self):
+        mesh = ObjImporter().read('resources/box.obj')
+        impl = treeToModel(self._getTrees(mesh, 1)[0], FaceIter(mesh)).impl
+        impl = ModelImpl.fromArrays(impl.patches, None, impl.connectionOffsets, impl.connectionEdges, impl.edgeVertices,
+                                    impl.vertexArray)
+        with self.assertRaises(ValueError):
+            validateIsometry(mesh, Model(impl))
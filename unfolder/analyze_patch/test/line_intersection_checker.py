@@ -0,0 +1,15 @@
+from unittest import TestCase
+
+from unfolder.analyze_patch.line_intersection_checker import intersect, intersection
+
+
+class LineIntersectionCheckerTests(TestCase):
+    def test_intersection(self):
+        self.assertEqual(intersection(((0., 0.), (2., 0.)), ((1., -1.), (1., 3.))), (.5, .25))
+        self.assertIsNone(intersection(((0., 0.), (2., 0.)), ((0., 1.), (2., 1.))))
+
+    def test_intersect(self):
+        self.assertTrue(intersect(((0., 0.), (2., 0.)), ((1., -1.), (1., 1.))))
+        self.assertFalse(intersect(((0., 0.), (2., 0.)), ((3., -1.), (3., 1.))))
+        # touching in an end point is no intersection
+        self.assertFalse(intersect(((0., 0.), (2., 0.)), ((2., 0.), (2., 1.))))
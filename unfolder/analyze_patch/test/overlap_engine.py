@@ -0,0 +1,87 @@
+from unittest import TestCase
+
+import numpy as np
+
+from unfolder.analyze_patch.overlap_engine import OverlapEngine, findOverlappingPatches
+from unfolder.analyze_patch.polygon_overlap import intersectionArea, polygonsOverlap
+from unfolder.automatic_unfold.mesh_to_graph import meshToGraph
+from unfolder.graph.graph_builder import GraphBuilder
+from unfolder.graph.spanning_tree_ranking import SpanningTreeRanking
+from unfolder.mesh.face import FaceIter
+from unfolder.mesh.obj_importer import ObjImporter
+from unfolder.model.tree_to_model.tree_to_model import treeToModel
+from unfolder.tree.rooted_tree import graphToRootedTree
+
+
+def square(x, y, size=1.):
+    return [(x, y), (x + size, y), (x + size, y + size), (x, y + size)]
+
+
+# an L shaped hexagon covering [0, 2] x [0, 2] without [1, 2] x [1, 2]
+L_SHAPE = [(0., 0.), (2., 0.), (2., 1.), (1., 1.), (1., 2.), (0., 2.)]
+
+
+def randomPolygons(numPolygons, seed):
+    """ Star shaped polygons, many of them concave. """
+    random = np.random.default_rng(seed)
+    polygons = []
+    for _ in range(numPolygons):
+        numVertices = random.integers(3, 9)
+        angles = (np.arange(numVertices) + random.uniform(0., .8, numVertices)) * 2 * np.pi / numVertices
+        radii = random.uniform(.5, 2., numVertices)
+        polygons.append(random.uniform(0., 20., 2) + np.stack((radii * np.cos(angles), radii * np.sin(angles)), axis=-1))
+    return polygons
+
+
+class OverlapEngineTests(TestCase):
+    def assertOverlaps(self, polygons, expected):
+        self.assertEqual(OverlapEngine.fromPolygons(polygons).findOverlaps().tolist(), expected)
+
+    def test_touching(self):
+        # sharing an edge, a vertex or a part of an edge is no overlap
+        self.assertOverlaps([square(0., 0.), square(1., 0.), square(2., 1.), square(1., 1.5)], [])
+
+    def test_overlapping(self):
+        self.assertOverlaps([square(0., 0.), square(.5, .5), square(3., 3.), square(3., 3.)], [[0, 1], [2, 3]])
+        # crossing edges without any vertex inside of the other polygon
+        self.assertOverlaps([[(0., 1.), (3., 1.), (3., 2.), (0., 2.)], [(1., 0.), (2., 0.), (2., 3.), (1., 3.)]],
+                            [[0, 1]])
+
+    def test_concave(self):
+        self.assertOverlaps([L_SHAPE, square(1., 1.)], [])
+        self.assertOverlaps([L_SHAPE, square(1.2, 1.2, .5)], [])
+        self.assertOverlaps([L_SHAPE, square(.5, 1.2, .3)], [[0, 1]])
+        self.assertOverlaps([L_SHAPE, L_SHAPE], [[0, 1]])
+
+    def test_tolerance(self):
+        polygons = [square(0., 0.), square(1. - 1e-9, 0.)]
+        self.assertEqual(OverlapEngine.fromPolygons(polygons).findOverlaps().tolist(), [])
+        self.assertEqual(OverlapEngine.fromPolygons(polygons, tolerance=0.).findOverlaps().tolist(), [[0, 1]])
+
+    def test_randomPolygons(self):
+        polygons = randomPolygons(150, 3)
+        expected = [[fst, snd] for fst in range(len(polygons)) for snd in range(fst + 1, len(polygons))
+                    if polygonsOverlap(polygons[fst].tolist(), polygons[snd].tolist())]
+        self.assertOverlaps(polygons, expected)
+
+    def test_overlap(self):
+        engine = OverlapEngine.fromPolygons([square(0., 0.), square(.5, .5), L_SHAPE, []])
+        self.assertEqual(engine.overlap([0, 0, 1, 2], [1, 2, 2, 3]).tolist(), [True, True, True, False])
+
+    def test_torus(self):
+        mesh = ObjImporter().read('resources/torus.obj')
+        faces = FaceIter(mesh)
+        component = next(iter(meshToGraph(faces, GraphBuilder()).getConnectedComponents()))
+        ranking = SpanningTreeRanking(component)
+        for rank in range(0, ranking.count, ranking.count // 4):
+            model = treeToModel(graphToRootedTree(ranking.unrank(rank)), faces)
+            vertices = model.impl.vertexArray[:, :2]
+            polygons = [vertices[patch.vertexArray].tolist() for patch in model.patches]
+            overlaps = findOverlappingPatches(model).tolist()
+            for fst in range(len(polygons)):
+                for snd in range(fst + 1, len(polygons)):
+                    if polygonsOverlap(polygons[fst], polygons[snd]):
+                        self.assertIn([fst, snd], overlaps)
+                    elif [fst, snd] in overlaps:
+                        # slivers left by the unfolding, too thin for the area tolerance of polygonsOverlap
+                        self.assertGreater(intersectionArea(polygons[fst], polygons[snd]), 0.)
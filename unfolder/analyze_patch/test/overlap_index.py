@@ -0,0 +1,59 @@
+from unittest import TestCase
+
+from unfolder.analyze_patch.overlap_index import CALLBACK, RECORD, OverlapError, OverlapIndex
+from unfolder.analyze_patch.polygon_overlap import polygonsOverlap
+
+
+def square(x, y, size=1.):
+    return [(x, y), (x + size, y), (x + size, y + size), (x, y + size)]
+
+
+class OverlapIndexTests(TestCase):
+    def test_abort(self):
+        index = OverlapIndex()
+        self.assertEqual(index.add(0, square(0., 0.)), [])
+        # sharing an edge or a corner is no overlap
+        self.assertEqual(index.add(1, square(1., 0.)), [])
+        self.assertEqual(index.add(2, square(2., 1.)), [])
+        with self.assertRaises(OverlapError) as context:
+            index.add(3, square(.5, .5))
+        self.assertEqual((context.exception.key, context.exception.others), (3, [0, 1]))
+        self.assertNotIn(3, index)
+        self.assertEqual(len(index), 3)
+
+    def test_record(self):
+        index = OverlapIndex(RECORD)
+        for (key, polygon) in enumerate([square(0., 0.), square(.5, 0.), square(5., 5.), square(-1., -1., 10.)]):
+            index.add(key, polygon)
+        self.assertEqual(index.overlaps, [(1, 0), (3, 0), (3, 1), (3, 2)])
+        self.assertEqual(index.findOverlaps(square(4.5, 4.5)), [2, 3])
+
+    def test_callback(self):
+        calls = []
+        index = OverlapIndex(CALLBACK, callback=lambda key, others: calls.append((key, others)))
+        index.add('a', square(0., 0.))
+        index.add('b', square(.2, .2, .5))
+        self.assertEqual(calls, [('b', ['a'])])
+        with self.assertRaises(ValueError):
+            OverlapIndex(CALLBACK)
+
+    def test_remove(self):
+        index = OverlapIndex(cellSize=.3)
+        index.add(0, square(0., 0.))
+        index.remove(0)
+        self.assertEqual(index.add(1, square(.5, .5)), [])
+        self.assertEqual(index.findOverlaps(square(0., 0.)), [1])
+        index.remove(1)
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index._cells, {})
+
+    def test_sameAsPairwise(self):
+        polygons = [[(x + .3 * (i % 3), y + .2 * (i % 2)) for (x, y) in square((i * 7) % 11 * .4, (i * 5) % 13 * .3)]
+                    for i in range(60)]
+        index = OverlapIndex(RECORD)
+        for (key, polygon) in enumerate(polygons):
+            index.add(key, polygon)
+        expected = [(key, other) for key in range(len(polygons)) for other in range(key)
+                    if polygonsOverlap(polygons[other], polygons[key])]
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(index.overlaps, expected)
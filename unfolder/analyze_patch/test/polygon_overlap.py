@@ -0,0 +1,74 @@
+import math
+from unittest import TestCase
+from unfolder.analyze_patch.polygon_overlap import polygonsOverlap, intersectionArea, polygonArea, triangulate, \
+    convexPolygonsOverlap
+
+
+def square(x, y, size=1.):
+    return [(x, y), (x + size, y), (x + size, y + size), (x, y + size)]
+
+
+# an L shaped hexagon covering [0, 2] x [0, 2] without [1, 2] x [1, 2]
+L_SHAPE = [(0., 0.), (2., 0.), (2., 1.), (1., 1.), (1., 2.), (0., 2.)]
+
+
+def rotate(polygon, angle):
+    (cos, sin) = (math.cos(angle), math.sin(angle))
+    return [(cos * x - sin * y, sin * x + cos * y) for x, y in polygon]
+
+
+def addMidpoints(polygon):
+    return [vertex for index, (x, y) in enumerate(polygon)
+            for vertex in ((x, y), ((x + polygon[index - len(polygon) + 1][0]) / 2.,
+                                    (y + polygon[index - len(polygon) + 1][1]) / 2.))]
+
+
+class PolygonOverlapTests(TestCase):
+    def test_touching(self):
+        # sharing an edge, a vertex or a part of an edge is no overlap
+        self.assertFalse(polygonsOverlap(square(0., 0.), square(1., 0.)))
+        self.assertFalse(polygonsOverlap(square(0., 0.), square(1., 1.)))
+        self.assertFalse(polygonsOverlap(square(0., 0.), square(1., .5)))
+        self.assertFalse(polygonsOverlap(square(0., 0.), square(3., 0.)))
+
+    def test_overlap(self):
+        self.assertTrue(polygonsOverlap(square(0., 0., 2.), square(1., 0., 2.)))
+        self.assertTrue(polygonsOverlap(square(0., 0.), square(.25, .25, .5)))
+        self.assertAlmostEqual(intersectionArea(square(0., 0., 2.), square(1., 1., 2.)), 1.)
+
+    def test_orientation(self):
+        # clockwise polygons overlap just like counter clockwise ones
+        self.assertTrue(polygonsOverlap(square(0., 0., 2.)[::-1], square(1., 0., 2.)))
+        self.assertAlmostEqual(polygonArea(square(0., 0., 2.)[::-1]), -4.)
+
+    def test_concave(self):
+        self.assertEqual(len(triangulate(L_SHAPE)), 4)
+        # the square fits into the notch of the L
+        self.assertFalse(polygonsOverlap(L_SHAPE, square(1., 1.)))
+        self.assertFalse(polygonsOverlap(square(1., 1.), L_SHAPE))
+        self.assertTrue(polygonsOverlap(L_SHAPE, square(.5, .5)))
+        self.assertAlmostEqual(intersectionArea(L_SHAPE, [(1., 1.), (3., 1.), (3., 3.), (1., 3.), (1.5, 2.)]), 0.)
+        self.assertAlmostEqual(intersectionArea(L_SHAPE, [p[::-1] for p in L_SHAPE]), 3.)
+
+    def test_collinear(self):
+        # rounded midpoints of the edges, ear clipping used to get stuck and return a concave remainder
+        polygon = rotate(addMidpoints(L_SHAPE), math.radians(42))
+        triangles = triangulate(polygon)
+        self.assertEqual(len(triangles), 4)
+        self.assertTrue(all(len(triangle) == 3 for triangle in triangles))
+        self.assertAlmostEqual(sum(polygonArea(list(triangle)) for triangle in triangles), 3.)
+        self.assertFalse(polygonsOverlap(polygon, rotate(square(1., 1.), math.radians(42))))
+        # no triangles are left of a polygon without area
+        self.assertEqual(triangulate([(0., 0.), (1., 0.), (2., 0.), (1., 0.)]), [])
+
+    def test_convexPolygonsOverlap(self):
+        # a triangle padded by repeating its last vertex
+        triangle = [(.5, .5), (2., .5), (.5, 2.), (.5, 2.)]
+        fst = [square(0., 0.), square(0., 0.), square(0., 0.), square(0., 0.), triangle]
+        snd = [square(.5, .5), square(1., 0.), square(1.5, 0.), square(.99, .99), square(1.5, 1.5)]
+        self.assertEqual(convexPolygonsOverlap(fst, snd).tolist(), [True, True, False, True, False])
+        self.assertEqual(convexPolygonsOverlap(fst, snd, .1).tolist(), [True, False, False, False, False])
+        # segments are 2-gons
+        segments = [[(-1., .5), (2., .5)], [(-1., 2.), (2., 2.)]]
+        self.assertEqual(convexPolygonsOverlap(fst[:2], segments).tolist(), [True, False])
+        self.assertEqual(convexPolygonsOverlap([], []).shape, (0,))
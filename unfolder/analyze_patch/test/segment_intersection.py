@@ -0,0 +1,105 @@
+import itertools
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from unfolder.analyze_patch.segment_intersection import SegmentSweep, findIntersectingEdges, segmentsIntersect
+from unfolder.automatic_unfold.mesh_to_graph import meshToGraph
+from unfolder.graph.graph_builder import GraphBuilder
+from unfolder.graph.spanning_tree_ranking import SpanningTreeRanking
+from unfolder.mesh.face import FaceIter
+from unfolder.mesh.obj_importer import ObjImporter
+from unfolder.model.tree_to_model.tree_to_model import treeToModel
+from unfolder.tree.rooted_tree import graphToRootedTree
+
+
+def bruteForce(segments):
+    return [[i, j] for (i, j) in itertools.combinations(range(len(segments)), 2)
+            if segmentsIntersect(segments[i], segments[j])]
+
+
+def chains(rand, numChains, numPoints):
+    """ Polylines on a coarse grid, with many shared endpoints, collinear pieces and crossings in one point. """
+    segments = []
+    for _ in range(numChains):
+        points = [(rand.randrange(6) / 5, rand.randrange(6) / 3) for _ in range(numPoints)]
+        segments += [(points[i], points[i + 1]) for i in range(len(points) - 1)]
+    return segments
+
+
+class SegmentsIntersectTests(TestCase):
+    def test_cases(self):
+        self.assertTrue(segmentsIntersect(((0, 0), (2, 2)), ((0, 2), (2, 0))))
+        self.assertFalse(segmentsIntersect(((0, 0), (1, 1)), ((1, 1), (2, 0))))
+        # touching the interior of the other
+        self.assertTrue(segmentsIntersect(((0, 0), (2, 0)), ((1, 0), (1, 1))))
+        self.assertTrue(segmentsIntersect(((0, 0), (2, 0)), ((1, -1), (1, 0))))
+        # collinear
+        self.assertTrue(segmentsIntersect(((0, 0), (2, 0)), ((1, 0), (3, 0))))
+        self.assertTrue(segmentsIntersect(((0, 0), (2, 0)), ((2, 0), (1, 0))))
+        self.assertFalse(segmentsIntersect(((0, 0), (1, 0)), ((2, 0), (1, 0))))
+        self.assertFalse(segmentsIntersect(((0, 0), (1, 0)), ((2, 0), (3, 0))))
+        self.assertFalse(segmentsIntersect(((0, 0), (2, 0)), ((0, 1), (2, 1))))
+        # a point
+        self.assertTrue(segmentsIntersect(((1, 1), (1, 1)), ((0, 0), (2, 2))))
+        self.assertFalse(segmentsIntersect(((0, 0), (0, 0)), ((0, 0), (2, 2))))
+
+    def test_exact(self):
+        # one unit in the last place above or below the diagonal
+        (above, below) = (np.nextafter(.1, 1.), np.nextafter(.1, 0.))
+        self.assertFalse(segmentsIntersect(((0., 0.), (.3, .3)), ((.1, above), (.1, 1.))))
+        self.assertTrue(segmentsIntersect(((0., 0.), (.3, .3)), ((.1, below), (.1, 1.))))
+        self.assertTrue(segmentsIntersect(((0., 0.), (.3, .3)), ((.1, .1), (.1, 1.))))
+
+
+class SegmentSweepTests(TestCase):
+    def test_sameAsBruteForce(self):
+        rand = random.Random(7)
+        for _ in range(30):
+            segments = chains(rand, 3, 8) \
+                + [((rand.random(), rand.random()), (rand.random(), rand.random())) for _ in range(10)]
+            sweep = SegmentSweep(segments)
+            expected = bruteForce(segments)
+            self.assertEqual(sweep.intersections().tolist(), expected)
+            pair = sweep.anyIntersection()
+            if expected:
+                self.assertIn(list(pair), expected)
+            else:
+                self.assertIsNone(pair)
+
+    def test_grid(self):
+        # a rotated sheet of squares, the edges only meet at their endpoints
+        rotation = np.array([[np.cos(.3), np.sin(.3)], [-np.sin(.3), np.cos(.3)]])
+        (xs, ys) = np.meshgrid(np.arange(20.), np.arange(21.))
+        horizontal = np.stack((np.stack((xs, ys), axis=-1), np.stack((xs + 1, ys), axis=-1)), axis=-2)
+        segments = np.concatenate((horizontal, horizontal[..., ::-1])).reshape(-1, 2, 2) * .37 @ rotation
+        sweep = SegmentSweep(segments)
+        self.assertIsNone(sweep.anyIntersection())
+        self.assertEqual(sweep.intersections().shape, (0, 2))
+        crossing = np.concatenate((segments, [[[0., 0.], [3., 2.5]]]))
+        self.assertEqual(len(SegmentSweep(crossing).intersections()), len(bruteForce(crossing.tolist())))
+        self.assertIsNotNone(SegmentSweep(crossing).anyIntersection())
+
+    def test_empty(self):
+        self.assertEqual(SegmentSweep([]).intersections().shape, (0, 2))
+        self.assertIsNone(SegmentSweep([]).anyIntersection())
+
+
+class FindIntersectingEdgesTests(TestCase):
+    def test_box(self):
+        mesh = ObjImporter().read('resources/box.obj')
+        component = next(iter(meshToGraph(FaceIter(mesh), GraphBuilder()).getConnectedComponents()))
+        ranking = SpanningTreeRanking(component)
+        model = treeToModel(graphToRootedTree(ranking.unrank(0)), FaceIter(mesh))
+        self.assertEqual(findIntersectingEdges(model).shape, (0, 2))
+
+        # move a corner of the sheet into its middle
+        impl = model.impl
+        corner = np.argmax(impl.vertexArray[:, 0] + impl.vertexArray[:, 1])
+        impl.vertexArray[corner, :2] = impl.vertexArray[:, :2].mean(axis=0)
+        edges = np.unique(impl.loopEdges)
+        segments = impl.vertexArray[impl.edgeVertices[edges], :2].tolist()
+        expected = edges[np.array(bruteForce(segments), dtype=np.int64).reshape(-1, 2)]
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(findIntersectingEdges(model).tolist(), expected.tolist())
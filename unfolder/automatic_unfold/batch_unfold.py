@@ -0,0 +1,167 @@
+import numpy as np
+
+from unfolder.graph.graph_impl import GraphImpl
+from unfolder.mesh.mesh_arrays import MeshArrays
+from unfolder.tree.rooted_tree import RootedTree
+from unfolder.util import transform2d
+
+
+def batchUnfold(graph: GraphImpl, meshArrays: MeshArrays, parentEdges):
+    """ Lay out a batch of spanning trees of one component, see BatchUnfolder. """
+    return BatchUnfolder(graph, meshArrays).unfold(parentEdges)
+
+
+def getParentEdges(graph: GraphImpl, trees, root=0):
+    """ The parent edge arrays of spanning trees of graph, e.g. from SpanningTreeRanking.
+
+    Returns a trees x nodes array of indices into graph.edges, -1 for the root.
+    """
+    edgeIndices = {}
+    for edgeIndex, edge in enumerate(graph.edges):
+        edgeIndices.setdefault(edge.nodes, edgeIndex)
+    retval = []
+    for tree in trees:
+        treeEdges = np.array([edgeIndices[edge.nodes] for edge in tree.edges] + [-1], dtype=np.int64)
+        # the -1 at the end maps the missing parent edge of the root to -1
+        retval.append(treeEdges[RootedTree(tree, root).parentEdges])
+    return np.array(retval, dtype=np.int64).reshape(-1, len(graph.nodes))
+
+
+class BatchUnfolder:
+    """ Unfold many spanning trees of one connected component at once.
+
+    Every face gets a fixed frame, the hinge frame of its first face edge. For
+    each graph edge and each of its two directions the transform of the child
+    frame into the parent frame is precomputed, it only depends on the two
+    faces. A batch of trees is given by the parent edge of every node, its
+    transforms into the root frame are composed for all trees together by
+    pointer jumping: every round composes each transform with the one of its
+    current ancestor and doubles the distance the ancestor is away, so
+    ceil(log2 n) rounds of trees x nodes array operations are needed.
+
+    The layouts equal the model vertices of treeToModel for a RootedTree with
+    the same root, as the root frame is the one treeToModel unfolds into.
+    """
+
+    def __init__(self, graph: GraphImpl, meshArrays: MeshArrays):
+        self.graph = graph
+        self.meshArrays = meshArrays
+        self.faces = np.asarray(graph.nodes, dtype=np.int64)
+        self.edgeNodes = np.array([edge.nodes for edge in graph.edges], dtype=np.int64).reshape(-1, 2)
+        self._frames = meshArrays.hingeFrames(self.faces, *self._rootHinges())
+        self.edgeTransforms = self._computeEdgeTransforms()
+        (self.localCorners, self.cornerOffsets) = self._computeLocalCorners()
+        self.cornerNodes = np.repeat(np.arange(len(self.faces)), np.diff(self.cornerOffsets))
+
+    def unfold(self, parentEdges):
+        """ The layouts of a batch of trees given as trees x nodes parent edge arrays. """
+        parentEdges = np.asarray(parentEdges, dtype=np.int64).reshape(-1, len(self.faces))
+        transforms = self.toRoot(parentEdges)
+        cornerTransforms = transforms[:, self.cornerNodes]
+        corners = np.einsum('tcij,cj->tci', cornerTransforms[..., :2], self.localCorners) + cornerTransforms[..., 2]
+        return BatchLayout(self.faces, self.cornerOffsets, transforms, corners)
+
+    def toRoot(self, parentEdges):
+        """ The trees x nodes x 2 x 3 transforms of every face frame into the root frame. """
+        (numTrees, numNodes) = parentEdges.shape
+        nodes = np.arange(numNodes)
+        isRoot = parentEdges < 0
+        edges = np.where(isRoot, 0, parentEdges)
+        # side 1 if the child is the second node of its parent edge
+        sides = (self.edgeNodes[edges, 1] == nodes).astype(np.int64)
+        if not np.all(isRoot | (self.edgeNodes[edges, sides] == nodes)):
+            raise ValueError('Error parent edges do not belong to their nodes')
+        parents = np.where(isRoot, nodes, self.edgeNodes[edges, 1 - sides])
+        transforms = np.where(isRoot[..., np.newaxis, np.newaxis], transform2d.identity(),
+                              self.edgeTransforms[edges, sides])
+
+        trees = np.arange(numTrees)[:, np.newaxis]
+        for _ in range(max(1, (numNodes - 1).bit_length())):
+            ancestors = parents[trees, parents]
+            if np.array_equal(ancestors, parents):
+                break
+            transforms = transform2d.compose(transforms[trees, parents], transforms)
+            parents = ancestors
+        if not np.all(isRoot[trees, parents]):
+            raise ValueError('Error parent edges contain a cycle')
+        return transforms
+
+    # private
+
+    def _rootHinges(self):
+        faceEdges = self.meshArrays.faceOffsets[self.faces]
+        return self.meshArrays.faceEdgeBegins[faceEdges], self.meshArrays.faceEdgeEnds[faceEdges]
+
+    def _computeEdgeTransforms(self):
+        """ E x 2 x 2 x 3 transforms, [e, s] maps the frame of node s of edge e into the frame of the other node. """
+        numEdges = len(self.edgeNodes)
+        children = self.edgeNodes[:, ::-1].ravel()
+        parents = self.edgeNodes.ravel()
+        hinges = np.array([self.meshArrays.hinge(self.faces[parent], self.faces[child])
+                           for parent, child in zip(parents.tolist(), children.tolist())],
+                          dtype=np.int64).reshape(-1, 2)
+        # the hinge is attached to the same edge in the parent and the child frame
+        parentHinge = transform2d.rigidTransforms(*self._hingeInFrames(parents, hinges))
+        childHinge = transform2d.rigidTransforms(*self._hingeInFrames(children, hinges))
+        transforms = transform2d.compose(parentHinge, transform2d.invert(childHinge))
+        # row 2e holds parent node 0 and child node 1 of edge e, so it belongs to side 1
+        return transforms.reshape(numEdges, 2, 2, 3)[:, ::-1]
+
+    def _hingeInFrames(self, nodes, hinges):
+        """ The origins and unit directions of hinges in the frames of nodes. """
+        (origins, xAxes, yAxes) = (frame[nodes] for frame in self._frames)
+        vertices = self.meshArrays.vertices
+        relativeBegins = vertices[hinges[:, 0]] - origins
+        directions = vertices[hinges[:, 1]] - vertices[hinges[:, 0]]
+        hingeOrigins = np.stack((np.einsum('ij,ij->i', relativeBegins, xAxes),
+                                 np.einsum('ij,ij->i', relativeBegins, yAxes)), axis=-1)
+        hingeDirections = np.stack((np.einsum('ij,ij->i', directions, xAxes),
+                                    np.einsum('ij,ij->i', directions, yAxes)), axis=-1)
+        hingeDirections /= np.linalg.norm(hingeDirections, axis=1)[:, np.newaxis]
+        return hingeOrigins, hingeDirections
+
+    def _computeLocalCorners(self):
+        """ The loop vertices of all faces in their frames and the corner offsets of the nodes. """
+        meshArrays = self.meshArrays
+        faceSizes = meshArrays.faceOffsets[self.faces + 1] - meshArrays.faceOffsets[self.faces]
+        cornerOffsets = np.zeros(len(self.faces) + 1, dtype=np.int64)
+        np.cumsum(faceSizes, out=cornerOffsets[1:])
+        cornerNodes = np.repeat(np.arange(len(self.faces)), faceSizes)
+        faceEdges = meshArrays.faceOffsets[self.faces][cornerNodes] + np.arange(cornerOffsets[-1]) \
+            - cornerOffsets[:-1][cornerNodes]
+        (origins, xAxes, yAxes) = (frame[cornerNodes] for frame in self._frames)
+        relative = meshArrays.vertices[meshArrays.faceEdgeEnds[faceEdges]] - origins
+        localCorners = np.stack((np.einsum('ij,ij->i', relative, xAxes),
+                                 np.einsum('ij,ij->i', relative, yAxes)), axis=-1)
+        return localCorners, cornerOffsets
+
+
+class BatchLayout:
+    """ The unfolded faces of a batch of trees.
+
+    faces          the face of every node
+    cornerOffsets  the corners of node n are corners[:, cornerOffsets[n]:cornerOffsets[n + 1]]
+    transforms     trees x nodes x 2 x 3 transforms of the face frames into the root frame
+    corners        trees x corners x 2 loop vertex positions, in the order of Face.vertexIndices
+    """
+
+    def __init__(self, faces, cornerOffsets, transforms, corners):
+        self.faces = faces
+        self.cornerOffsets = cornerOffsets
+        self.transforms = transforms
+        self.corners = corners
+
+    def __len__(self):
+        return len(self.corners)
+
+    def getPolygons(self, tree):
+        """ The unfolded faces of one tree, one N x 2 array per node. """
+        return np.split(self.corners[tree], self.cornerOffsets[1:-1])
+
+    def boundingBoxes(self):
+        """ trees x 2 x 2 (min, max) corners of the layouts. """
+        return np.stack((self.corners.min(axis=1), self.corners.max(axis=1)), axis=1)
+
+    def boundingBoxAreas(self):
+        (mins, maxs) = (self.corners.min(axis=1), self.corners.max(axis=1))
+        return np.prod(maxs - mins, axis=1)
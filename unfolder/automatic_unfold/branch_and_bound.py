@@ -0,0 +1,196 @@
+import numpy as np
+
+from unfolder.analyze_patch.overlap_index import OverlapError, OverlapIndex
+from unfolder.graph.graph import Graph
+from unfolder.graph.graph_impl import GraphImpl
+from unfolder.mesh.hinge_polygon_cache import HingePolygonCache
+from unfolder.mesh.mesh_arrays import MeshArrays
+from unfolder.util import transform2d
+
+
+def getOverlapFreeSpanningTrees(graph: Graph, meshImpl, tolerance=1e-9):
+    return OverlapFreeSpanningTreeIter(graph, MeshArrays(meshImpl), tolerance)
+
+
+class OverlapFreeSpanningTreeIter:
+    """ Enumerate the spanning trees of a face graph that unfold without overlaps.
+
+    The trees are grown from the first node. Every step takes an edge leaving
+    the partial tree and branches into including and excluding it. Including
+    an edge places the new face along its hinge edge in the model plane and
+    tests it against the faces placed so far. The placement of these faces
+    does not depend on the edges chosen later, so on the first overlap the
+    whole branch is cut. Excluding an edge is cut as soon as the remaining
+    edges can not span the graph anymore.
+
+    Every overlap free spanning tree is yielded once, as a graph impl like
+    the ones of SpanningTreeIter. Faces touching in edges or vertices do not
+    overlap (see OverlapIndex).
+
+    The faces are placed from their hinge polygons, which are shared by all
+    searches of the iterator, a polygon cache can also be shared between
+    iterators of the same mesh.
+    """
+
+    def __init__(self, graph: Graph, meshArrays: MeshArrays, tolerance=1e-9, polygonCache=None):
+        self.graph = graph.impl
+        self._meshArrays = meshArrays
+        self._tolerance = tolerance
+        self._polygonCache = polygonCache if polygonCache is not None else HingePolygonCache(meshArrays)
+        self._edges = []
+        self._adjacency = [[] for _ in self.graph.nodes]
+        seenEdges = set()
+        for edge in self.graph.edges:
+            if edge.nodes not in seenEdges:
+                seenEdges.add(edge.nodes)
+                (fst, snd) = edge.nodes
+                self._adjacency[fst].append((len(self._edges), snd))
+                self._adjacency[snd].append((len(self._edges), fst))
+                self._edges.append(edge)
+
+    def __iter__(self):
+        search = UnfoldingSearch(self.graph.nodes, self._edges, self._adjacency, self._meshArrays,
+                                 self._polygonCache, self._tolerance)
+        for treeEdges in search.run():
+            yield GraphImpl(self.graph.nodes, [self._edges[edgeIndex] for edgeIndex in treeEdges])
+
+
+# private
+
+
+# search actions
+BRANCH, INCLUDE, EXCLUDE, UNDO_INCLUDE, UNDO_EXCLUDE, RESTORE_FRONTIER = range(6)
+
+
+class UnfoldingSearch:
+    """ The state of a depth first branch and bound search.
+
+    The search runs on an explicit stack of actions, every change of the state
+    is paired with an undo action, so deep trees do not hit the recursion limit.
+    """
+
+    def __init__(self, faces, edges, adjacency, meshArrays: MeshArrays, polygonCache: HingePolygonCache, tolerance):
+        self._faces = faces
+        self._numEdges = len(edges)
+        self._adjacency = adjacency
+        self._meshArrays = meshArrays
+        self._polygonCache = polygonCache
+
+        numNodes = len(faces)
+        self._inTree = [False] * numNodes
+        self._excluded = [False] * self._numEdges
+        # (edge index, node in tree, node outside of tree), may hold stale edges
+        self._frontier = []
+        self._treeEdges = []
+
+        # placement of the faces in the tree
+        self._overlapIndex = OverlapIndex(tolerance=tolerance)
+
+    def run(self):
+        numNodes = len(self._faces)
+        if numNodes == 0:
+            yield []
+            return
+        self._placeRoot(0)
+        self._extendFrontier(0)
+        stack = [(BRANCH, None)]
+        while stack:
+            (action, arg) = stack.pop()
+            if action == BRANCH:
+                if len(self._treeEdges) == numNodes - 1:
+                    yield self._treeEdges[:]
+                    continue
+                (edge, popped) = self._popFrontier()
+                stack.append((RESTORE_FRONTIER, popped))
+                if edge is not None:
+                    stack.append((EXCLUDE, edge))
+                    stack.append((INCLUDE, edge))
+            elif action == INCLUDE:
+                (edgeIndex, parent, child) = arg
+                if self._place(parent, child):
+                    self._treeEdges.append(edgeIndex)
+                    numPushed = self._extendFrontier(child)
+                    stack.append((UNDO_INCLUDE, (child, numPushed)))
+                    stack.append((BRANCH, None))
+            elif action == EXCLUDE:
+                edgeIndex = arg[0]
+                self._excluded[edgeIndex] = True
+                if self._isSpannable():
+                    stack.append((UNDO_EXCLUDE, edgeIndex))
+                    stack.append((BRANCH, None))
+                else:
+                    self._excluded[edgeIndex] = False
+            elif action == UNDO_INCLUDE:
+                (child, numPushed) = arg
+                del self._frontier[len(self._frontier) - numPushed:]
+                self._treeEdges.pop()
+                self._unplace(child)
+            elif action == UNDO_EXCLUDE:
+                self._excluded[arg] = False
+            elif action == RESTORE_FRONTIER:
+                self._frontier.extend(reversed(arg))
+
+    # private
+
+    def _popFrontier(self):
+        """ Pop the next edge leaving the tree, stale edges are dropped on the way. """
+        popped = []
+        while self._frontier:
+            edge = self._frontier.pop()
+            popped.append(edge)
+            if not self._inTree[edge[2]]:
+                return edge, popped
+        return None, popped
+
+    def _extendFrontier(self, node):
+        numPushed = 0
+        for edgeIndex, other in self._adjacency[node]:
+            if not self._inTree[other] and not self._excluded[edgeIndex]:
+                self._frontier.append((edgeIndex, node, other))
+                numPushed += 1
+        return numPushed
+
+    def _isSpannable(self):
+        """ Check whether the edges that are not excluded still connect all nodes to the tree. """
+        reached = self._inTree[:]
+        queue = [node for node, inTree in enumerate(reached) if inTree]
+        numReached = len(queue)
+        while queue:
+            node = queue.pop()
+            for edgeIndex, other in self._adjacency[node]:
+                if not reached[other] and not self._excluded[edgeIndex]:
+                    reached[other] = True
+                    numReached += 1
+                    queue.append(other)
+        return numReached == len(reached)
+
+    def _placeRoot(self, node):
+        self._store(node, self._polygonCache.getRoot(self._faces[node]).tolist())
+
+    def _place(self, parent, child):
+        """ Unfold child along its hinge with parent, fails if it overlaps a placed face. """
+        meshArrays = self._meshArrays
+        (parentFace, childFace) = (self._faces[parent], self._faces[child])
+        faceEdge = meshArrays.connectingFaceEdges(parentFace, childFace)[0]
+        # face edge i runs from loop vertex i + 1 to loop vertex i of the placed parent
+        parentPolygon = self._overlapIndex.getPolygon(parent)
+        index = faceEdge - meshArrays.faceOffsets[parentFace]
+        origin = np.array(parentPolygon[(index + 1) % len(parentPolygon)])
+        target = np.array(parentPolygon[index])
+        direction = (target - origin) / np.linalg.norm(target - origin)
+        transform = transform2d.rigidTransforms(origin, direction)
+        hingePolygon = self._polygonCache.get(childFace, meshArrays.faceEdgeBegins[faceEdge],
+                                              meshArrays.faceEdgeEnds[faceEdge])
+        try:
+            self._store(child, transform2d.apply(transform, hingePolygon).tolist())
+        except OverlapError:
+            return False
+        return True
+
+    def _store(self, node, polygon):
+        self._overlapIndex.add(node, polygon)
+        self._inTree[node] = True
+
+    def _unplace(self, node):
+        self._inTree[node] = False
+        self._overlapIndex.remove(node)
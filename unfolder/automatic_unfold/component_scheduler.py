@@ -0,0 +1,127 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import numpy as np
+
+from unfolder.automatic_unfold.mesh_to_graph import meshToGraph
+from unfolder.automatic_unfold.worker_pool import createWorkerPool, workerState
+from unfolder.graph.graph import Graph
+from unfolder.graph.graph_builder import GraphBuilder
+from unfolder.mesh.face import FaceIter
+from unfolder.model.tree_to_model.tree_to_model import treeToModel
+from unfolder.tree.knot import graphToTree
+
+
+def unfoldComponent(meshImpl, graph: Graph):
+    """ Unfold a connected set of faces along the spanning tree found first. """
+    return treeToModel(graphToTree(graph.getSpanningTree().impl), FaceIter(meshImpl))
+
+
+def faceCount(graph: Graph):
+    return len(graph.nodes)
+
+
+def logSpanningTreeCount(graph: Graph):
+    """ The natural logarithm of the number of spanning trees of a connected graph. """
+    numNodes = len(graph.nodes)
+    if numNodes <= 1:
+        return 0.
+    laplacian = np.zeros((numNodes, numNodes))
+    for (fst, snd) in {edge.nodes for edge in graph.impl.edges}:
+        laplacian[fst, fst] += 1
+        laplacian[snd, snd] += 1
+        laplacian[fst, snd] -= 1
+        laplacian[snd, fst] -= 1
+    (sign, logDeterminant) = np.linalg.slogdet(laplacian[1:, 1:])
+    return logDeterminant if sign > 0 else float('-inf')
+
+
+def getComponents(meshImpls):
+    """ The connected face graphs of all meshes as (mesh index, component index, graph). """
+    retval = []
+    for meshIndex, meshImpl in enumerate(meshImpls):
+        graph = meshToGraph(FaceIter(meshImpl), GraphBuilder())
+        for componentIndex, component in enumerate(graph.getConnectedComponents()):
+            retval.append((meshIndex, componentIndex, component))
+    return retval
+
+
+def unfoldComponents(meshImpls, unfold=unfoldComponent):
+    """ Unfold the components of all meshes one after another in this process.
+
+    Yields (mesh index, component index, result) in the same order as
+    unfoldComponentsInParallel.
+    """
+    for meshIndex, componentIndex, component in getComponents(meshImpls):
+        yield meshIndex, componentIndex, unfold(meshImpls[meshIndex], component)
+
+
+def unfoldComponentsInParallel(meshImpls, unfold=unfoldComponent, cost=faceCount, maxWorkers=None,
+                               maxPending=None, maxBuffered=None):
+    """ Unfold the components of all meshes concurrently on a process pool.
+
+    Every connected set of faces is an independent problem. The components
+    are handed out largest first by their estimated cost, so the wall time
+    gets close to the time of the largest component. At most maxPending
+    components (twice the number of workers by default) are in flight at
+    once, the meshes are sent to every worker only once.
+
+    Yields (mesh index, component index, result) ordered by mesh and
+    component index, no matter which component finishes first. Results
+    wait for the earlier components, at most maxBuffered (four times
+    maxPending by default) of them are held or in flight. Once that many
+    are, only the next component in output order is handed out. The unfold
+    and cost functions have to be picklable, i.e. defined at module level.
+    """
+    numWorkers = maxWorkers or os.cpu_count() or 1
+    maxPending = maxPending or 2 * numWorkers
+    maxBuffered = maxBuffered or 4 * maxPending
+    components = getComponents(meshImpls)
+    jobs = ComponentJobs([cost(component) for _, _, component in components])
+
+    results = {}
+    nextJob = 0
+    with createWorkerPool(numWorkers, meshImpls=meshImpls, unfold=unfold) as executor:
+        pending = {}
+        while nextJob < len(components):
+            while len(pending) < maxPending:
+                job = jobs.next(nextJob if len(results) + len(pending) >= maxBuffered else None)
+                if job is None:
+                    break
+                (meshIndex, _, component) = components[job]
+                pending[executor.submit(unfoldJob, meshIndex, component.impl)] = job
+            (done, _) = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+            while nextJob in results:
+                (meshIndex, componentIndex, _) = components[nextJob]
+                yield meshIndex, componentIndex, results.pop(nextJob)
+                nextJob += 1
+
+
+# private
+
+
+class ComponentJobs:
+    """ Hand out the jobs 0 .. n - 1 most expensive first, ties in job order. """
+
+    def __init__(self, costs):
+        # the most expensive job is popped first
+        self._byCost = sorted(range(len(costs)), key=lambda job: (costs[job], -job))
+        self._isHandedOut = [False] * len(costs)
+
+    def next(self, onlyJob=None):
+        """ The most expensive job not handed out yet, only onlyJob if given, None if there is none. """
+        if onlyJob is not None:
+            job = onlyJob if not self._isHandedOut[onlyJob] else None
+        else:
+            while self._byCost and self._isHandedOut[self._byCost[-1]]:
+                self._byCost.pop()
+            job = self._byCost.pop() if self._byCost else None
+        if job is not None:
+            self._isHandedOut[job] = True
+        return job
+
+
+def unfoldJob(meshIndex, graphImpl):
+    return workerState['unfold'](workerState['meshImpls'][meshIndex], Graph(graphImpl))
@@ -1,6 +1,5 @@
 import maya.OpenMaya as om
-from unfolder.analyze_patch.inner_vertex_checker import InnerVertexChecker
-from unfolder.util.helpers import setIter
+from unfolder.analyze_patch.overlap_engine import OverlapEngine
 
 
 def detectCollision(mesh):
@@ -8,36 +7,26 @@ def detectCollision(mesh):
     mesh.getPath(dagPath)
     faceIter = om.MItMeshPolygon(dagPath)
     vertexIter = om.MItMeshVertex(dagPath)
-    edgeIter = om.MItMeshEdge(dagPath)
 
     vertices = []
     while not vertexIter.isDone():
         vertex = vertexIter.position()
-        vertices.append(vertex)
+        vertices.append(to2d(vertex))
         vertexIter.next()
 
-    result = False
+    # the faces in vertex order, all of them are checked against each other at once
+    polygons = []
     while not faceIter.isDone():
-        edgesIndices = om.MIntArray()
-        faceIter.getEdges(edgesIndices)
-
-        edges = []
-        for edgeIndex in edgesIndices:
-            setIter(edgeIter, edgeIndex)
-            vertex1 = edgeIter.point(0)
-            vertex2 = edgeIter.point(1)
-            edges.append((to2d(vertex1), to2d(vertex2)))
-
-        checker = InnerVertexChecker(edges)
-
-        for vertex in vertices:
-            if checker.isInnerVertex(vertex):
-                print('collision')
-                return True
-        print(result)
+        vertexIndices = om.MIntArray()
+        faceIter.getVertices(vertexIndices)
+        polygons.append([vertices[vertexIndex] for vertexIndex in vertexIndices])
         faceIter.next()
+
+    if len(OverlapEngine.fromPolygons(polygons).findOverlaps()):
+        print('collision')
+        return True
     print('no collision')
     return False
 
 def to2d(vertex):
-    return (vertex(0), vertex(2))
\ No newline at end of file
+    return (vertex(0), vertex(2))
@@ -13,28 +13,22 @@ def createFacetreeLightning(dagPath, connectedFaces):
         setIter(retval, initialFace)
         return retval
 
-    def extractConnectedFaces(faceIter, remainingFaces):
-        face = faceIter.index()
-
+    def extractConnectedFaces(faceIter, node, remainingFaces):
         connectedFaces = om.MIntArray()
         faceIter.getConnectedFaces(connectedFaces)
         neighbours = frozenset(connectedFaces) & remainingFaces
         remainingFaces -= neighbours
 
-        children = []
         for connectedFace in neighbours:
             setIter(faceIter, connectedFace)
-            children.append(extractConnectedFaces(faceIter, remainingFaces))
-
-        node = Tree(face)
-        node.children = children
-        return node
+            extractConnectedFaces(faceIter, node.addChild(connectedFace), remainingFaces)
 
     print("duplicating model")
     initialFace = connectedFaces[0]
     remainingFaces = set(connectedFaces[1:])
     faceIter = createFaceIter(initialFace)
-    tree = extractConnectedFaces(faceIter, remainingFaces)
+    tree = Tree(initialFace)
+    extractConnectedFaces(faceIter, tree, remainingFaces)
     print("duplicating model ... done")
     return tree
 
@@ -0,0 +1,161 @@
+import numpy as np
+
+from unfolder.automatic_unfold.batch_unfold import BatchUnfolder
+from unfolder.graph.graph_impl import GraphImpl
+from unfolder.mesh.mesh_arrays import MeshArrays
+from unfolder.util import transform2d
+
+
+class IncrementalUnfolding:
+    """ The unfolding of a spanning tree of one component, updated edge swap by edge swap.
+
+    The tree is given by the indices of its edges in graph.edges and is hung
+    from the root node. Every face is placed by the transform of its fixed
+    frame (see BatchUnfolder) into the frame of the root, the transform of a
+    node is the one of its parent composed with the transform along its
+    parent edge. Thus the placement of a face only depends on its path to the
+    root.
+
+    Swapping a tree edge for a non tree edge detaches the subtree below the
+    removed edge, hangs it from the new edge and re-roots it at the node the
+    new edge enters it by. Only the transforms and corners of that subtree
+    change, they are recomputed level by level in the same way the initial
+    unfolding computes them, so after any number of swaps the unfolding is
+    exactly the one of a new IncrementalUnfolding of the current tree.
+
+    transforms  nodes x 2 x 3 transforms of the face frames into the root frame
+    corners     the loop vertex positions of all faces, the ones of node n are
+                corners[cornerOffsets[n]:cornerOffsets[n + 1]]
+    """
+
+    def __init__(self, graph: GraphImpl, meshArrays: MeshArrays, treeEdges, root=0, batchUnfolder=None):
+        self._unfolder = batchUnfolder if batchUnfolder is not None else BatchUnfolder(graph, meshArrays)
+        self.faces = self._unfolder.faces
+        self.cornerOffsets = self._unfolder.cornerOffsets
+        self.root = root
+        numNodes = len(self.faces)
+        treeEdges = list(treeEdges)
+        if len(treeEdges) != numNodes - 1:
+            raise ValueError('Error ' + repr(treeEdges) + ' are no spanning tree edges')
+        self._edgeNodes = self._unfolder.edgeNodes.tolist()
+        self._treeEdges = set(treeEdges)
+        self._buildTree(treeEdges)
+        self.transforms = transform2d.identity((numNodes,))
+        self.corners = np.empty((self.cornerOffsets[-1], 2))
+        self._placeSubtree(root)
+
+    def getTreeEdges(self):
+        return sorted(self._treeEdges)
+
+    def isTreeEdge(self, edge):
+        return edge in self._treeEdges
+
+    def getParent(self, node):
+        return self._parents[node]
+
+    def getPolygon(self, node):
+        """ The unfolded face of a node (N x 2). """
+        return self.corners[self.cornerOffsets[node]:self.cornerOffsets[node + 1]]
+
+    def getPolygons(self):
+        return np.split(self.corners, self.cornerOffsets[1:-1])
+
+    def swapEdges(self, removedEdge, addedEdge):
+        """ Replace a tree edge by a non tree edge, returns the faces that moved.
+
+        The added edge has to connect the subtree below the removed edge to the
+        rest of the tree. The cost is linear in the size of that subtree.
+        """
+        if removedEdge not in self._treeEdges:
+            raise ValueError('Error edge ' + str(removedEdge) + ' is not in the tree')
+        if addedEdge in self._treeEdges:
+            raise ValueError('Error edge ' + str(addedEdge) + ' is already in the tree')
+        (fst, snd) = self._edgeNodes[removedEdge]
+        subtreeRoot = snd if self._parentEdges[snd] == removedEdge else fst
+        subtree = set(self._iterSubtree(subtreeRoot))
+        (outside, inside) = self._edgeNodes[addedEdge]
+        if outside in subtree:
+            (outside, inside) = (inside, outside)
+        if outside in subtree or inside not in subtree:
+            raise ValueError('Error edge ' + str(addedEdge) + ' does not reconnect the tree')
+
+        self._children[self._parents[subtreeRoot]].remove(subtreeRoot)
+        self._reroot(subtreeRoot, inside, outside, addedEdge)
+        self._treeEdges.remove(removedEdge)
+        self._treeEdges.add(addedEdge)
+        moved = self._placeSubtree(inside)
+        return self.faces[moved]
+
+    # private
+
+    def _buildTree(self, treeEdges):
+        numNodes = len(self.faces)
+        adjacency = [[] for _ in range(numNodes)]
+        for edge in treeEdges:
+            (fst, snd) = self._edgeNodes[edge]
+            adjacency[fst].append((edge, snd))
+            adjacency[snd].append((edge, fst))
+        self._parents = [-1] * numNodes
+        self._parentEdges = [-1] * numNodes
+        self._children = [[] for _ in range(numNodes)]
+        visited = [False] * numNodes
+        visited[self.root] = True
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            for edge, other in adjacency[node]:
+                if not visited[other]:
+                    visited[other] = True
+                    self._parents[other] = node
+                    self._parentEdges[other] = edge
+                    self._children[node].append(other)
+                    stack.append(other)
+        if not all(visited):
+            raise ValueError('Error ' + repr(treeEdges) + ' are no spanning tree edges')
+
+    def _iterSubtree(self, node):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(self._children[node])
+
+    def _reroot(self, subtreeRoot, newRoot, newParent, newEdge):
+        """ Hang the detached subtree from newParent, reversing the path from newRoot up to its root. """
+        node = newRoot
+        while True:
+            (oldParent, oldEdge) = (self._parents[node], self._parentEdges[node])
+            self._parents[node] = newParent
+            self._parentEdges[node] = newEdge
+            self._children[newParent].append(node)
+            if node == subtreeRoot:
+                break
+            self._children[oldParent].remove(node)
+            (node, newParent, newEdge) = (oldParent, node, oldEdge)
+
+    def _placeSubtree(self, node):
+        """ Recompute the transforms and corners of a subtree level by level, returns its nodes. """
+        edgeTransforms = self._unfolder.edgeTransforms
+        moved = []
+        level = [node]
+        while level:
+            moved.extend(level)
+            nodes = np.array(level, dtype=np.int64)
+            parents = np.array([self._parents[node] for node in level], dtype=np.int64)
+            edges = np.array([self._parentEdges[node] for node in level], dtype=np.int64)
+            isRoot = parents < 0
+            edges[isRoot] = 0
+            # side 1 if the node is the second node of its parent edge
+            sides = (self._unfolder.edgeNodes[edges, 1] == nodes).astype(np.int64)
+            transforms = transform2d.compose(self.transforms[parents], edgeTransforms[edges, sides])
+            transforms[isRoot] = transform2d.identity()
+            self.transforms[nodes] = transforms
+            level = [child for node in level for child in self._children[node]]
+
+        moved = np.array(moved, dtype=np.int64)
+        corners = np.concatenate([np.arange(self.cornerOffsets[node], self.cornerOffsets[node + 1])
+                                  for node in moved.tolist()])
+        cornerTransforms = self.transforms[self._unfolder.cornerNodes[corners]]
+        self.corners[corners] = np.einsum('cij,cj->ci', cornerTransforms[..., :2],
+                                          self._unfolder.localCorners[corners]) + cornerTransforms[..., 2]
+        return moved
@@ -0,0 +1,80 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from unfolder.analyze_patch.model_score import calculateModelScore
+from unfolder.automatic_unfold.worker_pool import createWorkerPool, workerState
+from unfolder.graph.graph import Graph
+from unfolder.graph.spanning_tree_ranking import SpanningTreeRanking
+from unfolder.mesh.face import FaceIter
+from unfolder.model.tree_to_model.tree_to_model import treeToModel
+from unfolder.tree.knot import graphToTree
+
+
+def scoreSpanningTreesInParallel(meshImpl, graph: Graph, score=calculateModelScore, maxWorkers=None,
+                                 minChunkSize=16):
+    """ Unfold and score every spanning tree of a connected face graph on a process pool.
+
+    The spanning trees are identified by their rank (see SpanningTreeRanking).
+    The ranks are split into contiguous chunks, every chunk covers a block of
+    leading branch decisions of the enumeration. Each worker unfolds and
+    scores the trees of its chunk locally and only sends back the ranks and
+    scores.
+
+    Chunks are handed out on demand with guided self scheduling: a chunk
+    covers a share of the ranks not handed out yet, so the chunks get smaller
+    towards the end and idle workers pick up the remaining work.
+
+    Yields (rank, score) pairs in the order the chunks are completed. The
+    score function has to be picklable, i.e. defined at module level.
+    """
+    numWorkers = maxWorkers or os.cpu_count() or 1
+    chunks = GuidedChunks(SpanningTreeRanking(graph).count, numWorkers, minChunkSize)
+    with createWorkerPool(numWorkers, meshImpl=meshImpl, graphImpl=graph.impl, score=score) as executor:
+        pending = set()
+        while True:
+            while len(pending) < 2 * numWorkers and chunks.hasNext():
+                (begin, end) = chunks.next()
+                pending.add(executor.submit(scoreChunk, begin, end))
+            if not pending:
+                break
+            (done, pending) = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for result in future.result():
+                    yield result
+
+
+def scoreSpanningTrees(meshImpl, graph: Graph, score=calculateModelScore, begin=0, end=None):
+    """ Unfold and score the spanning trees with ranks in [begin, end) in this process. """
+    faces = FaceIter(meshImpl)
+    ranking = SpanningTreeRanking(graph)
+    for rank, spanningTree in enumerate(ranking.trees(begin, end), begin):
+        model = treeToModel(graphToTree(spanningTree), faces)
+        yield rank, score(model)
+
+
+# private
+
+
+class GuidedChunks:
+    """ Split the ranks 0 .. count - 1 into chunks of decreasing size. """
+
+    def __init__(self, count, numWorkers, minChunkSize):
+        self._count = count
+        self._numWorkers = numWorkers
+        self._minChunkSize = minChunkSize
+        self._begin = 0
+
+    def hasNext(self):
+        return self._begin < self._count
+
+    def next(self):
+        remaining = self._count - self._begin
+        size = min(remaining, max(self._minChunkSize, remaining // (2 * self._numWorkers)))
+        chunk = (self._begin, self._begin + size)
+        self._begin += size
+        return chunk
+
+
+def scoreChunk(begin, end):
+    return list(scoreSpanningTrees(workerState['meshImpl'], Graph(workerState['graphImpl']), workerState['score'],
+                                   begin, end))
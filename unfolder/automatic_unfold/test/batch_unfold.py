@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+import numpy as np
+
+from unfolder.automatic_unfold.batch_unfold import BatchUnfolder, getParentEdges
+from unfolder.automatic_unfold.mesh_to_graph import meshToGraph
+from unfolder.graph.graph_builder import GraphBuilder
+from unfolder.graph.spanning_tree_ranking import SpanningTreeRanking
+from unfolder.mesh.face import FaceIter
+from unfolder.mesh.mesh_arrays import MeshArrays
+from unfolder.mesh.obj_importer import ObjImporter
+from unfolder.model.tree_to_model.tree_to_model import treeToModel
+from unfolder.tree.rooted_tree import RootedTree
+
+
+class BatchUnfoldTests(TestCase):
+    def _unfold(self, filename, root=0):
+        mesh = ObjImporter().read(filename)
+        faces = FaceIter(mesh)
+        component = meshToGraph(faces, GraphBuilder()).getConnectedComponents()[0]
+        trees = list(SpanningTreeRanking(component).trees())
+        unfolder = BatchUnfolder(component.impl, MeshArrays(mesh))
+        layout = unfolder.unfold(getParentEdges(component.impl, trees, root))
+        return faces, trees, unfolder, layout
+
+    def assertSameLayout(self, faces, trees, layout, root):
+        self.assertEqual(len(layout), len(trees))
+        for index, tree in enumerate(trees):
+            model = treeToModel(RootedTree(tree, root), faces)
+            vertices = model.impl.vertexArray[:, :2]
+            patchVertices = {patch.name: vertices[patch.vertices] for patch in model.patches}
+            for face, polygon in zip(layout.faces, layout.getPolygons(index)):
+                # treeToModel merges vertices, so compare by the closest model vertex
+                expected = patchVertices[face]
+                for vertex in polygon:
+                    self.assertAlmostEqual(np.min(np.linalg.norm(expected - vertex, axis=1)), 0., places=9)
+
+    def test_box(self):
+        (faces, trees, _, layout) = self._unfold('resources/box.obj')
+        self.assertEqual(len(trees), 384)
+        self.assertSameLayout(faces, trees, layout, 0)
+
+    def test_pyramid(self):
+        (faces, trees, _, layout) = self._unfold('resources/pyramid.obj', root=3)
+        self.assertSameLayout(faces, trees, layout, 3)
+
+    def test_boundingBoxAreas(self):
+        (_, _, _, layout) = self._unfold('resources/box.obj')
+        boxes = layout.boundingBoxes()
+        np.testing.assert_allclose(layout.boundingBoxAreas(), np.prod(boxes[:, 1] - boxes[:, 0], axis=1))
+        # the unit faces of the box never lay out in less than 6 area units
+        self.assertTrue(np.all(layout.boundingBoxAreas() >= 6 - 1e-9))
+
+    def test_invalidParentEdges(self):
+        (_, _, unfolder, _) = self._unfold('resources/box.obj')
+        edgeNodes = unfolder.edgeNodes.tolist()
+        # two faces pointing at each other
+        (fst, snd) = edgeNodes[0]
+        parentEdges = np.full((1, len(unfolder.faces)), -1)
+        parentEdges[0, fst] = parentEdges[0, snd] = 0
+        with self.assertRaises(ValueError):
+            unfolder.toRoot(parentEdges)
+        # an edge that does not touch the face
+        otherEdge = next(index for index, nodes in enumerate(edgeNodes) if fst not in nodes)
+        parentEdges = np.full((1, len(unfolder.faces)), -1)
+        parentEdges[0, fst] = otherEdge
+        with self.assertRaises(ValueError):
+            unfolder.toRoot(parentEdges)
@@ -0,0 +1,56 @@
+from unittest import TestCase
+from unfolder.analyze_patch.polygon_overlap import polygonsOverlap
+from unfolder.automatic_unfold.branch_and_bound import getOverlapFreeSpanningTrees
+from unfolder.automatic_unfold.mesh_to_graph import meshToGraph
+from unfolder.graph.graph import Graph
+from unfolder.graph.graph_builder import GraphBuilder
+from unfolder.graph.spanning_tree_ranking import SpanningTreeRanking
+from unfolder.mesh.face import FaceIter
+from unfolder.mesh.obj_importer import ObjImporter
+from unfolder.model.tree_to_model.tree_to_model import treeToModel
+from unfolder.tree.knot import graphToTree
+
+
+def treeEdges(tree):
+    return frozenset(edge.nodes for edge in tree.edges)
+
+
+def unfoldsWithoutOverlaps(tree, faces):
+    model = treeToModel(graphToTree(tree), faces)
+    polygons = [model.impl.vertexArray[patch.vertexArray, :2].tolist() for patch in model.patches]
+    return not any(polygonsOverlap(fst, snd) for index, fst in enumerate(polygons) for snd in polygons[:index])
+
+
+class BranchAndBoundTests(TestCase):
+    def _compareWithAllSpanningTrees(self, filename):
+        mesh = ObjImporter().read(filename)
+        faces = FaceIter(mesh)
+        graph = meshToGraph(faces, GraphBuilder())
+        trees = [treeEdges(tree) for tree in getOverlapFreeSpanningTrees(graph, mesh)]
+
+        expected = {treeEdges(tree) for tree in SpanningTreeRanking(graph).trees()
+                    if unfoldsWithoutOverlaps(tree, faces)}
+        self.assertEqual(len(trees), len(set(trees)))
+        self.assertEqual(set(trees), expected)
+        return trees
+
+    def test_box(self):
+        trees = self._compareWithAllSpanningTrees('resources/box.obj')
+        self.assertEqual(len(trees), 384)
+
+    def test_pyramid(self):
+        trees = self._compareWithAllSpanningTrees('resources/pyramid.obj')
+        self.assertEqual(len(trees), 45)
+
+    def test_saddle(self):
+        # the angles around the saddle vertex add up to more than 360 degrees,
+        # every unfolding overlaps
+        trees = self._compareWithAllSpanningTrees('resources/saddle.obj')
+        self.assertEqual(trees, [])
+
+    def test_spanningTrees(self):
+        mesh = ObjImporter().read('resources/box.obj')
+        graph = meshToGraph(FaceIter(mesh), GraphBuilder())
+        for tree in getOverlapFreeSpanningTrees(graph, mesh):
+            self.assertTrue(Graph(tree).isTree())
+            self.assertEqual(len(tree.edges), 5)
@@ -0,0 +1,60 @@
+from math import log
+from unittest import TestCase
+from unfolder.automatic_unfold.component_scheduler import unfoldComponentsInParallel, unfoldComponents, \
+    getComponents, logSpanningTreeCount, faceCount, ComponentJobs
+from unfolder.mesh.obj_importer import ObjImporter
+
+
+def faceIndices(meshImpl, graph):
+    return sorted(graph.nodes)
+
+
+def numPatches(model):
+    return len(model.patches)
+
+
+class ComponentSchedulerTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.meshes = [ObjImporter().read('resources/' + name)
+                      for name in ('box-and-pyramid.obj', 'box.obj', 'pyramid.obj')]
+
+    def test_getComponents(self):
+        components = getComponents(self.meshes)
+        self.assertEqual([(meshIndex, componentIndex) for meshIndex, componentIndex, _ in components],
+                         [(0, 0), (0, 1), (1, 0), (2, 0)])
+        self.assertEqual(sorted(faceCount(component) for _, _, component in components), [5, 5, 6, 6])
+
+    def test_logSpanningTreeCount(self):
+        counts = sorted(logSpanningTreeCount(component) for _, _, component in getComponents(self.meshes))
+        for count, expected in zip(counts, (45, 45, 384, 384)):
+            self.assertAlmostEqual(count, log(expected))
+
+    def test_unfoldComponentsInParallel(self):
+        results = list(unfoldComponentsInParallel(self.meshes, maxWorkers=2, maxPending=3))
+
+        # merged in component order with the same models as the sequential unfolding
+        expected = list(unfoldComponents(self.meshes))
+        self.assertEqual([result[:2] for result in results], [result[:2] for result in expected])
+        self.assertEqual([numPatches(model) for _, _, model in results],
+                         [numPatches(model) for _, _, model in expected])
+        for (_, _, model), (_, _, expectedModel) in zip(results, expected):
+            self.assertEqual(model.impl.vertexArray.tolist(), expectedModel.impl.vertexArray.tolist())
+
+    def test_maxBuffered(self):
+        results = list(unfoldComponentsInParallel(self.meshes, faceIndices, maxWorkers=2, maxBuffered=1))
+        self.assertEqual(results, list(unfoldComponents(self.meshes, faceIndices)))
+
+    def test_componentJobs(self):
+        jobs = ComponentJobs([2, 5, 1, 5, 3])
+        self.assertEqual([jobs.next(), jobs.next()], [1, 3])
+        # a full buffer only lets the next job in output order through
+        self.assertEqual(jobs.next(0), 0)
+        self.assertIsNone(jobs.next(1))
+        self.assertEqual([jobs.next(), jobs.next(), jobs.next()], [4, 2, None])
+
+    def test_costFunction(self):
+        results = list(unfoldComponentsInParallel(self.meshes, faceIndices, cost=logSpanningTreeCount,
+                                                  maxWorkers=2))
+        self.assertEqual(results, list(unfoldComponents(self.meshes, faceIndices)))
+        self.assertEqual(results[0], (0, 0, [0, 1, 2, 3, 4]))
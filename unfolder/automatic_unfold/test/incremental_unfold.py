@@ -0,0 +1,85 @@
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from unfolder.automatic_unfold.batch_unfold import BatchUnfolder, getParentEdges
+from unfolder.automatic_unfold.incremental_unfold import IncrementalUnfolding
+from unfolder.automatic_unfold.mesh_to_graph import meshToGraph
+from unfolder.graph.graph_builder import GraphBuilder
+from unfolder.graph.graph_impl import GraphImpl
+from unfolder.mesh.face import FaceIter
+from unfolder.mesh.mesh_arrays import MeshArrays
+from unfolder.mesh.obj_importer import ObjImporter
+
+
+class IncrementalUnfoldingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        mesh = ObjImporter().read('resources/torus.obj')
+        cls.graph = meshToGraph(FaceIter(mesh), GraphBuilder()).getConnectedComponents()[0].impl
+        cls.meshArrays = MeshArrays(mesh)
+        cls.unfolder = BatchUnfolder(cls.graph, cls.meshArrays)
+        cls.treeEdges = cls._getSpanningTreeEdges(cls.graph)
+
+    @staticmethod
+    def _getSpanningTreeEdges(graph):
+        reached = {0}
+        treeEdges = []
+        for _ in range(len(graph.nodes) - 1):
+            for edgeIndex, edge in enumerate(graph.edges):
+                (fst, snd) = edge.nodes
+                if (fst in reached) != (snd in reached):
+                    reached.update(edge.nodes)
+                    treeEdges.append(edgeIndex)
+                    break
+        return treeEdges
+
+    def _randomSwap(self, unfolding, rand):
+        while True:
+            removedEdge = rand.choice(unfolding.getTreeEdges())
+            (fst, snd) = self.graph.edges[removedEdge].nodes
+            child = snd if unfolding.getParent(snd) == fst else fst
+            subtree = set(unfolding._iterSubtree(child))
+            candidates = [edgeIndex for edgeIndex, edge in enumerate(self.graph.edges)
+                          if not unfolding.isTreeEdge(edgeIndex)
+                          and (edge.nodes[0] in subtree) != (edge.nodes[1] in subtree)]
+            if candidates:
+                return removedEdge, rand.choice(candidates), subtree
+
+    def test_matchesBatchUnfold(self):
+        unfolding = IncrementalUnfolding(self.graph, self.meshArrays, self.treeEdges)
+        treeGraph = GraphImpl(self.graph.nodes, [self.graph.edges[edge] for edge in self.treeEdges])
+        layout = self.unfolder.unfold(getParentEdges(self.graph, [treeGraph]))
+        np.testing.assert_allclose(unfolding.corners, layout.corners[0], atol=1e-9)
+
+    def test_swapEdges(self):
+        rand = random.Random(7)
+        unfolding = IncrementalUnfolding(self.graph, self.meshArrays, self.treeEdges, batchUnfolder=self.unfolder)
+        for _ in range(30):
+            (removedEdge, addedEdge, subtree) = self._randomSwap(unfolding, rand)
+            before = unfolding.corners.copy()
+            moved = unfolding.swapEdges(removedEdge, addedEdge)
+            self.assertEqual(sorted(moved), sorted(self.graph.nodes[node] for node in subtree))
+            # only the subtree moved, everything matches a rebuild of the new tree exactly
+            rebuilt = IncrementalUnfolding(self.graph, self.meshArrays, unfolding.getTreeEdges(),
+                                           batchUnfolder=self.unfolder)
+            np.testing.assert_array_equal(unfolding.transforms, rebuilt.transforms)
+            np.testing.assert_array_equal(unfolding.corners, rebuilt.corners)
+            for node in set(range(len(self.graph.nodes))) - subtree:
+                np.testing.assert_array_equal(unfolding.getPolygon(node),
+                                              before[unfolding.cornerOffsets[node]:unfolding.cornerOffsets[node + 1]])
+
+    def test_invalidSwaps(self):
+        unfolding = IncrementalUnfolding(self.graph, self.meshArrays, self.treeEdges, batchUnfolder=self.unfolder)
+        nonTreeEdges = [edge for edge in range(len(self.graph.edges)) if not unfolding.isTreeEdge(edge)]
+        with self.assertRaises(ValueError):
+            unfolding.swapEdges(nonTreeEdges[0], nonTreeEdges[1])
+        with self.assertRaises(ValueError):
+            unfolding.swapEdges(self.treeEdges[0], self.treeEdges[1])
+        # the leaf below the last tree edge can not be reconnected by an edge it is not part of
+        leaf = self.graph.edges[self.treeEdges[-1]].nodes
+        otherEdge = next(edge for edge in nonTreeEdges if not set(self.graph.edges[edge].nodes) & set(leaf))
+        with self.assertRaises(ValueError):
+            unfolding.swapEdges(self.treeEdges[-1], otherEdge)
+        self.assertEqual(unfolding.getTreeEdges(), sorted(self.treeEdges))
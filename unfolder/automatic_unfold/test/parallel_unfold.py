@@ -0,0 +1,47 @@
+from unittest import TestCase
+from unfolder.automatic_unfold.mesh_to_graph import meshToGraph
+from unfolder.automatic_unfold.parallel_unfold import scoreSpanningTreesInParallel, scoreSpanningTrees, \
+    GuidedChunks
+from unfolder.graph.graph_builder import GraphBuilder
+from unfolder.mesh.face import FaceIter
+from unfolder.mesh.obj_importer import ObjImporter
+
+
+def numPatches(model):
+    return len(model.patches)
+
+
+class ParallelUnfoldTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.mesh = ObjImporter().read('resources/box.obj')
+        cls.graph = meshToGraph(FaceIter(cls.mesh), GraphBuilder())
+
+    def test_scoreSpanningTreesInParallel(self):
+        results = list(scoreSpanningTreesInParallel(self.mesh, self.graph, numPatches, maxWorkers=2,
+                                                    minChunkSize=10))
+
+        # every spanning tree of the box is scored exactly once
+        self.assertEqual(sorted(rank for rank, score in results), list(range(384)))
+        self.assertEqual(sorted(results), list(scoreSpanningTrees(self.mesh, self.graph, numPatches)))
+        self.assertTrue(all(score == 6 for rank, score in results))
+
+    def test_scoreSpanningTrees_range(self):
+        results = list(scoreSpanningTrees(self.mesh, self.graph, numPatches, 100, 110))
+
+        self.assertEqual([rank for rank, score in results], list(range(100, 110)))
+
+    def test_guidedChunks(self):
+        chunks = GuidedChunks(1000, 4, 16)
+        ranges = []
+        while chunks.hasNext():
+            ranges.append(chunks.next())
+
+        # the chunks cover all ranks without gaps and get smaller
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], 1000)
+        for (_, end), (begin, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, begin)
+        sizes = [end - begin for begin, end in ranges]
+        self.assertEqual(sizes, sorted(sizes, reverse=True))
+        self.assertEqual(sizes[0], 125)
@@ -0,0 +1,21 @@
+from concurrent.futures import ProcessPoolExecutor
+
+# the state of a worker process, set up once per worker by createWorkerPool
+workerState = {}
+
+
+def createWorkerPool(numWorkers, **state):
+    """ A process pool whose workers receive state only once.
+
+    Jobs running on the pool read the state from workerState, so large
+    arguments like meshes are not pickled for every job. Jobs have to be
+    picklable, i.e. defined at module level.
+    """
+    return ProcessPoolExecutor(numWorkers, initializer=_initWorker, initargs=(state,))
+
+
+# private
+
+
+def _initWorker(state):
+    workerState.update(state)
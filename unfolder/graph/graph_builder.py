@@ -1,4 +1,5 @@
 from unfolder.graph.graph_impl import EdgeImpl, GraphImpl
+from unfolder.util.pools import EdgePool
 
 
 def buildGraph():
@@ -9,8 +10,7 @@ class GraphBuilder:
         self._nodes = []
         self._nodeMap = {}
         self._edgeLists = []
-        self._edges = []
-        self._edgeMap = {}
+        self._edges = EdgePool()
 
     def addNode(self, value, connectedValues):
         thisIndex = self._createNode(value)
@@ -26,13 +26,12 @@ class GraphBuilder:
         return frozenset(connectedValues) - currentlyConnectedValues
 
     def _getConnectedEdges(self, nodeIndex):
-        return [self._edges[edgeIndex] for edgeIndex in self._edgeLists[nodeIndex]]
+        return [self._edges.getVertices(edgeIndex) for edgeIndex in self._edgeLists[nodeIndex]]
 
     def _getConnectedNodes(self, nodeIndex):
-        def getOther(edge, nodeIndex):
-            nodes = edge.nodes
+        def getOther(nodes, nodeIndex):
             return nodes[not nodes.index(nodeIndex)]
-        return [getOther(edge, nodeIndex) for edge in self._getConnectedEdges(nodeIndex)]
+        return [getOther(nodes, nodeIndex) for nodes in self._getConnectedEdges(nodeIndex)]
 
     def _createNode(self, value):
         if value in self._nodeMap:
@@ -45,16 +44,14 @@ class GraphBuilder:
             return index
 
     def _createEdge(self, firstIndex, secondIndex):
-        edge = EdgeImpl(firstIndex, secondIndex)
-        if edge in self._edgeMap:
-            return self._edgeMap[edge]
-        else:
-            index = len(self._edges)
-            self._edges.append(edge)
-            self._edgeMap[edge] = index
+        if firstIndex == secondIndex:
+            raise ValueError('Loop detected ' + str(firstIndex))
+        numEdges = len(self._edges)
+        index = self._edges.push(firstIndex, secondIndex)
+        if index == numEdges:
             self._edgeLists[firstIndex].append(index)
             self._edgeLists[secondIndex].append(index)
-            return index
+        return index
 
     def toGraph(self):
-        return GraphImpl(self._nodes, self._edges)
+        return GraphImpl(self._nodes, [EdgeImpl(fst, snd) for fst, snd in self._edges.vertices.tolist()])
@@ -0,0 +1,227 @@
+from unfolder.graph.graph import Graph
+from unfolder.graph.graph_impl import GraphImpl
+
+
+def getSpanningTreeRanking(graph: Graph):
+    return SpanningTreeRanking(graph)
+
+
+class SpanningTreeRanking:
+    """ Rank and unrank the spanning trees of a graph.
+
+    The spanning trees are totally ordered by the decisions taken on the graph
+    edges in the order of graph.edges: trees containing the first edge come
+    before the trees not containing it, ties are broken by the second edge and
+    so on. The number of trees on each side of a decision is counted with the
+    matrix tree theorem on the graph with the included edges contracted and
+    the excluded edges deleted.
+
+    The ranks of a graph are 0 .. count - 1. A range of ranks [begin, end)
+    describes a disjoint, reproducible share of all spanning trees.
+
+    Parallel edges connect the same nodes and are treated as a single edge.
+    """
+
+    def __init__(self, graph: Graph):
+        self.graph = graph.impl
+        self._edgeIndices = {}
+        self._edgeImpls = []
+        for edge in self.graph.edges:
+            if edge.nodes not in self._edgeIndices:
+                self._edgeIndices[edge.nodes] = len(self._edgeImpls)
+                self._edgeImpls.append(edge)
+        self._edges = [edge.nodes for edge in self._edgeImpls]
+        self._count = None
+
+    @property
+    def count(self):
+        """ The number of spanning trees of the graph. """
+        if self._count is None:
+            self._count = self._countCompletions(UndoableDisjointSets(len(self.graph.nodes)), 0)
+        return self._count
+
+    def rank(self, tree):
+        """ The rank of a spanning tree given as graph impl or graph. """
+        included = self._getIncludedEdges(tree)
+        disjointSets = UndoableDisjointSets(len(self.graph.nodes))
+        rank = 0
+        for edgeIndex, (fst, snd) in enumerate(self._edges):
+            if included[edgeIndex]:
+                if not disjointSets.union(fst, snd):
+                    raise ValueError('Error ' + repr(tree) + ' is not a spanning tree')
+            elif not disjointSets.isJoined(fst, snd):
+                disjointSets.union(fst, snd)
+                rank += self._countCompletions(disjointSets, edgeIndex + 1)
+                disjointSets.undo()
+        if disjointSets.numSets > 1:
+            raise ValueError('Error ' + repr(tree) + ' is not a spanning tree')
+        return rank
+
+    def unrank(self, rank):
+        """ The spanning tree with a certain rank. """
+        return self._toTree(self._unrankDecisions(rank)[0])
+
+    def trees(self, begin=0, end=None):
+        """ Iterate the spanning trees with ranks in [begin, end) in order. """
+        end = self.count if end is None else min(end, self.count)
+        if begin >= end:
+            return
+        (included, disjointSets) = self._unrankDecisions(begin)
+        yield self._toTree(included)
+        for rank in range(begin + 1, end):
+            self._advance(included, disjointSets)
+            yield self._toTree(included)
+
+    def shards(self, numShards):
+        """ Split the ranks into numShards contiguous ranges of almost equal size. """
+        count = self.count
+        bounds = [count * shard // numShards for shard in range(numShards + 1)]
+        return [(bounds[shard], bounds[shard + 1]) for shard in range(numShards)]
+
+    # private
+
+    def _getIncludedEdges(self, tree):
+        treeImpl = tree.impl if isinstance(tree, Graph) else tree
+        included = [False] * len(self._edges)
+        for edge in treeImpl.edges:
+            if edge.nodes not in self._edgeIndices:
+                raise ValueError('Error edge ' + repr(edge.nodes) + ' is not in graph')
+            if included[self._edgeIndices[edge.nodes]]:
+                raise ValueError('Error edge ' + repr(edge.nodes) + ' is in ' + repr(treeImpl) + ' twice')
+            included[self._edgeIndices[edge.nodes]] = True
+        return included
+
+    def _unrankDecisions(self, rank):
+        if not 0 <= rank < self.count:
+            raise IndexError('Error rank ' + str(rank) + ' is out of range')
+        disjointSets = UndoableDisjointSets(len(self.graph.nodes))
+        included = []
+        for edgeIndex, (fst, snd) in enumerate(self._edges):
+            if disjointSets.isJoined(fst, snd):
+                included.append(False)
+                continue
+            disjointSets.union(fst, snd)
+            numIncluding = self._countCompletions(disjointSets, edgeIndex + 1)
+            if rank < numIncluding:
+                included.append(True)
+            else:
+                disjointSets.undo()
+                rank -= numIncluding
+                included.append(False)
+        return included, disjointSets
+
+    def _advance(self, included, disjointSets):
+        """ Turn the decisions for one tree into those for the next tree. """
+        while included:
+            edgeIndex = len(included) - 1
+            if included.pop():
+                disjointSets.undo()
+                if self._isConnectedWithout(disjointSets, edgeIndex):
+                    included.append(False)
+                    self._completeGreedily(included, disjointSets)
+                    return True
+        return False
+
+    def _completeGreedily(self, included, disjointSets):
+        """ The first tree in order includes every edge that does not close a cycle. """
+        for (fst, snd) in self._edges[len(included):]:
+            included.append(disjointSets.union(fst, snd))
+
+    def _isConnectedWithout(self, disjointSets, edgeIndex):
+        components = disjointSets.components()
+        remaining = UndoableDisjointSets(max(components) + 1 if components else 0)
+        for (fst, snd) in self._edges[edgeIndex + 1:]:
+            remaining.union(components[fst], components[snd])
+        return remaining.numSets <= 1
+
+    def _countCompletions(self, disjointSets, fromEdge):
+        """ Count the spanning trees of the contracted graph that only use edges from fromEdge on. """
+        components = disjointSets.components()
+        numComponents = max(components) + 1 if components else 0
+        if numComponents <= 1:
+            return 1
+        laplacian = [[0] * numComponents for _ in range(numComponents)]
+        for (fst, snd) in self._edges[fromEdge:]:
+            (i, j) = (components[fst], components[snd])
+            if i != j:
+                laplacian[i][i] += 1
+                laplacian[j][j] += 1
+                laplacian[i][j] -= 1
+                laplacian[j][i] -= 1
+        return integerDeterminant([row[:-1] for row in laplacian[:-1]])
+
+    def _toTree(self, included):
+        edges = [self._edgeImpls[edgeIndex] for edgeIndex, isIncluded in enumerate(included) if isIncluded]
+        return GraphImpl(self.graph.nodes, edges)
+
+
+# private
+
+
+class UndoableDisjointSets:
+    """ Union find with union by size and undo of the last union. """
+
+    def __init__(self, size):
+        self._parents = list(range(size))
+        self._sizes = [1] * size
+        self._unions = []
+        self.numSets = size
+
+    def find(self, elem):
+        while self._parents[elem] != elem:
+            elem = self._parents[elem]
+        return elem
+
+    def isJoined(self, fst, snd):
+        return self.find(fst) == self.find(snd)
+
+    def union(self, fst, snd):
+        fstRoot = self.find(fst)
+        sndRoot = self.find(snd)
+        if fstRoot == sndRoot:
+            return False
+        if self._sizes[fstRoot] < self._sizes[sndRoot]:
+            (fstRoot, sndRoot) = (sndRoot, fstRoot)
+        self._parents[sndRoot] = fstRoot
+        self._sizes[fstRoot] += self._sizes[sndRoot]
+        self._unions.append(sndRoot)
+        self.numSets -= 1
+        return True
+
+    def undo(self):
+        sndRoot = self._unions.pop()
+        fstRoot = self._parents[sndRoot]
+        self._parents[sndRoot] = sndRoot
+        self._sizes[fstRoot] -= self._sizes[sndRoot]
+        self.numSets += 1
+
+    def components(self):
+        """ Label every element with the index of its set, labels are 0 .. numSets - 1. """
+        labels = {}
+        return [labels.setdefault(self.find(elem), len(labels)) for elem in range(len(self._parents))]
+
+
+def integerDeterminant(matrix):
+    """ Exact determinant of an integer matrix (fraction free Bareiss elimination). """
+    size = len(matrix)
+    if size == 0:
+        return 1
+    m = [row[:] for row in matrix]
+    sign = 1
+    prevPivot = 1
+    for k in range(size - 1):
+        if m[k][k] == 0:
+            swap = next((i for i in range(k + 1, size) if m[i][k] != 0), None)
+            if swap is None:
+                return 0
+            (m[k], m[swap]) = (m[swap], m[k])
+            sign = -sign
+        pivot = m[k][k]
+        pivotRow = m[k]
+        for i in range(k + 1, size):
+            row = m[i]
+            factor = row[k]
+            for j in range(k + 1, size):
+                row[j] = (row[j] * pivot - factor * pivotRow[j]) // prevPivot
+        prevPivot = pivot
+    return sign * m[size - 1][size - 1]
@@ -1,41 +1,141 @@
+import json
+import os
+
 from unfolder.graph.graph import Graph
 
 
-def getSpanningTrees(graph: Graph):
-    return SpanningTreeIter(graph)
+def getSpanningTrees(graph: Graph, checkpointFile=None, checkpointInterval=1000):
+    return SpanningTreeIter(graph, checkpointFile, checkpointInterval)
+
+
+def resumeSpanningTrees(graph: Graph, checkpointFile, checkpointInterval=1000):
+    """ Continue the enumeration of spanning trees saved in a checkpoint file.
+
+    Only the trees that have not been consumed before the checkpoint was
+    written are yielded. Without a checkpoint file the enumeration starts from
+    the beginning. The enumeration keeps on writing checkpoints to the same
+    file.
+    """
+    spanningTrees = SpanningTreeIter(graph, checkpointFile, checkpointInterval)
+    if os.path.exists(checkpointFile):
+        spanningTrees.loadCheckpoint(checkpointFile)
+    return spanningTrees
 
 
 # private
 
 
 class SpanningTreeIter:
-
-    def __init__(self, graph: Graph):
+    """ Enumerate all spanning trees of a graph.
+
+    The enumerator state lives in an explicit stack of derivation frames, so
+    it can be written to a checkpoint file after every checkpointInterval
+    consumed trees and restored later on. A tree counts as consumed as soon
+    as the next tree is requested.
+
+    The state belongs to the enumerator, so only one iteration can run at a
+    time. Every iteration starts over from the initial tree, except for the
+    first one after loadCheckpoint, which continues from the checkpoint. The
+    entrables of an edge are visited sorted by their nodes, so the trees come
+    in the same order in every run, which is not the order of the earlier
+    recursive enumeration.
+    """
+
+    def __init__(self, graph: Graph, checkpointFile=None, checkpointInterval=1000):
         self.graph = graph.copy().impl
         self.graph.edges.sort(key=lambda edge: edge.nodes[0])
+        self._edgeIndices = {}
+        for index, edge in enumerate(self.graph.edges):
+            self._edgeIndices.setdefault(edge, index)
 
         # initial tree
         self.T_0 = graph.getSpanningTree().impl
 
-        self._entrablesForSpanningTreeEdge = Entrables(self.T_0, self.graph).getEntrablesForSpanningTreeEdge
+        self._entrables = Entrables(self.T_0, self.graph)
+        self._entrablesForSpanningTreeEdge = self._entrables.getEntrablesForSpanningTreeEdge
+
+        self.checkpointFile = checkpointFile
+        self.checkpointInterval = checkpointInterval
+        self.numTrees = 0
+        self._stack = None
+        self._resuming = False
 
     def __iter__(self):
-        V = len(self.T_0.edges)
-        yield self.T_0
-        for T in self._derivedSpanningTrees(self.T_0, V - 1):
-            yield T
-
-    def _derivedSpanningTrees(self, T_p, k):
-        if k >= 0:
-            e_k = self.T_0.edges[k]
-            for g in self._entrablesForSpanningTreeEdge(T_p, e_k):
-                T_c = self._replaceEdge(T_p, e_k, g)
-                if T_c and Graph(T_c).isTree():
-                    yield T_c
-                    for T in self._derivedSpanningTrees(T_c, k - 1):
-                        yield T
-            for T in self._derivedSpanningTrees(T_p, k - 1):
+        if not self._resuming:
+            self.numTrees = 0
+            V = len(self.T_0.edges)
+            self._stack = [DerivationFrame(self.T_0, V - 1, None)]
+            yield self.T_0
+            self._consumed()
+        self._resuming = False
+        while self._stack:
+            T = self._nextTree()
+            if T is not None:
                 yield T
+                self._consumed()
+        if self.checkpointFile:
+            self.saveCheckpoint(self.checkpointFile)
+
+    def saveCheckpoint(self, filename):
+        state = {
+            'edges': [list(edge.nodes) for edge in self.graph.edges],
+            'initialTree': self._toIndices(self.T_0.edges),
+            'numTrees': self.numTrees,
+            'stack': [self._frameState(frame) for frame in self._stack or []],
+            'cuts': [[self._edgeIndices[edge], self._toIndices(cut)]
+                     for edge, cut in self._entrables.initialTreeCuts.items()]}
+        tmpFilename = filename + '.tmp'
+        with open(tmpFilename, 'w') as f:
+            json.dump(state, f, separators=(',', ':'))
+        os.replace(tmpFilename, filename)
+
+    def loadCheckpoint(self, filename):
+        with open(filename) as f:
+            state = json.load(f)
+        if state['edges'] != [list(edge.nodes) for edge in self.graph.edges]:
+            raise ValueError('Error checkpoint ' + filename + ' belongs to a different graph')
+        self.T_0.edges = self._fromIndices(state['initialTree'])
+        self._entrables.initialTreeCuts = {self.graph.edges[edgeIndex]: set(self._fromIndices(cut))
+                                           for edgeIndex, cut in state['cuts']}
+        self.numTrees = state['numTrees']
+        self._resuming = True
+        self._stack = []
+        for k, replacement, pending in state['stack']:
+            tree = self._stack[-1].tree if self._stack else self.T_0
+            if replacement is not None:
+                replacement = tuple(self._fromIndices(replacement))
+                tree = self._replaceEdge(tree, *replacement)
+            frame = DerivationFrame(tree, k, replacement)
+            frame.pending = self._fromIndices(pending) if pending is not None else None
+            self._stack.append(frame)
+
+    # private
+
+    def _nextTree(self):
+        """ Advance the derivation until the next spanning tree is found. """
+        while self._stack:
+            frame = self._stack[-1]
+            if frame.k < 0:
+                self._stack.pop()
+                continue
+            e_k = self.T_0.edges[frame.k]
+            if frame.pending is None:
+                frame.pending = list(self._entrablesForSpanningTreeEdge(frame.tree, e_k))
+            if frame.pending:
+                g = frame.pending.pop(0)
+                T_c = self._replaceEdge(frame.tree, e_k, g)
+                if T_c and Graph(T_c).isTree():
+                    self._stack.append(DerivationFrame(T_c, frame.k - 1, (e_k, g)))
+                    return T_c
+            else:
+                # all entrables are done, continue with the next edge of the same tree
+                self._stack[-1] = DerivationFrame(frame.tree, frame.k - 1, frame.replacement)
+        return None
+
+    def _consumed(self):
+        self.numTrees += 1
+        if self.checkpointFile and self.numTrees % self.checkpointInterval == 0:
+            self.saveCheckpoint(self.checkpointFile)
 
     def _replaceEdge(self, T_p, e_k, g):
         T_c = Graph(T_p).copy().impl
@@ -43,8 +143,32 @@ class SpanningTreeIter:
         T_c.edges[index] = g
         return T_c
 
+    def _frameState(self, frame):
+        replacement = self._toIndices(frame.replacement) if frame.replacement is not None else None
+        pending = self._toIndices(frame.pending) if frame.pending is not None else None
+        return [frame.k, replacement, pending]
 
-# private
+    def _toIndices(self, edges):
+        return [self._edgeIndices[edge] for edge in edges]
+
+    def _fromIndices(self, indices):
+        return [self.graph.edges[index] for index in indices]
+
+
+class DerivationFrame:
+    """ One level of the spanning tree derivation.
+
+    tree         the spanning tree derived from
+    k            the index of the initial tree edge to be replaced next
+    replacement  (replaced edge, new edge) that derived tree from the tree of
+                 the frame below, None for the initial tree
+    pending      the entrables for the k-th edge that have not been tried yet
+    """
+    def __init__(self, tree, k, replacement):
+        self.tree = tree
+        self.k = k
+        self.replacement = replacement
+        self.pending = None
 
 
 class FundamentalCuts:
@@ -71,22 +195,22 @@ class Entrables:
 
     def __init__(self, initialTree, graph: Graph):
         self._initialTree = initialTree
-        self._initialTreeCutCache = {}
+        self.initialTreeCuts = {}
         self._getFundamentalCut = FundamentalCuts(graph).getCutFromSpanningTreeEdge
 
     def getEntrablesForSpanningTreeEdge(self, tree, edge):
         initialTreeCut = self._getInitialTreeCut(edge)
         treeCut = self._getFundamentalCut(tree, edge)
-        for elem in initialTreeCut & treeCut:
+        # a fixed order keeps the enumeration reproducible across checkpoints
+        for elem in sorted(initialTreeCut & treeCut, key=lambda e: e.nodes):
             yield elem
 
     # private
 
     def _getInitialTreeCut(self, edge):
-        if not edge in self._initialTreeCutCache:
+        if not edge in self.initialTreeCuts:
             cut = self._getFundamentalCut(self._initialTree, edge)
-            self._initialTreeCutCache[edge] = cut
+            self.initialTreeCuts[edge] = cut
             return cut
         else:
-            return self._initialTreeCutCache[edge]
-
+            return self.initialTreeCuts[edge]
@@ -0,0 +1,92 @@
+from unittest import TestCase
+from unfolder.graph.graph import Graph
+from unfolder.graph.graph_impl import GraphImpl, EdgeImpl
+from unfolder.graph.spanning_tree_ranking import SpanningTreeRanking, integerDeterminant
+from unfolder.graph.spanning_trees import SpanningTreeIter
+from unfolder.graph.test.sample_graphs import createGraphWithTreeSpanningTrees, createSimpleGraph, \
+    createSingularGraph, createPrimitiveGraph, createEmptyGraph, \
+    createSimpleTree, createDiamondGraph, createGraphWithIsolatedNode
+
+
+class TestSpanningTreeRanking(TestCase):
+
+    def setUp(self):
+        self.testCases = [
+            (createEmptyGraph(), 1),
+            (createSingularGraph(), 1),
+            (createPrimitiveGraph(), 1),
+            (createSimpleTree(), 1),
+            (createGraphWithTreeSpanningTrees(), 3),
+            (createSimpleGraph(), 8),
+            (createDiamondGraph(), 16)]
+
+    def test_count(self):
+        for (graph, numSpanningTrees) in self.testCases:
+            self.assertEqual(SpanningTreeRanking(graph).count, numSpanningTrees)
+
+        self.assertEqual(SpanningTreeRanking(createGraphWithIsolatedNode()).count, 0)
+
+    def test_unrank(self):
+        for (graph, numSpanningTrees) in self.testCases:
+            ranking = SpanningTreeRanking(graph)
+            trees = [frozenset(ranking.unrank(rank).edges) for rank in range(numSpanningTrees)]
+
+            # every rank is a spanning tree
+            for tree in trees:
+                self.assertTrue(Graph(GraphImpl(graph.nodes, list(tree))).isTree())
+
+            # all spanning trees are enumerated
+            expectedTrees = set(frozenset(tree.edges) for tree in SpanningTreeIter(graph))
+            self.assertEqual(set(trees), expectedTrees)
+
+            self.assertRaises(IndexError, ranking.unrank, numSpanningTrees)
+            self.assertRaises(IndexError, ranking.unrank, -1)
+
+    def test_rank(self):
+        for (graph, numSpanningTrees) in self.testCases:
+            ranking = SpanningTreeRanking(graph)
+            for rank in range(numSpanningTrees):
+                self.assertEqual(ranking.rank(ranking.unrank(rank)), rank)
+
+    def test_rank_noSpanningTree(self):
+        graph = createSimpleGraph()
+        ranking = SpanningTreeRanking(graph)
+        cycle = GraphImpl(graph.nodes, [EdgeImpl(0, 1), EdgeImpl(1, 2), EdgeImpl(0, 2)])
+
+        self.assertRaises(ValueError, ranking.rank, cycle)
+        self.assertRaises(ValueError, ranking.rank, GraphImpl(graph.nodes, []))
+
+    def test_trees(self):
+        for (graph, numSpanningTrees) in self.testCases:
+            ranking = SpanningTreeRanking(graph)
+            expectedTrees = [ranking.unrank(rank).edges for rank in range(numSpanningTrees)]
+
+            self.assertEqual([tree.edges for tree in ranking.trees()], expectedTrees)
+            for begin in range(numSpanningTrees):
+                for end in range(begin, numSpanningTrees + 1):
+                    trees = [tree.edges for tree in ranking.trees(begin, end)]
+                    self.assertEqual(trees, expectedTrees[begin:end])
+
+    def test_parallelEdges(self):
+        graph = createSimpleGraph()
+        edges = graph.impl.edges + [EdgeImpl(*edge.nodes) for edge in graph.impl.edges]
+        ranking = SpanningTreeRanking(Graph(GraphImpl(graph.nodes, edges)))
+
+        self.assertEqual(ranking.count, 8)
+        for rank in range(8):
+            self.assertEqual(ranking.rank(ranking.unrank(rank)), rank)
+
+    def test_shards(self):
+        ranking = SpanningTreeRanking(createDiamondGraph())
+        shards = ranking.shards(3)
+
+        self.assertEqual(shards, [(0, 5), (5, 10), (10, 16)])
+        trees = [frozenset(tree.edges) for (begin, end) in shards for tree in ranking.trees(begin, end)]
+        self.assertEqual(len(set(trees)), 16)
+
+    def test_integerDeterminant(self):
+        self.assertEqual(integerDeterminant([]), 1)
+        self.assertEqual(integerDeterminant([[3]]), 3)
+        self.assertEqual(integerDeterminant([[0, 1], [1, 0]]), -1)
+        self.assertEqual(integerDeterminant([[2, -1, 0], [-1, 2, -1], [0, -1, 2]]), 4)
+        self.assertEqual(integerDeterminant([[1, 2], [2, 4]]), 0)
@@ -1,5 +1,7 @@
+import os
+import tempfile
 from unittest import TestCase
-from unfolder.graph.spanning_trees import SpanningTreeIter
+from unfolder.graph.spanning_trees import SpanningTreeIter, getSpanningTrees, resumeSpanningTrees
 from unfolder.graph.test.sample_graphs import createGraphWithTreeSpanningTrees, createSimpleGraph, \
     createSingularGraph, createPrimitiveGraph, createEmptyGraph, \
     createSimpleTree, createDiamondGraph
@@ -29,3 +31,65 @@ class TestSpanningTrees(TestCase):
             # check there are no spanning tree duplicates
             self.assertEqual(len(set(spanningTreeEdgeSets)), numSpanningTrees)
 
+    def test_iterateTwice(self):
+        spanningTrees = SpanningTreeIter(createDiamondGraph())
+        trees = [tree.edges for tree in spanningTrees]
+        self.assertEqual(len(trees), 16)
+        self.assertEqual([tree.edges for tree in spanningTrees], trees)
+        self.assertEqual(spanningTrees.numTrees, 16)
+
+
+class TestSpanningTreeCheckpoints(TestCase):
+
+    def setUp(self):
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.checkpointFile = os.path.join(self.tmpDir.name, 'spanning_trees.json')
+
+    def tearDown(self):
+        self.tmpDir.cleanup()
+
+    def test_resume(self):
+        for graph in [createSimpleGraph(), createDiamondGraph()]:
+            allTrees = [tree.edges for tree in getSpanningTrees(graph)]
+
+            for numTaken in range(1, len(allTrees) + 1):
+                if os.path.exists(self.checkpointFile):
+                    os.remove(self.checkpointFile)
+                spanningTrees = getSpanningTrees(graph, self.checkpointFile, checkpointInterval=1)
+                takenTrees = []
+                for tree in spanningTrees:
+                    takenTrees.append(tree.edges)
+                    if len(takenTrees) == numTaken:
+                        break
+
+                # the last tree taken has not been consumed yet
+                resumed = resumeSpanningTrees(graph, self.checkpointFile)
+                self.assertEqual(resumed.numTrees, numTaken - 1)
+                remainingTrees = [tree.edges for tree in resumed]
+                self.assertEqual(takenTrees[:-1] + remainingTrees, allTrees)
+
+    def test_checkpointInterval(self):
+        graph = createDiamondGraph()
+        spanningTrees = getSpanningTrees(graph, self.checkpointFile, checkpointInterval=5)
+        for index, tree in enumerate(spanningTrees):
+            if index == 8:
+                break
+
+        resumed = resumeSpanningTrees(graph, self.checkpointFile)
+        self.assertEqual(resumed.numTrees, 5)
+        self.assertEqual(len(list(resumed)), 11)
+
+    def test_resume_exhausted(self):
+        graph = createSimpleGraph()
+        self.assertEqual(len(list(getSpanningTrees(graph, self.checkpointFile))), 8)
+
+        resumed = resumeSpanningTrees(graph, self.checkpointFile)
+        self.assertEqual(resumed.numTrees, 8)
+        self.assertEqual(list(resumed), [])
+        # only the first iteration continues from the checkpoint
+        self.assertEqual(len(list(resumed)), 8)
+
+    def test_resume_differentGraph(self):
+        list(getSpanningTrees(createSimpleGraph(), self.checkpointFile))
+
+        self.assertRaises(ValueError, resumeSpanningTrees, createDiamondGraph(), self.checkpointFile)
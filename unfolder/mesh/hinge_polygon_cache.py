@@ -0,0 +1,52 @@
+from collections import OrderedDict
+
+from unfolder.mesh.mesh_arrays import MeshArrays
+
+
+class HingePolygonCache:
+    """ The faces of a mesh in their hinge frames, shared by all trees unfolded from it.
+
+    The shape of a face in one of its hinge frames (see MeshArrays) does not
+    depend on the tree it is unfolded in, only where the hinge ends up does.
+    Placing a face thus is a single rigid 2D transform of its hinge polygon:
+    the loop vertices with the hinge begin at the origin and the hinge end on
+    the positive x axis.
+
+    Hinges are given by their (begin, end) vertices, both orientations of an
+    edge are different hinges. Polygons are computed on first use, the least
+    recently used ones are dropped when more than maxSize are stored. The
+    polygons are read only arrays.
+    """
+
+    def __init__(self, meshArrays: MeshArrays, maxSize=65536):
+        self.meshArrays = meshArrays
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        self._polygons = OrderedDict()
+
+    def __len__(self):
+        return len(self._polygons)
+
+    def get(self, face, begin, end):
+        """ The loop vertices of face in its hinge frame for the edge begin -> end (N x 2). """
+        key = (int(face), int(begin), int(end))
+        polygon = self._polygons.get(key)
+        if polygon is not None:
+            self.hits += 1
+            self._polygons.move_to_end(key)
+            return polygon
+        self.misses += 1
+        polygon = self.meshArrays.facePolygon(face, self.meshArrays.hingeFrame(face, begin, end))
+        polygon.setflags(write=False)
+        self._polygons[key] = polygon
+        if len(self._polygons) > self.maxSize:
+            self._polygons.popitem(last=False)
+        return polygon
+
+    def getRoot(self, face):
+        """ The polygon of face in the frame of its first face edge, the frame of a root face. """
+        return self.get(face, *self.meshArrays.rootHinge(face))
+
+    def clear(self):
+        self._polygons.clear()
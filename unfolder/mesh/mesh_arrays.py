@@ -0,0 +1,139 @@
+import numpy as np
+
+from unfolder.mesh.mesh_impl import MeshImpl
+
+
+class MeshArrays:
+    """ Flat array representation of a mesh for the numeric unfolding code.
+
+    vertices        V x 3 vertex positions
+    faceOffsets     the face edges of face f are faceOffsets[f] .. faceOffsets[f + 1] - 1
+    faceEdges       the mesh edge of every face edge, in face order
+    faceEdgeBegins  the begin vertex of every face edge (see FaceEdge.begin)
+    faceEdgeEnds    the end vertex of every face edge (see FaceEdge.end)
+    normals         F x 3 face normals (see Face.normal)
+
+    Face edge i of a face runs from loop vertex i + 1 to loop vertex i, where
+    the loop vertices are the ones of Face.vertexIndices. Thus the loop of a
+    face are the end vertices of its face edges.
+
+    A hinge frame of a face is a 2D coordinate system in the face plane: the
+    origin is the begin vertex of a face edge, the x axis points along the
+    edge and the y axis is n x e_x. Mapping a face from one hinge frame into
+    another or into the model plane is a proper 2D rotation plus translation.
+    """
+
+    def __init__(self, meshImpl: MeshImpl):
+        self.vertices = np.array(meshImpl.vertices, dtype=float).reshape(-1, 3)
+        faceSizes = [len(face.edges) for face in meshImpl.faces]
+        self.faceOffsets = np.zeros(len(faceSizes) + 1, dtype=np.int64)
+        np.cumsum(faceSizes, out=self.faceOffsets[1:])
+        self.faceEdges = np.array([edge for face in meshImpl.faces for edge in face.edges], dtype=np.int64)
+        edgeVertices = np.array([edge.vertices for edge in meshImpl.edges], dtype=np.int64).reshape(-1, 2)
+        (self.faceEdgeBegins, self.faceEdgeEnds) = self._orientFaceEdges(edgeVertices)
+        self.faceOfFaceEdge = np.repeat(np.arange(len(faceSizes)), faceSizes)
+        self.normals = self._computeNormals()
+        self._facesByEdge = self._groupFacesByEdge()
+
+    @property
+    def numFaces(self):
+        return len(self.faceOffsets) - 1
+
+    def faceEdgeRange(self, face):
+        return range(self.faceOffsets[face], self.faceOffsets[face + 1])
+
+    def loop(self, face):
+        """ The vertex indices of a face, as Face.vertexIndices. """
+        return self.faceEdgeEnds[self.faceOffsets[face]:self.faceOffsets[face + 1]]
+
+    def connectingFaceEdges(self, face, otherFace):
+        """ The face edges of face that are shared with otherFace, in face order. """
+        return [faceEdge for faceEdge in self.faceEdgeRange(face)
+                if otherFace in self._facesByEdge[int(self.faceEdges[faceEdge])]]
+
+    def connectedFaces(self, face):
+        """ The faces sharing at least one edge with face, in face edge order. """
+        retval = []
+        for faceEdge in self.faceEdgeRange(face):
+            for otherFace in self._facesByEdge[int(self.faceEdges[faceEdge])]:
+                if otherFace != face and otherFace not in retval:
+                    retval.append(otherFace)
+        return retval
+
+    def meanFaceExtent(self):
+        """ The mean length of the longest edge of the faces, a guess at the size of an unfolded face. """
+        if not self.numFaces:
+            return 0.
+        lengths = np.linalg.norm(self.vertices[self.faceEdgeEnds] - self.vertices[self.faceEdgeBegins], axis=1)
+        return float(np.maximum.reduceat(lengths, self.faceOffsets[:-1]).mean())
+
+    def hinge(self, face, childFace):
+        """ The (begin, end) vertices of the edge childFace is attached to face by.
+
+        As in treeToModel this is the first face edge of face that is shared with
+        childFace, oriented as in face. Returns None if the faces are not connected.
+        """
+        connectingFaceEdges = self.connectingFaceEdges(face, childFace)
+        if not connectingFaceEdges:
+            return None
+        faceEdge = connectingFaceEdges[0]
+        return self.faceEdgeBegins[faceEdge], self.faceEdgeEnds[faceEdge]
+
+    def rootHinge(self, face):
+        """ The (begin, end) vertices of the first face edge, the base edge of a root face. """
+        faceEdge = self.faceOffsets[face]
+        return self.faceEdgeBegins[faceEdge], self.faceEdgeEnds[faceEdge]
+
+    def hingeFrame(self, face, begin, end):
+        """ The (origin, x axis, y axis) of the hinge frame of face for the edge begin -> end. """
+        origin = self.vertices[begin]
+        xAxis = self.vertices[end] - origin
+        xAxis = xAxis / np.linalg.norm(xAxis)
+        yAxis = np.cross(self.normals[face], xAxis)
+        return origin, xAxis, yAxis / np.linalg.norm(yAxis)
+
+    def hingeFrames(self, faces, begins, ends):
+        """ Vectorized hingeFrame, returns N x 3 arrays of origins, x axes and y axes. """
+        origins = self.vertices[begins]
+        xAxes = self.vertices[ends] - origins
+        xAxes /= np.linalg.norm(xAxes, axis=1)[:, np.newaxis]
+        yAxes = np.cross(self.normals[faces], xAxes)
+        yAxes /= np.linalg.norm(yAxes, axis=1)[:, np.newaxis]
+        return origins, xAxes, yAxes
+
+    def toFrame(self, frame, points):
+        """ Project 3D points (N x 3) into a hinge frame. """
+        (origin, xAxis, yAxis) = frame
+        relative = np.asarray(points, dtype=float) - origin
+        return np.stack((relative @ xAxis, relative @ yAxis), axis=-1)
+
+    def facePolygon(self, face, frame):
+        """ The loop vertices of face in one of its hinge frames (N x 2). """
+        return self.toFrame(frame, self.vertices[self.loop(face)])
+
+    # private
+
+    def _orientFaceEdges(self, edgeVertices):
+        """ Orient every face edge as FaceEdge.begin and FaceEdge.end do. """
+        vertices = edgeVertices[self.faceEdges]
+        prevIndices = np.arange(len(self.faceEdges)) - 1
+        faceBegins = np.repeat(self.faceOffsets[:-1], np.diff(self.faceOffsets))
+        faceEnds = np.repeat(self.faceOffsets[1:], np.diff(self.faceOffsets))
+        prevIndices = np.where(prevIndices < faceBegins, faceEnds - 1, prevIndices)
+        prevVertices = vertices[prevIndices]
+        flipped = (vertices[:, 0] == prevVertices[:, 0]) | (vertices[:, 0] == prevVertices[:, 1])
+        begins = np.where(flipped, vertices[:, 1], vertices[:, 0])
+        ends = np.where(flipped, vertices[:, 0], vertices[:, 1])
+        return begins, ends
+
+    def _computeNormals(self):
+        fst = self.faceOffsets[:-1]
+        directions = self.vertices[self.faceEdgeEnds] - self.vertices[self.faceEdgeBegins]
+        normals = np.cross(directions[fst], directions[fst + 1])
+        return normals / np.linalg.norm(normals, axis=1)[:, np.newaxis]
+
+    def _groupFacesByEdge(self):
+        retval = {}
+        for face, edge in zip(self.faceOfFaceEdge.tolist(), self.faceEdges.tolist()):
+            retval.setdefault(edge, []).append(face)
+        return retval
@@ -1,3 +1,5 @@
+import numpy as np
+
 from unfolder.mesh.mesh import Mesh
 
 
@@ -14,6 +16,19 @@ class ObjExporter:
             for face in mesh.faces:
                 self.writeFace(face)
 
+    def writeArrays(self, vertices, faceOffsets, faceVertices):
+        """ Write a mesh given as N x 3 vertices and face vertex loops in CSR form.
+
+        The output is the same as the one of write for a mesh with the same
+        faces, the lines are formatted from lists in one go.
+        """
+        faceVertices = (np.asarray(faceVertices) + 1).tolist()
+        offsets = np.asarray(faceOffsets).tolist()
+        with open(self.filename, 'w') as self.f:
+            self.f.writelines('v %s %s %s\n' % (x, y, z) for x, y, z in np.asarray(vertices, dtype=float).tolist())
+            self.f.writelines('f ' + ' '.join(map(str, faceVertices[begin:end])) + '\n'
+                              for begin, end in zip(offsets[:-1], offsets[1:]))
+
     def writeVertex(self, vertex):
         (x, y, z) = vertex
         self.f.write('v ')
@@ -25,4 +40,4 @@ class ObjExporter:
         self.f.write('f')
         for vertex in face.vertexIndices:
             self.f.write(' ' + str(vertex + 1))
-        self.f.write('\n')
\ No newline at end of file
+        self.f.write('\n')
@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+import numpy as np
+
+from unfolder.mesh.hinge_polygon_cache import HingePolygonCache
+from unfolder.mesh.mesh_arrays import MeshArrays
+from unfolder.mesh.obj_importer import ObjImporter
+
+
+class HingePolygonCacheTests(TestCase):
+    def setUp(self):
+        self.arrays = MeshArrays(ObjImporter().read('resources/torus.obj'))
+
+    def test_get(self):
+        cache = HingePolygonCache(self.arrays)
+        for face in range(self.arrays.numFaces):
+            for faceEdge in self.arrays.faceEdgeRange(face):
+                (begin, end) = (self.arrays.faceEdgeBegins[faceEdge], self.arrays.faceEdgeEnds[faceEdge])
+                polygon = cache.get(face, begin, end)
+                expected = self.arrays.facePolygon(face, self.arrays.hingeFrame(face, begin, end))
+                np.testing.assert_allclose(polygon, expected)
+                # the hinge starts at the origin and runs along the x axis
+                index = faceEdge - self.arrays.faceOffsets[face]
+                np.testing.assert_allclose(polygon[(index + 1) % len(polygon)], (0., 0.), atol=1e-12)
+                self.assertAlmostEqual(polygon[index][1], 0.)
+                self.assertGreater(polygon[index][0], 0.)
+        self.assertEqual(cache.misses, len(self.arrays.faceEdges))
+        self.assertIs(cache.getRoot(0), cache.get(0, *self.arrays.rootHinge(0)))
+        self.assertEqual(cache.hits, 2)
+        with self.assertRaises(ValueError):
+            cache.getRoot(0)[0, 0] = 1.
+
+    def test_maxSize(self):
+        cache = HingePolygonCache(self.arrays, maxSize=3)
+        for face in range(4):
+            cache.getRoot(face)
+        self.assertEqual(len(cache), 3)
+        # face 0 was dropped, the most recently used faces stay
+        cache.getRoot(1)
+        cache.getRoot(0)
+        self.assertEqual(cache.misses, 5)
+        cache.getRoot(1)
+        self.assertEqual(cache.misses, 5)
+        cache.getRoot(2)
+        self.assertEqual(cache.misses, 6)
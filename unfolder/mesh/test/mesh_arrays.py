@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+import numpy as np
+
+from unfolder.mesh.face import FaceIter
+from unfolder.mesh.mesh_arrays import MeshArrays
+from unfolder.mesh.obj_importer import ObjImporter
+
+
+class MeshArraysTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.meshes = [ObjImporter().read('resources/' + name) for name in ('box.obj', 'pyramid.obj', 'torus.obj')]
+
+    def test_faceEdges(self):
+        for mesh in self.meshes:
+            arrays = MeshArrays(mesh)
+            for face in FaceIter(mesh):
+                self.assertEqual(list(arrays.loop(face.index)), face.vertexIndices)
+                for faceEdge, faceEdgeIndex in zip(face.edges, arrays.faceEdgeRange(face.index)):
+                    np.testing.assert_allclose(arrays.vertices[arrays.faceEdgeBegins[faceEdgeIndex]], faceEdge.begin)
+                    np.testing.assert_allclose(arrays.vertices[arrays.faceEdgeEnds[faceEdgeIndex]], faceEdge.end)
+
+    def test_normals(self):
+        for mesh in self.meshes:
+            arrays = MeshArrays(mesh)
+            for face in FaceIter(mesh):
+                np.testing.assert_allclose(arrays.normals[face.index], tuple(face.normal), atol=1e-12)
+
+    def test_connectedFaces(self):
+        arrays = MeshArrays(self.meshes[1])
+        for face in FaceIter(self.meshes[1]):
+            self.assertEqual(sorted(arrays.connectedFaces(face.index)),
+                             sorted(other.index for other in face.getConnectedFaces()))
+        self.assertIsNone(arrays.hinge(1, 3))
+
+    def test_meanFaceExtent(self):
+        # the box is 150 x 122.5 x 131.3, four of its faces are 150 long
+        self.assertAlmostEqual(MeshArrays(self.meshes[0]).meanFaceExtent(), (4 * 150. + 2 * 131.3) / 6, places=4)
+
+    def test_hingeFrame(self):
+        arrays = MeshArrays(self.meshes[1])
+        for face in range(arrays.numFaces):
+            frame = arrays.hingeFrame(face, *arrays.rootHinge(face))
+            polygon = arrays.facePolygon(face, frame)
+
+            # the base edge lies on the positive x axis, the face is counter clockwise
+            np.testing.assert_allclose(polygon[1], (0., 0.), atol=1e-9)
+            self.assertAlmostEqual(polygon[0][1], 0.)
+            self.assertGreater(polygon[0][0], 0.)
+            area = np.sum(polygon[:, 0] * np.roll(polygon[:, 1], -1) - np.roll(polygon[:, 0], -1) * polygon[:, 1])
+            self.assertGreater(area, 0.)
+
+        faces = np.arange(arrays.numFaces)
+        begins = arrays.faceEdgeBegins[arrays.faceOffsets[:-1]]
+        ends = arrays.faceEdgeEnds[arrays.faceOffsets[:-1]]
+        for face, (origin, xAxis, yAxis) in enumerate(zip(*arrays.hingeFrames(faces, begins, ends))):
+            expected = arrays.hingeFrame(face, begins[face], ends[face])
+            for value, expectedValue in zip((origin, xAxis, yAxis), expected):
+                np.testing.assert_allclose(value, expectedValue)
@@ -0,0 +1,256 @@
+import numpy as np
+
+from unfolder.analyze_patch.polygon_overlap import convexPolygonsOverlap
+from unfolder.model.model import Model
+from unfolder.model.model_impl import ModelImpl
+from unfolder.util.uniform_grid import boxPairs
+
+
+def addFlaps(model: Model, **kwargs):
+    """ Generate the glue flaps of a model and store them in its flaps, see FlapGenerator. """
+    model.impl.flaps = FlapGenerator(model.impl, **kwargs).generate()
+    return model.impl.flaps
+
+
+class Flaps:
+    """ The glue flaps of a model.
+
+    connections  the connection of every flap, the side of the cut it is attached to
+    edges        the model edge of every flap
+    patches      the index of the patch every flap is attached to
+    polygons     F x 4 x 2 flap corners, the edge begin and end followed by the two top corners
+    """
+    def __init__(self, connections, edges, patches, polygons):
+        self.connections = connections
+        self.edges = edges
+        self.patches = patches
+        self.polygons = polygons
+
+    def __len__(self):
+        return len(self.edges)
+
+
+class FlapGenerator:
+    """ Trapezoid glue flaps on one side of every cut of a model.
+
+    A cut is a pair of connections between two faces that are not connected
+    in the unfolding tree, both patches got a copy of the shared edges (see
+    ModelImpl.connectionFaces). A flap is put outside of its patch on every
+    edge of one side of the cut. It is heightRatio times as high as its edge
+    is long (at most maxHeight) and its sides lean inwards by 45 degrees, or
+    steeper on short edges.
+
+    The flaps of a cut may neither overlap a patch nor an accepted flap.
+    Otherwise the flaps are flipped to the other side of the cut, then both
+    sides are tried at half the height, and so on shrinkSteps times. Cuts
+    without any free choice get no flaps. The choices are made in rounds:
+    every cut proposes its next choice that does not hit a patch, the
+    proposals are tested against the accepted flaps and each other in
+    batches and a proposal only wins against the proposals of later cuts.
+    Overlaps are found with a uniform grid on the bounding boxes and
+    separating axis tests. To ignore the edge a flap shares with its patch,
+    the flaps are shrunk by tolerance towards their centers for testing.
+    """
+    def __init__(self, modelImpl: ModelImpl, heightRatio=.25, maxHeight=None, shrinkSteps=2, tolerance=1e-6):
+        self.modelImpl = modelImpl
+        self.heightRatio = heightRatio
+        self.maxHeight = maxHeight
+        self.shrinkSteps = shrinkSteps
+        self.tolerance = tolerance
+        self._initPatches()
+
+    def generate(self):
+        (unitSides, sideConnections) = self._getCuts()
+        self._initCandidates(unitSides, sideConnections)
+        chosen = self._choose()
+        flaps = np.concatenate([np.arange(self._candidateOffsets[candidate], self._candidateOffsets[candidate + 1])
+                                for candidate in chosen.tolist()] + [np.empty(0, dtype=np.int64)])
+        return Flaps(self._flapConnections[flaps], self._flapEdges[flaps], self._flapPatches[flaps],
+                     self._flapPolygons[flaps])
+
+    # private
+
+    def _initPatches(self):
+        """ The patch polygons, their bounding boxes and the boundary segments. """
+        impl = self.modelImpl
+        loopOffsets = impl.loopOffsets
+        loopSizes = np.diff(loopOffsets)
+        self._loopPatches = np.repeat(np.arange(len(loopSizes)), loopSizes)
+        # vertex i of a loop is shared by edge i and i + 1, so edge i starts at vertex i - 1
+        previous = np.arange(loopOffsets[-1]) - 1
+        previous[loopOffsets[:-1][loopSizes > 0]] = loopOffsets[1:][loopSizes > 0] - 1
+        coords = impl.vertexArray[:, :2]
+        self._segmentBegins = coords[impl.loopVertices[previous]]
+        self._segmentEnds = coords[impl.loopVertices]
+        crosses = self._segmentBegins[:, 0] * self._segmentEnds[:, 1] - self._segmentEnds[:, 0] * self._segmentBegins[:, 1]
+        self._patchOrientations = np.where(np.bincount(self._loopPatches, crosses, len(loopSizes)) < 0, -1., 1.)
+        self._patchBoxes = np.full((len(loopSizes), 2, 2), np.nan)
+        hasVertices = loopSizes > 0
+        begins = loopOffsets[:-1][hasVertices]
+        self._patchBoxes[hasVertices, 0] = np.minimum.reduceat(self._segmentEnds, begins)
+        self._patchBoxes[hasVertices, 1] = np.maximum.reduceat(self._segmentEnds, begins)
+        self._patchesWithLoops = np.flatnonzero(hasVertices)
+
+    def _getCuts(self):
+        """ The connections of both sides of every cut, unit u has the sides sideConnections[unitSides[u]:unitSides[u + 1]]. """
+        impl = self.modelImpl
+        parentConnections = [patch.parentConnection for patch in impl.patches if patch.parentConnection is not None]
+        isCut = impl.connectionFaces[:, 0] >= 0
+        isCut[parentConnections] = False
+        cuts = np.flatnonzero(isCut)
+        faces = impl.connectionFaces[cuts]
+        keys = np.sort(faces, axis=1)
+        order = np.lexsort((cuts, keys[:, 1], keys[:, 0]))
+        (cuts, keys) = (cuts[order], keys[order])
+        isFirst = np.ones(len(cuts), dtype=bool)
+        isFirst[1:] = np.any(keys[1:] != keys[:-1], axis=1)
+        unitSides = np.append(np.flatnonzero(isFirst), len(cuts))
+        return unitSides, cuts
+
+    def _initCandidates(self, unitSides, sideConnections):
+        """ The flaps of all choices of all cuts, in the order they are tried. """
+        impl = self.modelImpl
+        patchIndices = {patch.name: index for index, patch in enumerate(impl.patches)}
+        sidePatches = np.array([patchIndices[face] for face in impl.connectionFaces[sideConnections, 0].tolist()],
+                               dtype=np.int64)
+        numSides = np.diff(unitSides)
+        # candidates ordered by unit, shrink step and side
+        numCandidates = numSides * (self.shrinkSteps + 1)
+        candidateUnits = np.repeat(np.arange(len(numSides)), numCandidates)
+        local = np.arange(numCandidates.sum()) - np.repeat(np.cumsum(numCandidates) - numCandidates, numCandidates)
+        candidateSteps = local // numSides[candidateUnits]
+        candidateSides = unitSides[candidateUnits] + local % numSides[candidateUnits]
+        self._unitCandidates = np.zeros(len(numSides) + 1, dtype=np.int64)
+        np.cumsum(numCandidates, out=self._unitCandidates[1:])
+
+        connectionOffsets = impl.connectionOffsets
+        connections = sideConnections[candidateSides]
+        flapsPerCandidate = connectionOffsets[connections + 1] - connectionOffsets[connections]
+        self._candidateOffsets = np.zeros(len(connections) + 1, dtype=np.int64)
+        np.cumsum(flapsPerCandidate, out=self._candidateOffsets[1:])
+        flapCandidates = np.repeat(np.arange(len(connections)), flapsPerCandidate)
+        flapRows = np.arange(self._candidateOffsets[-1]) - self._candidateOffsets[:-1][flapCandidates] \
+            + connectionOffsets[connections][flapCandidates]
+        self._flapCandidates = flapCandidates
+        self._flapConnections = connections[flapCandidates]
+        self._flapEdges = impl.connectionEdges[flapRows]
+        self._flapPatches = sidePatches[candidateSides][flapCandidates]
+        (self._flapPolygons, isValid) = self._computeFlaps(0.5 ** candidateSteps[flapCandidates])
+        self._candidateValid = np.ones(len(connections), dtype=bool)
+        self._candidateValid[flapCandidates[~isValid]] = False
+        self._candidateUnits = candidateUnits
+        self._testPolygons = _shrink(self._flapPolygons, self.tolerance)
+        self._testBoxes = np.stack((self._testPolygons.min(axis=1), self._testPolygons.max(axis=1)), axis=1)
+
+    def _computeFlaps(self, scales):
+        """ The flap polygons and whether their edge is a proper boundary edge of the patch. """
+        numEdges = len(self.modelImpl.edgeVertices)
+        keys = self._flapPatches * numEdges + self._flapEdges
+        if not len(self._loopPatches):
+            return np.zeros((len(keys), 4, 2)), np.zeros(len(keys), dtype=bool)
+        loopKeys = self._loopPatches * numEdges + self.modelImpl.loopEdges
+        order = np.argsort(loopKeys, kind='stable')
+        positions = order[np.minimum(np.searchsorted(loopKeys[order], keys), len(order) - 1)]
+        isValid = loopKeys[positions] == keys
+        (begins, ends) = (self._segmentBegins[positions], self._segmentEnds[positions])
+        directions = ends - begins
+        lengths = np.linalg.norm(directions, axis=1)
+        isValid &= lengths > 0
+        directions /= np.where(lengths > 0, lengths, 1.)[:, np.newaxis]
+        # the patches lie left of their counter clockwise loops
+        normals = np.stack((directions[:, 1], -directions[:, 0]), axis=-1)
+        normals *= self._patchOrientations[self._flapPatches][:, np.newaxis]
+        heights = self.heightRatio * lengths
+        if self.maxHeight is not None:
+            heights = np.minimum(heights, self.maxHeight)
+        heights *= scales
+        insets = np.minimum(heights, .45 * lengths)
+        tops = heights[:, np.newaxis] * normals
+        polygons = np.stack((begins, ends, ends - insets[:, np.newaxis] * directions + tops,
+                             begins + insets[:, np.newaxis] * directions + tops), axis=1)
+        return polygons, isValid
+
+    def _choose(self):
+        """ The chosen candidate of every unit that gets flaps. """
+        current = self._unitCandidates[:-1].copy()
+        pending = np.flatnonzero(current < self._unitCandidates[1:])
+        hitsPatch = np.zeros(len(self._candidateOffsets) - 1, dtype=np.int8) - 1
+        hitsPatch[~self._candidateValid] = 1
+        accepted = []
+        acceptedFlaps = np.empty(0, dtype=np.int64)
+        while len(pending):
+            # skip the choices that hit a patch
+            while True:
+                unknown = pending[hitsPatch[current[pending]] < 0]
+                if len(unknown):
+                    hitsPatch[current[unknown]] = self._hitPatches(current[unknown])
+                blocked = pending[hitsPatch[current[pending]] > 0]
+                if not len(blocked):
+                    break
+                current[blocked] += 1
+                pending = pending[current[pending] < self._unitCandidates[1:][pending]]
+            if not len(pending):
+                break
+
+            candidates = current[pending]
+            flaps = self._getFlaps(candidates)
+            # choices hitting accepted flaps are dropped
+            pairs = boxPairs(self._testBoxes[flaps], self._testBoxes[acceptedFlaps])
+            pairs = pairs[convexPolygonsOverlap(self._testPolygons[flaps[pairs[:, 0]]],
+                                                self._testPolygons[acceptedFlaps[pairs[:, 1]]])]
+            blocked = np.isin(candidates, self._flapCandidates[flaps[pairs[:, 0]]])
+            # a choice hitting the choice of an earlier unit waits for the next round
+            pairs = boxPairs(self._testBoxes[flaps])
+            (fst, snd) = (flaps[pairs[:, 0]], flaps[pairs[:, 1]])
+            isOther = self._candidateUnits[self._flapCandidates[fst]] != self._candidateUnits[self._flapCandidates[snd]]
+            (fst, snd) = (fst[isOther], snd[isOther])
+            hits = convexPolygonsOverlap(self._testPolygons[fst], self._testPolygons[snd])
+            (fst, snd) = (self._flapCandidates[fst[hits]], self._flapCandidates[snd[hits]])
+            waiting = np.isin(candidates, np.where(self._candidateUnits[fst] < self._candidateUnits[snd], snd, fst))
+            waiting &= ~blocked
+
+            winners = candidates[~blocked & ~waiting]
+            accepted.append(winners)
+            acceptedFlaps = np.concatenate((acceptedFlaps, self._getFlaps(winners)))
+            current[pending[blocked]] += 1
+            pending = pending[waiting | blocked]
+            pending = pending[current[pending] < self._unitCandidates[1:][pending]]
+        return np.sort(np.concatenate(accepted + [np.empty(0, dtype=np.int64)]))
+
+    def _getFlaps(self, candidates):
+        counts = self._candidateOffsets[candidates + 1] - self._candidateOffsets[candidates]
+        return np.repeat(self._candidateOffsets[candidates] - np.cumsum(counts) + counts, counts) \
+            + np.arange(counts.sum())
+
+    def _hitPatches(self, candidates):
+        """ Whether the flaps of the candidates overlap any patch, one flag per candidate. """
+        flaps = self._getFlaps(candidates)
+        patchBoxes = self._patchBoxes[self._patchesWithLoops]
+        pairs = boxPairs(self._testBoxes[flaps], patchBoxes)
+        (pairFlaps, pairPatches) = (flaps[pairs[:, 0]], self._patchesWithLoops[pairs[:, 1]])
+        loopOffsets = self.modelImpl.loopOffsets
+        sizes = loopOffsets[pairPatches + 1] - loopOffsets[pairPatches]
+        rows = np.repeat(np.arange(len(pairs)), sizes)
+        segments = np.repeat(loopOffsets[pairPatches] - np.cumsum(sizes) + sizes, sizes) + np.arange(sizes.sum())
+        polygons = self._testPolygons[pairFlaps[rows]]
+        (begins, ends) = (self._segmentBegins[segments], self._segmentEnds[segments])
+        overlaps = convexPolygonsOverlap(polygons, np.stack((begins, ends), axis=1))
+        # a flap inside of a patch crosses none of its edges, its center is inside though
+        centers = polygons.mean(axis=1)
+        isBetween = (begins[:, 1] > centers[:, 1]) != (ends[:, 1] > centers[:, 1])
+        heights = np.where(isBetween, ends[:, 1] - begins[:, 1], 1.)
+        crossings = isBetween & (centers[:, 0] < begins[:, 0] + (centers[:, 1] - begins[:, 1])
+                                 * (ends[:, 0] - begins[:, 0]) / heights)
+        isInside = np.bincount(rows, crossings, len(pairs)) % 2 == 1
+        hits = np.bincount(rows, overlaps, len(pairs)) > 0
+        hitFlaps = pairFlaps[hits | isInside]
+        return np.isin(candidates, self._flapCandidates[hitFlaps]).astype(np.int8)
+
+
+# private
+
+
+def _shrink(polygons, tolerance):
+    centers = polygons.mean(axis=1, keepdims=True)
+    return centers + (polygons - centers) * (1. - tolerance)
+
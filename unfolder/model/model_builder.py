@@ -1,30 +1,51 @@
+import numpy as np
+
 from unfolder.model.model_impl import ModelImpl, EdgeImpl, PatchImpl
-from unfolder.util.appenders import VertexAppender, MappingAppender, Appender, \
-    BucketFiller, NewAppender
+from unfolder.util.appenders import VertexAppender, BucketFiller
+from unfolder.util.pools import EdgePool, GrowableArray, ListPool
 
 
 class ModelBuilder:
+    """ Collect the patches, connections, edges and vertices of a model.
+
+    Edges are interned in an edge pool and connections are stored in a list
+    pool (see unfolder.util.pools), the model is built from their arrays.
+    Connections between two faces record the faces, so the two sides of a
+    cut can be told apart from the free edges of a patch, and every edge
+    records the mesh edge it was first added for.
+    """
     def __init__(self, normal):
         self.normal = normal
         self.patches = BucketFiller()
-        self.connections = Appender()
-        self.edges = NewAppender()
+        self.connections = ListPool()
+        self.connectionFaces = GrowableArray(np.int64, (2,))
+        self.edges = EdgePool()
+        self.edgeSources = GrowableArray(np.int64)
         self.vertices = VertexAppender()
         self._nameMapping = {}
 
     def build(self):
-        return ModelImpl(self.patches.store, None, self.connections.store, self.edges.store, self.vertices.store)
+        dimension = len(self.vertices.store[0]) if self.vertices.store else 3
+        vertexArray = np.array(self.vertices.store, dtype=float).reshape(-1, dimension)
+        return ModelImpl.fromArrays(self.patches.store, None, self.connections.offsets.copy(),
+                                    self.connections.items.copy(), self.edges.vertices.copy(), vertexArray,
+                                    self.connectionFaces.array.copy(), self.edgeSources.array.copy())
 
     def addVertex(self, vertex):
         return self.vertices.push(vertex)
 
-    def addEdge(self, fstVertexIndex, sndVertexIndex):
-        edge = EdgeImpl(fstVertexIndex, sndVertexIndex)
-        return self.edges.push(edge)
+    def addEdge(self, fstVertexIndex, sndVertexIndex, meshEdge=-1):
+        edgeIndex = self.edges.push(fstVertexIndex, sndVertexIndex)
+        if edgeIndex == len(self.edgeSources):
+            self.edgeSources.append(meshEdge)
+        return edgeIndex
+
+    def getEdge(self, edgeIndex):
+        return EdgeImpl(*self.edges.getVertices(edgeIndex))
 
-    def addConnection(self, edgeIndices):
+    def addConnection(self, edgeIndices, face=-1, otherFace=-1):
+        self.connectionFaces.append((face, otherFace))
         return self.connections.push(edgeIndices)
 
     def addPatch(self, patch: PatchImpl):
         return self.patches.put(patch.name, patch)
-
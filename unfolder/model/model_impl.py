@@ -1,10 +1,97 @@
+from itertools import chain
+
+import numpy as np
+
+
 class ModelImpl:
+    """ An unfolded model stored in flat arrays.
+
+    vertexArray        N x D vertex positions
+    edgeVertices       E x 2 vertex indices of the edges, the smaller one first
+    edgeSources        the mesh edge every edge was unfolded from, -1 if unknown
+    connectionOffsets  the edges of connection c are connectionEdges[connectionOffsets[c]:connectionOffsets[c + 1]]
+    connectionEdges    the edges of all connections
+    connectionFaces    C x 2 faces (patch names) of the connections, the face whose patch the edges belong to
+                       and the face on the other side, -1 for the free edges of a patch
+    loopOffsets        the boundary of patch p is loopEdges[loopOffsets[p]:loopOffsets[p + 1]]
+    loopEdges          the boundary edges of all patches in loop order (see Patch.edges)
+    loopVertices       the boundary vertices of all patches in loop order (see Patch.vertices)
+
+    The boundary loops are walked once when the model is created. Patches
+    whose boundary can not be walked get an empty range and are marked in
+    hasLoop.
+    """
     def __init__(self, patches, flaps, connections, edges, vertices):
+        dimension = len(vertices[0]) if len(vertices) else 3
+        connectionOffsets = np.zeros(len(connections) + 1, dtype=np.int64)
+        np.cumsum([len(connection) for connection in connections], out=connectionOffsets[1:])
+        self._setArrays(patches, flaps,
+                        connectionOffsets,
+                        np.fromiter(chain.from_iterable(connections), dtype=np.int64, count=connectionOffsets[-1]),
+                        np.fromiter(chain.from_iterable(edge.vertices for edge in edges), dtype=np.int64,
+                                    count=2 * len(edges)).reshape(-1, 2),
+                        np.array(vertices, dtype=float).reshape(-1, dimension))
+
+    @classmethod
+    def fromArrays(cls, patches, flaps, connectionOffsets, connectionEdges, edgeVertices, vertexArray,
+                   connectionFaces=None, edgeSources=None):
+        """ Create a model from its arrays without going through lists. """
+        self = cls.__new__(cls)
+        self._setArrays(patches, flaps, connectionOffsets, connectionEdges, edgeVertices, vertexArray, connectionFaces,
+                        edgeSources)
+        return self
+
+    def getConnection(self, connectionIndex):
+        """ The edges of a connection, a view into connectionEdges. """
+        return self.connectionEdges[self.connectionOffsets[connectionIndex]:self.connectionOffsets[connectionIndex + 1]]
+
+    def getLoopEdges(self, patchIndex):
+        return self.loopEdges[self.loopOffsets[patchIndex]:self.loopOffsets[patchIndex + 1]]
+
+    def getLoopVertices(self, patchIndex):
+        return self.loopVertices[self.loopOffsets[patchIndex]:self.loopOffsets[patchIndex + 1]]
+
+    # private
+
+    def _setArrays(self, patches, flaps, connectionOffsets, connectionEdges, edgeVertices, vertexArray,
+                   connectionFaces=None, edgeSources=None):
         self.patches = patches
         self.flaps = flaps
-        self.connections = connections
-        self.edges = edges
-        self.vertices = vertices
+        self.connectionOffsets = np.asarray(connectionOffsets, dtype=np.int64)
+        self.connectionFaces = np.full((len(self.connectionOffsets) - 1, 2), -1, dtype=np.int64) \
+            if connectionFaces is None else np.asarray(connectionFaces, dtype=np.int64).reshape(-1, 2)
+        self.connectionEdges = np.asarray(connectionEdges, dtype=np.int64)
+        self.edgeVertices = np.asarray(edgeVertices, dtype=np.int64).reshape(-1, 2)
+        self.vertexArray = np.asarray(vertexArray, dtype=float)
+        self.edgeSources = np.full(len(self.edgeVertices), -1, dtype=np.int64) if edgeSources is None \
+            else np.asarray(edgeSources, dtype=np.int64)
+        self._buildLoops()
+
+    def _buildLoops(self):
+        connectionEdges = self.connectionEdges.tolist()
+        offsets = self.connectionOffsets.tolist()
+        edgeVertices = self.edgeVertices.tolist()
+        loopEdges = []
+        loopVertices = []
+        loopSizes = []
+        self.hasLoop = np.zeros(len(self.patches), dtype=bool)
+        for patchIndex, patch in enumerate(self.patches):
+            connections = [patch.parentConnection] if patch.parentConnection is not None else []
+            connections += patch.childConnections
+            patchEdges = [edge for connection in connections
+                          for edge in connectionEdges[offsets[connection]:offsets[connection + 1]]]
+            loop = _walkLoop(patchEdges, edgeVertices) if patchEdges else None
+            if loop is None:
+                loopSizes.append(0)
+                continue
+            self.hasLoop[patchIndex] = True
+            loopEdges.extend(loop[0])
+            loopVertices.extend(loop[1])
+            loopSizes.append(len(loop[0]))
+        self.loopOffsets = np.zeros(len(self.patches) + 1, dtype=np.int64)
+        np.cumsum(loopSizes, out=self.loopOffsets[1:])
+        self.loopEdges = np.array(loopEdges, dtype=np.int64)
+        self.loopVertices = np.array(loopVertices, dtype=np.int64)
 
 
 class PatchImpl:
@@ -34,3 +121,33 @@ class EdgeImpl:
 
     def __repr__(self):
         return repr(self.vertices)
+
+
+# private
+
+
+def _walkLoop(patchEdges, edgeVertices):
+    """ The edges and vertices of the boundary loop through the first edge, None if the walk gets stuck.
+
+    The walk leaves the first edge through its smaller vertex.
+    """
+    edgesByVertex = {}
+    for edge in patchEdges:
+        for vertex in edgeVertices[edge]:
+            edgesByVertex.setdefault(vertex, []).append(edge)
+    edge = initialEdge = patchEdges[0]
+    vertex = edgeVertices[edge][0]
+    edges = []
+    vertices = []
+    while True:
+        edges.append(edge)
+        vertices.append(vertex)
+        vertexEdges = edgesByVertex[vertex]
+        if len(vertexEdges) != 2 or edge not in vertexEdges:
+            return None
+        edge = vertexEdges[1] if edge == vertexEdges[0] else vertexEdges[0]
+        (fstVertex, sndVertex) = edgeVertices[edge]
+        vertex = sndVertex if vertex == fstVertex else fstVertex
+        if edge == initialEdge:
+            break
+    return edges, vertices
@@ -1,67 +1,35 @@
-from unfolder.model.model_impl import ModelImpl, PatchImpl
-from unfolder.util.appenders import StackBuckets
+from unfolder.model.model_impl import ModelImpl
 
 
-def getOther(elem, bituple):
-    (fst, snd) = bituple
-    if elem == fst:
-        return snd
-    elif elem == snd:
-        return fst
-    else:
-        raise Exception('Error element ' + repr(elem) + ' is not in ' + repr(bituple))
-
 class Patch:
+    """ A view of a patch of a model, the boundary loops are precomputed by the model. """
     def __init__(self, index, modelImpl: ModelImpl):
         self.index = index
         self.modelImpl = modelImpl
 
     @property
     def edges(self):
-        edgesByVertex = self._getEdgesByVertex()
-        edgeIndex = initialEdgeIndex = self._getInitialEdge()
-        vertexIndex = self.modelImpl.edges[edgeIndex].vertices[0]
-        edges = []
-        while True:
-            edges.append(edgeIndex)
-            edgeIndex = getOther(edgeIndex, edgesByVertex[vertexIndex])
-            vertexIndex = getOther(vertexIndex, self.modelImpl.edges[edgeIndex].vertices)
-            if edgeIndex == initialEdgeIndex:
-                break
-        return edges
+        return self.edgeArray.tolist()
 
     @property
     def vertices(self):
-        edgesByVertex = self._getEdgesByVertex()
-        edgeIndex = initialEdgeIndex = self._getInitialEdge()
-        vertexIndex = self.modelImpl.edges[edgeIndex].vertices[0]
-        vertices = []
-        while True:
-            vertices.append(vertexIndex)
-            edgeIndex = getOther(edgeIndex, edgesByVertex[vertexIndex])
-            vertexIndex = getOther(vertexIndex, self.modelImpl.edges[edgeIndex].vertices)
-            if edgeIndex == initialEdgeIndex:
-                break
-        return vertices
-
-    def _getInitialEdge(self):
-        initialConnectionIndex = self.impl.parentConnection if self.impl.parentConnection is not None \
-            else self.impl.childConnections[0]
-        return self.modelImpl.connections[initialConnectionIndex][0]
-
-    def _getEdgesByVertex(self):
-        def addEdge(connectionIndex):
-            for edgeIndex in self.modelImpl.connections[connectionIndex]:
-                (fstVertex, sndVertex) = self.modelImpl.edges[edgeIndex].vertices
-                buckets.push(fstVertex, edgeIndex)
-                buckets.push(sndVertex, edgeIndex)
-
-        buckets = StackBuckets()
-        if self.impl.parentConnection is not None:
-            addEdge(self.impl.parentConnection)
-        for connection in self.impl.childConnections:
-            addEdge(connection)
-        return buckets.store
+        return self.vertexArray.tolist()
+
+    @property
+    def edgeArray(self):
+        """ The boundary edges in loop order, a view into the model arrays. """
+        self._checkLoop()
+        return self.modelImpl.getLoopEdges(self.index)
+
+    @property
+    def vertexArray(self):
+        """ The boundary vertices in loop order, vertex i is shared by edge i and edge i + 1. """
+        self._checkLoop()
+        return self.modelImpl.getLoopVertices(self.index)
+
+    def _checkLoop(self):
+        if not self.modelImpl.hasLoop[self.index]:
+            raise Exception('Error the edges of patch ' + repr(self.name) + ' do not form a loop')
 
     @property
     def name(self):
@@ -38,10 +38,20 @@ class PatchBuilder:
         mappedInitialEdgeDirection = om.MVector(1, 0, 0)
         initialConnectionEdge = ConnectionEdge(initialEdge, mappingPlaneOrigin, mappedInitialEdgeDirection)
 
-        self._flattenSubtree(tree, initialConnectionEdge, mappingPlaneNormal)
-
-
-    def _flattenSubtree(self, subtree, connectionEdge, mappingPlaneNormal):
+        self._flattenTree(tree, initialConnectionEdge, mappingPlaneNormal)
+
+    def _flattenTree(self, tree, initialConnectionEdge, mappingPlaneNormal):
+        """ Flatten the faces in depth first order without recursion, deep strips would exceed the recursion limit.
+        """
+        stack = [(tree, initialConnectionEdge)]
+        while stack:
+            (subtree, connectionEdge) = stack.pop()
+            childConnectionEdges = self._flattenFace(subtree, connectionEdge, mappingPlaneNormal)
+            stack.extend(reversed(list(zip(subtree.children, childConnectionEdges))))
+
+    def _flattenFace(self, subtree, connectionEdge, mappingPlaneNormal):
+        """ Flatten a single face and return the connection edges of its children.
+        """
         def mapVertex(vertexIndex):
             vertexIter = om.MItMeshVertex(self._dagPath)
             setIter(vertexIter, vertexIndex)
@@ -75,9 +85,8 @@ class PatchBuilder:
 
         createFace()
 
+        childConnectionEdges = []
         for child in subtree.children:
             sharedEdge = getSharedEdge(faceIndex, child.face, self._dagPath)
-            connectionEdge = getConnectionEdgeForEdge(sharedEdge)
-            self._flattenSubtree(child, connectionEdge, mappingPlaneNormal)
-
-
+            childConnectionEdges.append(getConnectionEdgeForEdge(sharedEdge))
+        return childConnectionEdges
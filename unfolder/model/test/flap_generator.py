@@ -0,0 +1,92 @@
+from unittest import TestCase
+
+import numpy as np
+
+from unfolder.analyze_patch.polygon_overlap import polygonsOverlap
+from unfolder.automatic_unfold.mesh_to_graph import meshToGraph
+from unfolder.graph.graph_builder import GraphBuilder
+from unfolder.graph.spanning_trees import getSpanningTrees
+from unfolder.mesh.face import FaceIter
+from unfolder.mesh.obj_importer import ObjImporter
+from unfolder.model.flap_generator import FlapGenerator, addFlaps
+from unfolder.model.model_builder import ModelBuilder
+from unfolder.model.model_impl import PatchImpl
+from unfolder.model.tree_to_model.tree_to_model import treeToModel
+from unfolder.tree.knot import graphToTree
+
+
+def buildSquares(squares, cuts):
+    """ A model of unit squares at the given lower left corners, cuts are (square, side, other square, other side).
+
+    The sides of a square are numbered bottom, right, top, left.
+    """
+    builder = ModelBuilder((0., 0., 1.))
+    cutSides = {}
+    for square, otherSide in [((square, side), (other, otherSide)) for square, side, other, otherSide in cuts] \
+            + [((other, otherSide), (square, side)) for square, side, other, otherSide in cuts]:
+        cutSides[square] = otherSide
+    for square, (x, y) in enumerate(squares):
+        corners = [builder.addVertex(corner) for corner in
+                   [(x, y, 0.), (x + 1., y, 0.), (x + 1., y + 1., 0.), (x, y + 1., 0.)]]
+        connections = []
+        for side in range(4):
+            edge = builder.addEdge(corners[side], corners[(side + 1) % 4])
+            other = cutSides.get((square, side))
+            connections.append(builder.addConnection([edge], square, other[0]) if other is not None
+                               else builder.addConnection([edge]))
+        builder.addPatch(PatchImpl(square, None, connections, None))
+    return builder.build()
+
+
+class FlapGeneratorTests(TestCase):
+    def assertSameCorners(self, polygon, corners):
+        self.assertEqual(sorted(np.round(polygon, 9).tolist()), sorted(corners))
+
+    def test_oneSide(self):
+        impl = buildSquares([(0., 0.), (3., 0.)], [(0, 1, 1, 3)])
+        flaps = FlapGenerator(impl).generate()
+        self.assertEqual(len(flaps), 1)
+        self.assertEqual(flaps.patches.tolist(), [0])
+        self.assertSameCorners(flaps.polygons[0], [[1., 0.], [1., 1.], [1.25, .75], [1.25, .25]])
+
+    def test_flip(self):
+        # a third square right of the first one leaves no room there
+        impl = buildSquares([(0., 0.), (3., 0.), (1.1, 0.)], [(0, 1, 1, 3)])
+        flaps = FlapGenerator(impl).generate()
+        self.assertEqual(flaps.patches.tolist(), [1])
+        self.assertSameCorners(flaps.polygons[0], [[3., 1.], [3., 0.], [2.75, .25], [2.75, .75]])
+
+    def test_shrink(self):
+        impl = buildSquares([(0., 0.), (3., 0.), (1.2, 0.), (1.8, 0.)], [(0, 1, 1, 3)])
+        flaps = FlapGenerator(impl).generate()
+        self.assertEqual(flaps.patches.tolist(), [0])
+        self.assertSameCorners(flaps.polygons[0], [[1., 0.], [1., 1.], [1.125, .875], [1.125, .125]])
+
+    def test_noRoom(self):
+        impl = buildSquares([(0., 0.), (3., 0.), (1.01, 0.), (1.99, 0.)], [(0, 1, 1, 3)])
+        self.assertEqual(len(FlapGenerator(impl).generate()), 0)
+
+    def test_flapsAvoidEachOther(self):
+        # both cuts want a flap in the same gap, the second one flips
+        impl = buildSquares([(0., 0.), (1.3, 0.), (0., 3.), (3., 3.)], [(0, 1, 2, 3), (1, 3, 3, 1)])
+        flaps = FlapGenerator(impl).generate()
+        self.assertEqual(flaps.patches.tolist(), [0, 3])
+
+    def test_box(self):
+        mesh = ObjImporter().read('resources/box.obj')
+        faces = FaceIter(mesh)
+        graph = meshToGraph(faces, GraphBuilder())
+        for index, spanningTree in enumerate(getSpanningTrees(graph)):
+            if index == 10:
+                break
+            model = treeToModel(graphToTree(spanningTree), faces)
+            flaps = addFlaps(model)
+            self.assertIs(model.impl.flaps, flaps)
+            # one flap for every edge of the box that is cut
+            self.assertEqual(len(flaps), 12 - 5)
+            vertices = model.impl.vertexArray[:, :2]
+            patches = [vertices[patch.vertexArray].tolist() for patch in model.patches]
+            polygons = flaps.polygons.tolist()
+            for flapIndex, flap in enumerate(polygons):
+                for polygon in patches + polygons[:flapIndex]:
+                    self.assertFalse(polygonsOverlap(flap, polygon))
@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+import numpy as np
+
+from unfolder.model.model import Model
+from unfolder.model.model_impl import ModelImpl, PatchImpl, EdgeImpl
+
+
+class ModelImplTests(TestCase):
+    def setUp(self):
+        # two unit squares sharing the edge (1, 4)
+        self.vertices = [(0., 0., 0.), (1., 0., 0.), (2., 0., 0.), (0., 1., 0.), (1., 1., 0.), (2., 1., 0.)]
+        self.edges = [EdgeImpl(0, 1), EdgeImpl(1, 4), EdgeImpl(4, 3), EdgeImpl(3, 0),
+                      EdgeImpl(1, 2), EdgeImpl(2, 5), EdgeImpl(5, 4)]
+        self.connections = [[1], [2, 3, 0], [4, 5, 6], [1]]
+        self.patches = [PatchImpl(0, None, [0, 1], None), PatchImpl(1, 3, [2], None)]
+        self.impl = ModelImpl(self.patches, None, self.connections, self.edges, self.vertices)
+
+    def test_arrays(self):
+        self.assertEqual(self.impl.vertexArray.shape, (6, 3))
+        self.assertEqual(self.impl.edgeVertices.tolist()[2], [3, 4])
+        self.assertEqual(self.impl.getConnection(1).tolist(), [2, 3, 0])
+        # the lists the model was built from
+        self.assertEqual([tuple(vertex) for vertex in self.impl.vertexArray.tolist()], self.vertices)
+        self.assertEqual([tuple(edge) for edge in self.impl.edgeVertices.tolist()],
+                         [edge.vertices for edge in self.edges])
+        self.assertEqual([self.impl.getConnection(index).tolist() for index in range(len(self.connections))],
+                         self.connections)
+
+    def test_loops(self):
+        patches = Model(self.impl).patches
+        self.assertEqual(patches[0].edges, [1, 0, 3, 2])
+        self.assertEqual(patches[0].vertices, [1, 0, 3, 4])
+        self.assertEqual(patches[1].edges, [1, 4, 5, 6])
+        self.assertEqual(patches[1].vertices, [1, 2, 5, 4])
+        # the arrays are views, no copies
+        self.assertIs(patches[1].edgeArray.base, self.impl.loopEdges)
+
+    def test_openBoundary(self):
+        patches = [PatchImpl(0, None, [1], None)]
+        impl = ModelImpl(patches, None, self.connections, self.edges, self.vertices)
+        self.assertFalse(impl.hasLoop[0])
+        with self.assertRaises(Exception):
+            Model(impl).patches[0].edges
+
+    def test_empty(self):
+        impl = ModelImpl([], None, [], [], [])
+        self.assertEqual(impl.vertexArray.shape, (0, 3))
+        self.assertEqual(len(impl.loopEdges), 0)
+        np.testing.assert_array_equal(impl.loopOffsets, [0])
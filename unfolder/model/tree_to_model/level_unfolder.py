@@ -0,0 +1,226 @@
+from itertools import chain
+
+import numpy as np
+
+from unfolder.analyze_patch.overlap_index import OverlapError, OverlapIndex
+from unfolder.mesh.mesh_arrays import MeshArrays
+from unfolder.model.model import Model
+from unfolder.model.model_impl import ModelImpl, PatchImpl
+from unfolder.tree.ancestor_index import getHingeTransforms
+from unfolder.tree.rooted_tree import RootedTree
+from unfolder.util import transform2d
+from unfolder.util.appenders import mergeVertices
+
+
+def unfoldTree(tree: RootedTree, meshArrays: MeshArrays, overlapIndex: OverlapIndex=None):
+    """ Unfold a face tree into the same model as treeToModel. """
+    return LevelUnfolder(meshArrays).unfold(tree, overlapIndex)
+
+
+class LevelUnfolder:
+    """ Unfold face trees level by level with batched 2D transforms.
+
+    The faces of one tree level are placed together: the transform of every
+    face into the model plane is the transform of its parent composed with
+    the rigid transform that puts the face onto the parent's hinge edge.
+    Afterwards the corners of all faces are mapped in one go.
+
+    The model is then assembled in the order treeToModel adds vertices,
+    edges, connections and patches, so both produce the same model up to
+    floating point rounding of the vertex positions. Vertices and edges are
+    merged with numpy, the connections and patches are still built face by
+    face in Python, since their order follows treeToModel's set iteration.
+    """
+
+    def __init__(self, meshArrays: MeshArrays):
+        self._meshArrays = meshArrays
+        self._connectedFaces = {}
+
+    def unfold(self, tree: RootedTree, overlapIndex: OverlapIndex=None):
+        """ The model of a tree, the faces are added to overlapIndex in the order treeToModel adds them.
+
+        As with treeToModel, the faces are removed from the index again on
+        an OverlapError and an index without a cell size gets the mean face
+        extent of the mesh.
+        """
+        (begins, ends, parentTransforms) = getHingeTransforms(tree, self._meshArrays)
+        toModel = self._composeLevels(tree, parentTransforms)
+        (corners, cornerOffsets) = self._mapCorners(tree, begins, ends, toModel)
+        return Model(self._buildModel(tree, corners, cornerOffsets, overlapIndex))
+
+    # private
+
+    def _composeLevels(self, tree, parentTransforms):
+        """ The transforms of all faces into the model plane, one batch per tree level. """
+        toModel = transform2d.identity((len(tree),))
+        levelBounds = np.searchsorted(tree.depths[tree.bfsOrder], np.arange(1, tree.depths.max(initial=0) + 2))
+        for levelBegin, levelEnd in zip(levelBounds[:-1], levelBounds[1:]):
+            nodes = tree.bfsOrder[levelBegin:levelEnd]
+            toModel[nodes] = transform2d.compose(toModel[tree.parents[nodes]], parentTransforms[nodes])
+        return toModel
+
+    def _mapCorners(self, tree, begins, ends, toModel):
+        """ The model positions of the loop vertices of all faces.
+
+        Returns the positions and the offsets of every node in them, the
+        corners of node n are corners[cornerOffsets[n]:cornerOffsets[n + 1]].
+        """
+        meshArrays = self._meshArrays
+        faces = np.asarray(tree.values, dtype=np.int64)
+        (origins, xAxes, yAxes) = meshArrays.hingeFrames(faces, begins, ends)
+        faceSizes = meshArrays.faceOffsets[faces + 1] - meshArrays.faceOffsets[faces]
+        cornerNodes = np.repeat(np.arange(len(tree)), faceSizes)
+        cornerOffsets = np.zeros(len(tree) + 1, dtype=np.int64)
+        np.cumsum(faceSizes, out=cornerOffsets[1:])
+        faceEdges = meshArrays.faceOffsets[faces][cornerNodes] + np.arange(cornerOffsets[-1]) - cornerOffsets[:-1][cornerNodes]
+
+        relative = meshArrays.vertices[meshArrays.faceEdgeEnds[faceEdges]] - origins[cornerNodes]
+        local = np.stack((np.einsum('ij,ij->i', relative, xAxes[cornerNodes]),
+                          np.einsum('ij,ij->i', relative, yAxes[cornerNodes])), axis=-1)
+        transforms = toModel[cornerNodes]
+        mapped = np.einsum('ijk,ik->ij', transforms[:, :, :2], local) + transforms[:, :, 2]
+        return mapped, cornerOffsets
+
+    def _buildModel(self, tree, corners, cornerOffsets, overlapIndex):
+        """ Build the model treeToModel builds with the precomputed corners.
+
+        Vertices and edges are added in depth first pre order, the face edges
+        of all faces are merged and interned with numpy. The connections and
+        patches are added face by face in the order of treeToModel.
+        """
+        if overlapIndex is not None:
+            self._addToIndex(tree, corners, cornerOffsets, overlapIndex)
+        (faceEdges, edgeVertices, edgeSources, vertexArray) = self._addFaceEdges(tree, corners, cornerOffsets)
+
+        (faces, parents) = (tree.values, tree.parents.tolist())
+        (children, childOffsets) = (tree.children.tolist(), tree.childOffsets.tolist())
+        connections = []
+        connectionFaces = []
+        patches = []
+        root = tree.rootIndex
+        stack = [PatchState(root, faces[root], None, children[childOffsets[root]:childOffsets[root + 1]],
+                            faceEdges[root])]
+        while stack:
+            patchState = stack[-1]
+            if patchState.nextChild < len(patchState.children):
+                child = patchState.children[patchState.nextChild]
+                patchState.nextChild += 1
+                connection = self._addConnection(connections, connectionFaces, patchState, faces[child])
+                stack.append(PatchState(child, faces[child], connection,
+                                        children[childOffsets[child]:childOffsets[child + 1]], faceEdges[child]))
+            else:
+                stack.pop()
+                parentFace = faces[parents[patchState.node]] if patchState.parentConnection is not None else None
+                patches.append(self._finishPatch(connections, connectionFaces, patchState, parentFace))
+
+        connectionOffsets = np.zeros(len(connections) + 1, dtype=np.int64)
+        np.cumsum([len(connection) for connection in connections], out=connectionOffsets[1:])
+        connectionEdges = np.fromiter(chain.from_iterable(connections), dtype=np.int64, count=connectionOffsets[-1])
+        return ModelImpl.fromArrays(patches, None, connectionOffsets, connectionEdges, edgeVertices, vertexArray,
+                                    np.array(connectionFaces, dtype=np.int64).reshape(-1, 2), edgeSources)
+
+    def _addToIndex(self, tree, corners, cornerOffsets, overlapIndex):
+        overlapIndex.useFaceExtent(self._meshArrays.meanFaceExtent())
+        placedFaces = []
+        try:
+            for node in tree.dfsOrder.tolist():
+                overlapIndex.add(tree.values[node], corners[cornerOffsets[node]:cornerOffsets[node + 1]])
+                placedFaces.append(tree.values[node])
+        except OverlapError:
+            for face in placedFaces:
+                overlapIndex.remove(face)
+            raise
+
+    def _addFaceEdges(self, tree, corners, cornerOffsets):
+        """ Merge the corners into vertices and intern the face edges of all faces like PatchBuilder does.
+
+        Returns the model edges of the face edges of every node, and the edge
+        vertices, edge sources and vertices of the model.
+        """
+        meshArrays = self._meshArrays
+        faces = np.asarray(tree.values, dtype=np.int64)
+        faceSizes = np.diff(cornerOffsets)
+        # the face edges in depth first pre order
+        dfsSizes = faceSizes[tree.dfsOrder]
+        dfsOffsets = np.zeros(len(tree) + 1, dtype=np.int64)
+        np.cumsum(dfsSizes, out=dfsOffsets[1:])
+        dfsNodes = np.repeat(tree.dfsOrder, dfsSizes)
+        loopIndices = np.arange(dfsOffsets[-1]) - np.repeat(dfsOffsets[:-1], dfsSizes)
+        meshEdges = meshArrays.faceEdges[meshArrays.faceOffsets[faces[dfsNodes]] + loopIndices]
+
+        # face edge i runs from loop vertex i + 1 to loop vertex i, the vertices are added in that order
+        nodeBegins = cornerOffsets[dfsNodes]
+        ends = nodeBegins + loopIndices
+        begins = nodeBegins + (loopIndices + 1) % faceSizes[dfsNodes]
+        (vertexArray, vertexIndices) = mergeVertices(corners[np.stack((begins, ends), axis=-1).reshape(-1)])
+        vertexIndices = vertexIndices.reshape(-1, 2)
+
+        # the edges in the order they are first added, the smaller vertex first
+        edgeKeys = np.sort(vertexIndices, axis=-1)
+        (uniqueKeys, firstFaceEdges, inverse) = np.unique(edgeKeys, axis=0, return_index=True, return_inverse=True)
+        order = np.argsort(firstFaceEdges, kind='stable')
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+
+        edges = rank[inverse.reshape(-1)].tolist()
+        (faceEdges, dfsOffsets) = ([None] * len(tree), dfsOffsets.tolist())
+        for position, node in enumerate(tree.dfsOrder.tolist()):
+            faceEdges[node] = edges[dfsOffsets[position]:dfsOffsets[position + 1]]
+        return (faceEdges, uniqueKeys[order],
+                meshEdges[firstFaceEdges[order]],
+                np.concatenate((vertexArray, np.zeros((len(vertexArray), 1))), axis=-1))
+
+    def _addConnection(self, connections, connectionFaces, patchState, otherFace):
+        faceBegin = self._meshArrays.faceOffsets[patchState.face]
+        connectingFaceEdges = self._meshArrays.connectingFaceEdges(patchState.face, otherFace)
+        connection = len(connections)
+        connections.append([patchState.edges[faceEdge - faceBegin] for faceEdge in connectingFaceEdges])
+        connectionFaces.append((patchState.face, otherFace))
+        if otherFace not in patchState.connections:
+            patchState.connections[otherFace] = connection
+        patchState.childFaces.add(otherFace)
+        return connection
+
+    def _finishPatch(self, connections, connectionFaces, patchState, parentFace):
+        """ Add the remaining connections of a face like PatchBuilder does, returns its patch. """
+        # the same set operations as treeToModel, so the faces come in the same order
+        disconnectedFaces = set(self._getConnectedFaces(patchState.face)) - patchState.childFaces
+        if parentFace is not None:
+            disconnectedFaces.remove(parentFace)
+        for disconnectedFace in disconnectedFaces:
+            self._addConnection(connections, connectionFaces, patchState, disconnectedFace)
+
+        patchConnections = list(patchState.connections.values())
+        allConnections = [patchState.parentConnection] + patchConnections if patchState.parentConnection is not None \
+            else patchConnections
+        connectedEdgeIndices = set([edge for connectionIndex in allConnections
+                                    for edge in connections[connectionIndex]])
+        freeEdgeConnectionIndex = len(connections)
+        connections.append(list(set(patchState.edges) - connectedEdgeIndices))
+        connectionFaces.append((-1, -1))
+        if freeEdgeConnectionIndex:
+            patchConnections.append(freeEdgeConnectionIndex)
+        return PatchImpl(patchState.face, patchState.parentConnection, patchConnections, None)
+
+    def _getConnectedFaces(self, face):
+        """ The connected faces in the order of Face.getConnectedFaces. """
+        if face not in self._connectedFaces:
+            self._connectedFaces[face] = sorted(set(self._meshArrays.connectedFaces(face)))
+        return self._connectedFaces[face]
+
+
+class PatchState:
+    """ A face whose patch is being built.
+
+    edges        the model edge of every face edge
+    connections  the connection to every connected face, by face
+    """
+    def __init__(self, node, face, parentConnection, children, edges):
+        self.node = node
+        self.face = face
+        self.parentConnection = parentConnection
+        self.children = children
+        self.nextChild = 0
+        self.edges = edges
+        self.connections = {}
+        self.childFaces = set()
@@ -8,6 +8,10 @@ from unfolder.util.appenders import MappingAppender
 
 
 class PatchBuilder:
+    """ Place a face in the model along its patch base and collect its connections.
+
+    polygon  the corners of the placed face in the model plane, in face edge order
+    """
     def __init__(self, face: Face, patchBase: PatchBase, modelBuilder: ModelBuilder):
         self.face = face
         self.modelBuilder = modelBuilder
@@ -15,6 +19,7 @@ class PatchBuilder:
         self._connections = MappingAppender()
         self._edgeMapping = {}
         self._edgeOrientation = {}
+        self.polygon = []
         self._vertexMapper = self._getVertexMapper(patchBase)
         self._addEdges(patchBase)
 
@@ -23,11 +28,11 @@ class PatchBuilder:
         inBaseEdge = inConnectingEdges[0]
 
         edgeIndices = [self._edgeMapping[inEdge.index] for inEdge in inConnectingEdges]
-        connectionIndex =  self.modelBuilder.addConnection(edgeIndices)
+        connectionIndex = self.modelBuilder.addConnection(edgeIndices, self.face.index, childFace.index)
         self._connections.push(childFace.index, connectionIndex)
 
         edgeIndex = edgeIndices[0]
-        (fstVertexIndex, sndVertexIndex) = flipIf(self.modelBuilder.edges[edgeIndex].vertices,
+        (fstVertexIndex, sndVertexIndex) = flipIf(self.modelBuilder.edges.getVertices(edgeIndex),
                                                   self._edgeOrientation[inBaseEdge.index])
         begin = self.modelBuilder.vertices[fstVertexIndex]
         end = self.modelBuilder.vertices[sndVertexIndex]
@@ -44,7 +49,7 @@ class PatchBuilder:
 
     def _getUnconnectedEdges(self):
         allConnections = [self._parentConnection] + self._connections.store if self._parentConnection is not None else self._connections.store
-        connectedEdgeIndices = set([edge for connectionIndex in allConnections for edge in self.modelBuilder.connections.store[connectionIndex]])
+        connectedEdgeIndices = set([edge for connectionIndex in allConnections for edge in self.modelBuilder.connections[connectionIndex].tolist()])
         return list(set(self._edgeMapping.values()) - connectedEdgeIndices)
 
     def _getVertexMapper(self, patchBase: PatchBase):
@@ -53,19 +58,20 @@ class PatchBuilder:
         return VertexMapper(faceNormal, patchBase.inBaseEdge, modelNormal, patchBase.baseEdge)
 
     def _addEdges(self, patchBase):
-        vertexMapper = self._getVertexMapper(patchBase)
-        for inFaceEdge in self.face.edges:
-            fstVertexIndex = self._addVertex(inFaceEdge.begin, vertexMapper)
-            sndVertexIndex = self._addVertex(inFaceEdge.end, vertexMapper)
+        inFaceEdges = list(self.face.edges)
+        inVertices = [vertex for inFaceEdge in inFaceEdges for vertex in (inFaceEdge.begin, inFaceEdge.end)]
+        # all vertices of the face are mapped at once
+        vertices = self._vertexMapper.mapVertices(inVertices).tolist()
+        meshEdges = self.face.impl.edges
+        self.polygon = [tuple(vertices[2 * index][:2]) for index in range(len(inFaceEdges))]
+        for index, inFaceEdge in enumerate(inFaceEdges):
+            fstVertexIndex = self.modelBuilder.addVertex(tuple(vertices[2 * index]))
+            sndVertexIndex = self.modelBuilder.addVertex(tuple(vertices[2 * index + 1]))
             flipped = fstVertexIndex > sndVertexIndex
             self._edgeOrientation[inFaceEdge.index] = flipped
-            edgeIndex = self.modelBuilder.addEdge(fstVertexIndex, sndVertexIndex)
+            edgeIndex = self.modelBuilder.addEdge(fstVertexIndex, sndVertexIndex, meshEdges[inFaceEdge.index])
             self._edgeMapping[inFaceEdge.index] = edgeIndex
 
-    def _addVertex(self, inVertex, vertexMapper):
-        vertex = tuple(vertexMapper.mapVertex(inVertex))
-        return self.modelBuilder.addVertex(vertex)
-
 
 def flipIf(t, flip):
     return (t[1], t[0]) if flip else t
\ No newline at end of file
@@ -0,0 +1,76 @@
+from unittest import TestCase
+
+import numpy as np
+
+from unfolder.analyze_patch.overlap_index import OverlapError, OverlapIndex, RECORD
+from unfolder.automatic_unfold.mesh_to_graph import meshToGraph
+from unfolder.graph.graph_builder import GraphBuilder
+from unfolder.graph.spanning_tree_ranking import SpanningTreeRanking
+from unfolder.mesh.face import FaceIter
+from unfolder.mesh.mesh_arrays import MeshArrays
+from unfolder.mesh.obj_importer import ObjImporter
+from unfolder.model.tree_to_model.level_unfolder import unfoldTree
+from unfolder.model.tree_to_model.test.strip import createStripMesh, createStripTree
+from unfolder.model.tree_to_model.tree_to_model import treeToModel
+from unfolder.tree.rooted_tree import graphToRootedTree
+
+
+class LevelUnfolderTests(TestCase):
+    def assertSameModel(self, model, expectedModel):
+        (impl, expectedImpl) = (model.impl, expectedModel.impl)
+        np.testing.assert_allclose(impl.vertexArray, expectedImpl.vertexArray, atol=1e-9)
+        self.assertEqual(impl.edgeVertices.tolist(), expectedImpl.edgeVertices.tolist())
+        self.assertEqual(impl.connectionOffsets.tolist(), expectedImpl.connectionOffsets.tolist())
+        self.assertEqual(impl.connectionEdges.tolist(), expectedImpl.connectionEdges.tolist())
+        self.assertEqual(impl.connectionFaces.tolist(), expectedImpl.connectionFaces.tolist())
+        self.assertEqual(impl.edgeSources.tolist(), expectedImpl.edgeSources.tolist())
+        self.assertEqual([(patch.name, patch.parentConnection, patch.childConnections) for patch in impl.patches],
+                         [(patch.name, patch.parentConnection, patch.childConnections)
+                          for patch in expectedImpl.patches])
+
+    def _compareSpanningTrees(self, filename, numTrees):
+        mesh = ObjImporter().read(filename)
+        faces = FaceIter(mesh)
+        meshArrays = MeshArrays(mesh)
+        for component in meshToGraph(faces, GraphBuilder()).getConnectedComponents():
+            ranking = SpanningTreeRanking(component)
+            for rank in range(0, ranking.count, max(1, ranking.count // numTrees)):
+                tree = graphToRootedTree(ranking.unrank(rank))
+                self.assertSameModel(unfoldTree(tree, meshArrays), treeToModel(tree, faces))
+
+    def test_box(self):
+        self._compareSpanningTrees('resources/box.obj', 40)
+
+    def test_pyramid(self):
+        self._compareSpanningTrees('resources/pyramid.obj', 45)
+
+    def test_torus(self):
+        self._compareSpanningTrees('resources/torus.obj', 5)
+
+    def test_strip(self):
+        mesh = createStripMesh(200)
+        tree = createStripTree(200)
+        self.assertSameModel(unfoldTree(tree, MeshArrays(mesh)), treeToModel(tree, FaceIter(mesh)))
+
+    def test_overlapIndex(self):
+        mesh = ObjImporter().read('resources/torus.obj')
+        (faces, meshArrays) = (FaceIter(mesh), MeshArrays(mesh))
+        component = next(iter(meshToGraph(faces, GraphBuilder()).getConnectedComponents()))
+        ranking = SpanningTreeRanking(component)
+        for rank in range(0, ranking.count, ranking.count // 3):
+            tree = graphToRootedTree(ranking.unrank(rank))
+            (index, levelIndex) = (OverlapIndex(RECORD), OverlapIndex(RECORD))
+            treeToModel(tree, faces, index)
+            unfoldTree(tree, meshArrays, levelIndex)
+            self.assertGreater(len(index.overlaps), 0)
+            self.assertEqual(levelIndex.overlaps, index.overlaps)
+            self.assertEqual(index.cellSize, meshArrays.meanFaceExtent())
+            self.assertEqual(levelIndex.cellSize, meshArrays.meanFaceExtent())
+            for unfold in (lambda abortIndex: treeToModel(tree, faces, abortIndex),
+                           lambda abortIndex: unfoldTree(tree, meshArrays, abortIndex)):
+                abortIndex = OverlapIndex()
+                with self.assertRaises(OverlapError) as context:
+                    unfold(abortIndex)
+                # building stopped at the first overlap and the placed faces are removed again
+                self.assertEqual((context.exception.key, context.exception.others[0]), index.overlaps[0])
+                self.assertEqual(len(abortIndex), 0)
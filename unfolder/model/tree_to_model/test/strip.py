@@ -0,0 +1,67 @@
+import sys
+import time
+from unittest import TestCase
+
+import numpy as np
+
+from unfolder.graph.graph_impl import GraphImpl, EdgeImpl
+from unfolder.mesh.face import FaceIter
+from unfolder.mesh.mesh_impl import MeshImpl, FaceImpl, EdgeImpl as MeshEdgeImpl
+from unfolder.model.tree_to_model.tree_to_model import treeToModel
+from unfolder.tree.rooted_tree import graphToRootedTree
+
+
+def createStripMesh(numFaces):
+    """ A folded strip of quads, face i shares its edges with faces i - 1 and i + 1. """
+    vertices = []
+    for index in range(numFaces + 1):
+        height = .5 if index % 2 else 0.
+        vertices += [(float(index), 0., height), (float(index), 1., height)]
+    edges = [MeshEdgeImpl(0, 1)]
+    faces = []
+    for index in range(numFaces):
+        (fst, snd) = (2 * index, 2 * index + 2)
+        edges += [MeshEdgeImpl(fst, snd), MeshEdgeImpl(snd, snd + 1), MeshEdgeImpl(snd + 1, fst + 1)]
+        previous = 0 if index == 0 else 3 * index - 1
+        faces.append(FaceImpl([3 * index + 1, 3 * index + 2, 3 * index + 3, previous], None))
+    return MeshImpl(faces, edges, vertices, [])
+
+
+def createStripTree(numFaces):
+    """ The face tree of a strip is a single path. """
+    edges = [EdgeImpl(index, index + 1) for index in range(numFaces - 1)]
+    return graphToRootedTree(GraphImpl(list(range(numFaces)), edges))
+
+
+class StripToModelTests(TestCase):
+    def test_deepTree(self):
+        # the tree is far deeper than the recursion limit
+        numFaces = 300
+        faces = FaceIter(createStripMesh(numFaces))
+        recursionLimit = sys.getrecursionlimit()
+        sys.setrecursionlimit(100)
+        try:
+            model = treeToModel(createStripTree(numFaces), faces)
+        finally:
+            sys.setrecursionlimit(recursionLimit)
+
+        self.assertEqual(len(model.impl.patches), numFaces)
+        # the unfolded strip is straight and flat
+        vertices = model.impl.vertexArray
+        self.assertEqual(len(vertices), 2 * numFaces + 2)
+        self.assertAlmostEqual(vertices[:, 0].max() - vertices[:, 0].min(), numFaces * (1.25 ** .5), places=6)
+        self.assertTrue(np.all(np.abs(vertices[:, 2]) < 1e-9))
+
+
+def benchmark(numFaces=50000):
+    """ Unfold a long strip with the default recursion limit. """
+    faces = FaceIter(createStripMesh(numFaces))
+    start = time.perf_counter()
+    tree = createStripTree(numFaces)
+    model = treeToModel(tree, faces)
+    print('unfolded a strip of %i faces into %i patches in %.2f s, recursion limit %i'
+          % (numFaces, len(model.impl.patches), time.perf_counter() - start, sys.getrecursionlimit()))
+
+
+if __name__ == '__main__':
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -4,6 +4,7 @@ from unfolder.mesh.face import FaceIter
 from unfolder.mesh.obj_importer import ObjImporter
 from unfolder.model.tree_to_model.tree_to_model import treeToModel
 from unfolder.tree.knot import graphToTree
+from unfolder.tree.rooted_tree import graphToRootedTree
 
 
 class TreeToModelTester:
@@ -29,19 +30,26 @@ class TreeToModelTester:
 
         graphEdges = [EdgeImpl(fst, snd) for fst, snd in self.EDGES]
 
-        treeGraph = GraphImpl(self.NODES, graphEdges)
-        self.tree = graphToTree(treeGraph)
+        self.treeGraph = GraphImpl(self.NODES, graphEdges)
+        self.tree = graphToTree(self.treeGraph)
 
     def test_patches(self):
         model = treeToModel(self.tree, self.faces)
-        print(model.impl.edges)
-        print(model.impl.vertices)
+        print(model.impl.edgeVertices)
+        print(model.impl.vertexArray)
         for patch in model.patches:
             print(patch.name)
             print(patch.edges)
             print(patch.vertices)
             print('---------')
 
+    def test_rootedTree(self):
+        model = treeToModel(self.tree, self.faces)
+        rootedModel = treeToModel(graphToRootedTree(self.treeGraph), self.faces)
+        self.assertEqual(rootedModel.impl.vertexArray.tolist(), model.impl.vertexArray.tolist())
+        self.assertEqual(rootedModel.impl.edgeVertices.tolist(), model.impl.edgeVertices.tolist())
+        self.assertEqual([patch.name for patch in rootedModel.patches], [patch.name for patch in model.patches])
+
 
 class PyramidToModelTests(TreeToModelTester, TestCase):
     OBJ_FILE_NAME = 'resources/pyramid.obj'
@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+import numpy as np
+
 from unfolder.model.tree_to_model.edge_proxy import PatchEdgeProxy
 from unfolder.model.tree_to_model.vertex_mapper import VertexMapper
 from unfolder.util.vector import Vector
@@ -62,6 +64,18 @@ class VertexMapperTests(TestCase):
         # outside mapping plane
         self.assertEqual(vm.mapVertex(v(0, -4, 9.5)), v(-3, 12, -1))
 
+    def test_mapVertices(self):
+        faceNormal = v(0, 0, 1)
+        inEdge = PatchEdgeProxy(v(1, 3, -2), v(1, 5, -2))
+        modelNormal = v(0, 0, 1)
+        mappedEdge = PatchEdgeProxy(v(2, 2, 1), v(4, 2, 1))
+        vm = VertexMapper(faceNormal, inEdge, modelNormal, mappedEdge)
+
+        vertices = [(1, 3, -2), (97, 3, -2), (-8, 15, -2), (5, -99, -2), (-4, 27, 7)]
+        mapped = vm.mapVertices(vertices)
+        for vertex, mappedVertex in zip(vertices, mapped):
+            np.testing.assert_allclose(mappedVertex, tuple(vm.mapVertex(v(*vertex))), atol=1e-12)
+
 
 def v(x, y, z):
     return Vector(float(x), float(y), float(z))
\ No newline at end of file
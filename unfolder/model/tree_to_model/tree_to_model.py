@@ -1,4 +1,6 @@
+from unfolder.analyze_patch.overlap_index import OverlapError, OverlapIndex
 from unfolder.mesh.face import FaceIter
+from unfolder.mesh.mesh_arrays import MeshArrays
 from unfolder.model.tree_to_model.edge_proxy import PatchEdgeProxy
 from unfolder.model.model import Model
 from unfolder.model.model_builder import ModelBuilder
@@ -6,18 +8,31 @@ from unfolder.model.tree_to_model.patch_base import PatchBase
 from unfolder.model.tree_to_model.patch_builder import PatchBuilder
 
 from unfolder.tree.knot import Knot
+from unfolder.tree.rooted_tree import RootedTree
 
 
-def treeToModel(tree: Knot, meshFaces):
-    return TreeToModelConverter(meshFaces, None).convert(tree)
+def treeToModel(tree: Knot, meshFaces, overlapIndex: OverlapIndex=None):
+    """ Unfold a face tree into a model.
+
+    With an overlap index every face is added to it as soon as it is placed,
+    so with the ABORT policy building a bad unfolding stops at the first
+    overlap with an OverlapError. The faces placed until then are removed
+    from the index again, so it can be reused. An index without a cell size
+    gets the mean face extent of the mesh.
+    """
+    if isinstance(tree, RootedTree):
+        tree = tree.root
+    return TreeToModelConverter(meshFaces, None, overlapIndex).convert(tree)
 
 
 # private
 
 
 class TreeToModelConverter:
-    def __init__(self, meshFaces: FaceIter, patchBuilder):
+    def __init__(self, meshFaces: FaceIter, patchBuilder, overlapIndex: OverlapIndex=None):
         self._meshFaces = meshFaces
+        self._overlapIndex = overlapIndex
+        self._placedFaces = []
         # the model normal
         self.modelBuilder = ModelBuilder((0., 0., 1.))
         self._patchMapping = {}
@@ -27,22 +42,50 @@ class TreeToModelConverter:
         fst = (1., 0., 0.)
         baseEdge = PatchEdgeProxy(origin, fst)
         inBaseEdge = self._meshFaces[tree.value].edges[0]
-        self._flattenSubtree(tree, PatchBase(None, None, inBaseEdge, baseEdge))
+        if self._overlapIndex is not None:
+            self._overlapIndex.useFaceExtent(MeshArrays(self._meshFaces.meshImpl).meanFaceExtent())
+        try:
+            self._flattenTree(tree, PatchBase(None, None, inBaseEdge, baseEdge))
+        except OverlapError:
+            for face in self._placedFaces:
+                self._overlapIndex.remove(face)
+            raise
         return Model(self.modelBuilder.build())
 
-    def _flattenSubtree(self, subtree, patchBase):
+    def _flattenTree(self, tree, patchBase):
+        """ Flatten all faces of the tree in depth first order.
+
+        The explicit stack replaces one recursion per tree level, so deep
+        trees like long strips do not hit the recursion limit. A face is
+        finished after all of its children, like in a recursive traversal.
+        """
+        stack = [self._beginSubtree(tree, patchBase)]
+        while stack:
+            subtreeState = stack[-1]
+            child = next(subtreeState.children, None)
+            if child is not None:
+                childFace = self._meshFaces[child.value]
+                subtreeState.childFaces.add(childFace)
+                childPatchBase = subtreeState.patchBuilder.addConnection(childFace)
+                stack.append(self._beginSubtree(child, childPatchBase))
+            else:
+                stack.pop()
+                self._finishSubtree(subtreeState)
+
+    def _beginSubtree(self, subtree, patchBase):
         thisFace = self._meshFaces[subtree.value]
         patchBuilder = PatchBuilder(thisFace, patchBase, self.modelBuilder)
+        if self._overlapIndex is not None:
+            self._overlapIndex.add(thisFace.index, patchBuilder.polygon)
+            self._placedFaces.append(thisFace.index)
+        return SubtreeState(thisFace, patchBase, patchBuilder, iter(subtree))
 
-        children = set()
+    def _finishSubtree(self, subtreeState):
+        thisFace = subtreeState.face
+        patchBase = subtreeState.patchBase
+        patchBuilder = subtreeState.patchBuilder
 
-        for child in subtree:
-            childFace = self._meshFaces[child.value]
-            children.add(childFace)
-            childPatchBase = patchBuilder.addConnection(childFace)
-            self._flattenSubtree(child, childPatchBase)
-
-        disconnectedFaces = set(thisFace.getConnectedFaces()) - children
+        disconnectedFaces = set(thisFace.getConnectedFaces()) - subtreeState.childFaces
         if patchBase.parentFace is not None:
             disconnectedFaces.remove(patchBase.parentFace)
 
@@ -51,3 +94,16 @@ class TreeToModelConverter:
 
         self._patchMapping[thisFace] = self.modelBuilder.addPatch(patchBuilder.build())
 
+
+class SubtreeState:
+    """ A face whose subtree is being flattened.
+
+    children    the iterator over the child knots not visited yet
+    childFaces  the faces of the visited children
+    """
+    def __init__(self, face, patchBase, patchBuilder, children):
+        self.face = face
+        self.patchBase = patchBase
+        self.patchBuilder = patchBuilder
+        self.children = children
+        self.childFaces = set()
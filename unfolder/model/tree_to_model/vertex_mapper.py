@@ -1,3 +1,5 @@
+import numpy as np
+
 from unfolder.util.plane_coordinate_system import PlaneCoordinateSystem
 
 
@@ -17,12 +19,24 @@ class VertexMapper:
     def __init__(self, faceNormal, inEdge, modelNormal, mappedEdge):
         self._inFaceCoordinateSystem = self._getCoordinateSystemForEdge(inEdge, faceNormal)
         self._patchCoordinateSystem = self._getCoordinateSystemForEdge(mappedEdge, modelNormal)
+        self._mapping = None
 
     def mapVertex(self, vertex):
         faceCoords = self._inFaceCoordinateSystem.toLocal(vertex)
         patchCoords = self._patchCoordinateSystem.toGlobal(faceCoords)
         return patchCoords
 
+    def mapVertices(self, vertices):
+        """ Map an N x 3 array of vertices with one matrix multiplication. """
+        if self._mapping is None:
+            faceSystem = self._inFaceCoordinateSystem
+            patchSystem = self._patchCoordinateSystem
+            linear = faceSystem.basis @ patchSystem.basis.T
+            offset = np.array(tuple(patchSystem.origin)) - np.array(tuple(faceSystem.origin)) @ linear
+            self._mapping = (linear, offset)
+        (linear, offset) = self._mapping
+        return np.asarray(vertices, dtype=float) @ linear + offset
+
     def _getCoordinateSystemForEdge(self, edge, normal):
         origin = edge.begin
         e1 = edge.direction.normalized()
@@ -0,0 +1,44 @@
+import numpy as np
+
+from unfolder.model.model import Model
+
+
+class MeshArrayOutput:
+    """ An unfolded model as flat arrays, ready to be written by an exporter.
+
+    vertices     N x D vertex positions
+    faceOffsets  the vertices of face f are faceVertices[faceOffsets[f]:faceOffsets[f + 1]]
+    faceVertices the vertex loops of all faces, in the order of Face.vertexIndices
+    faceIds      the source face (patch name) of every face, None if not requested
+    """
+    def __init__(self, vertices, faceOffsets, faceVertices, faceIds=None):
+        self.vertices = vertices
+        self.faceOffsets = faceOffsets
+        self.faceVertices = faceVertices
+        self.faceIds = faceIds
+
+    def __len__(self):
+        return len(self.faceOffsets) - 1
+
+    def getFace(self, faceIndex):
+        return self.faceVertices[self.faceOffsets[faceIndex]:self.faceOffsets[faceIndex + 1]]
+
+
+def modelToArrays(model: Model, withFaceIds=False):
+    """ The patches of a model as faces of a flat array mesh.
+
+    The boundary loops are the ones the model has precomputed, no patch
+    objects are created. Like Face.vertexIndices every face starts with the
+    vertex its last and first edge share.
+    """
+    impl = model.impl
+    if not np.all(impl.hasLoop):
+        patchIndex = int(np.argmin(impl.hasLoop))
+        raise Exception('Error the edges of patch ' + repr(impl.patches[patchIndex].name) + ' do not form a loop')
+    faceOffsets = impl.loopOffsets
+    # the loop vertex i is shared by edge i and i + 1, rotate each loop by one
+    shifted = np.arange(faceOffsets[-1]) - 1
+    shifted[faceOffsets[:-1]] = faceOffsets[1:] - 1
+    faceVertices = impl.loopVertices[shifted]
+    faceIds = np.array([patch.name for patch in impl.patches], dtype=np.int64) if withFaceIds else None
+    return MeshArrayOutput(impl.vertexArray, faceOffsets, faceVertices, faceIds)
@@ -1,10 +1,11 @@
-from unfolder.mesh.mesh_impl import FaceImpl, MeshImpl
+from unfolder.mesh.mesh_impl import EdgeImpl, FaceImpl, MeshImpl
 from unfolder.model.model import Model
 
 
 def modelToMesh(model: Model):
-    vertices = model.impl.vertices
-    edges = model.impl.edges
+    """ The patches of a model as faces of a mesh, see modelToArrays for exporting without mesh objects. """
+    vertices = [tuple(vertex) for vertex in model.impl.vertexArray.tolist()]
+    edges = [EdgeImpl(fst, snd) for fst, snd in model.impl.edgeVertices.tolist()]
     faces = []
     for patch in model.patches:
         faces.append(FaceImpl(patch.edges, None))
@@ -5,6 +5,7 @@ from unfolder.mesh.mesh import Mesh
 from unfolder.mesh.obj_exporter import ObjExporter
 from unfolder.mesh.obj_importer import ObjImporter
 from unfolder.model.tree_to_model.tree_to_model import treeToModel
+from unfolder.output.model_to_arrays import modelToArrays
 from unfolder.output.model_to_mesh import modelToMesh
 from unfolder.tree.knot import graphToTree
 
@@ -27,4 +28,22 @@ class ModelToMeshTester(TestCase):
     def test_patches(self):
         mesh = modelToMesh(self.model)
         writer = ObjExporter('tmp/junk.obj')
-        writer.write(Mesh(mesh))
\ No newline at end of file
+        writer.write(Mesh(mesh))
+
+    def test_arrays(self):
+        mesh = Mesh(modelToMesh(self.model))
+        output = modelToArrays(self.model, withFaceIds=True)
+        self.assertEqual(len(output), 3)
+        self.assertEqual([output.getFace(faceIndex).tolist() for faceIndex in range(len(output))],
+                         [face.vertexIndices for face in mesh.faces])
+        self.assertEqual(output.faceIds.tolist(), [patch.name for patch in self.model.patches])
+        self.assertEqual(output.vertices.tolist(), [list(vertex) for vertex in mesh.vertices])
+
+    def test_writeArrays(self):
+        ObjExporter('tmp/junk.obj').write(Mesh(modelToMesh(self.model)))
+        with open('tmp/junk.obj') as f:
+            expected = f.read()
+        output = modelToArrays(self.model)
+        ObjExporter('tmp/junk_arrays.obj').writeArrays(output.vertices, output.faceOffsets, output.faceVertices)
+        with open('tmp/junk_arrays.obj') as f:
+            self.assertEqual(f.read(), expected)
@@ -69,4 +69,4 @@ class AddFacesToStrip(State):
         setIter(faceIter, self._currentNode.face)
         connectedFaces = om.MIntArray()
         faceIter.getConnectedFaces(connectedFaces)
-        self._selectableFaces = frozenset(connectedFaces) - frozenset(self._facetree.getFaces())
+        self._selectableFaces = frozenset(face for face in connectedFaces if not self._facetree.hasFace(face))
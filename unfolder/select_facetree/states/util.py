@@ -44,8 +44,6 @@ def getSelectedFace(dagPath):
         return face
 
 def highlightFaces(dagPath, faces):
-    print('highlightling')
-    print(faces)
     faceComponents = om.MFnSingleIndexedComponent()
     faceComponents.create(om.MFn.kMeshPolygonComponent)
     for face in faces:
@@ -55,7 +53,6 @@ def highlightFaces(dagPath, faces):
     selection.add(dagPath, faceComponents.object())
     hilite = om.MSelectionList()
     hilite.add(dagPath)
-    print('setting selection')
     om.MGlobal.setSelectionMode(om.MGlobal.kSelectComponentMode)
     om.MGlobal.setComponentSelectionMask(om.MSelectionMask(om.MSelectionMask.kSelectMeshFaces))
     om.MGlobal.setActiveSelectionList(selection)
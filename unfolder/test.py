@@ -1,9 +1,12 @@
 import cProfile
 from unfolder.analyze_patch.model_score import calculateModelScore
+from unfolder.automatic_unfold.branch_and_bound import getOverlapFreeSpanningTrees
+from unfolder.automatic_unfold.component_scheduler import unfoldComponentsInParallel
 from unfolder.automatic_unfold.mesh_to_graph import meshToGraph
+from unfolder.automatic_unfold.parallel_unfold import scoreSpanningTreesInParallel
 from unfolder.mesh.face import FaceIter
 from unfolder.model.tree_to_model.tree_to_model import treeToModel
-from unfolder.output.model_to_mesh import modelToMesh
+from unfolder.output.model_to_arrays import modelToArrays
 from unfolder.tree.knot import graphToTree
 from unfolder.graph.graph_builder import GraphBuilder
 from unfolder.graph.spanning_trees import SpanningTreeIter, getSpanningTrees
@@ -35,8 +38,46 @@ def convert(filename):
             tree = graphToTree(spanningTree)
             model = treeToModel(tree, faces)
             #score = calculateModelScore(model)
-            output = modelToMesh(model)
+            output = modelToArrays(model)
 
 
-#convert('mesh/test/resources/box.obj')
-convert('mesh/test/resources/box.obj')
\ No newline at end of file
+def convertInParallel(filename):
+    mesh = ObjImporter().read(filename)
+    faces = FaceIter(mesh)
+    graph = meshToGraph(faces, GraphBuilder())
+
+    # unfold and score the spanning trees of every connected set of faces on
+    # all cores, only the tree ranks and scores are sent back
+    for connectedComponent in graph.getConnectedComponents():
+        bestRank, bestScore = max(scoreSpanningTreesInParallel(mesh, connectedComponent),
+                                  key=lambda result: result[1])
+        print('best spanning tree no %i' % bestRank)
+
+
+def convertWithoutOverlaps(filename):
+    mesh = ObjImporter().read(filename)
+    faces = FaceIter(mesh)
+    graph = meshToGraph(faces, GraphBuilder())
+
+    # only visit the spanning trees that unfold without overlapping faces,
+    # partial trees with overlaps are not completed at all
+    for connectedComponent in graph.getConnectedComponents():
+        for index, spanningTree in enumerate(getOverlapFreeSpanningTrees(connectedComponent, mesh)):
+            print('overlap free spanning tree no %i' % index)
+            model = treeToModel(graphToTree(spanningTree), faces)
+            output = modelToArrays(model)
+
+
+def convertComponentsInParallel(filenames):
+    meshes = [ObjImporter().read(filename) for filename in filenames]
+
+    # the connected sets of faces of all files are unfolded concurrently,
+    # largest first, and merged back in file and component order
+    for meshIndex, componentIndex, model in unfoldComponentsInParallel(meshes):
+        print('%s component no %i' % (filenames[meshIndex], componentIndex))
+        output = modelToArrays(model)
+
+
+if __name__ == '__main__':
+    #convert('mesh/test/resources/box.obj')
+    convert('mesh/test/resources/box.obj')
\ No newline at end of file
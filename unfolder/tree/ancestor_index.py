@@ -0,0 +1,155 @@
+import numpy as np
+
+from unfolder.mesh.mesh_arrays import MeshArrays
+from unfolder.tree.rooted_tree import RootedTree
+from unfolder.util import transform2d
+
+
+def getHingeTransforms(tree: RootedTree, meshArrays: MeshArrays):
+    """ The 2D transforms of every face of a face tree into the frame of its parent face.
+
+    The frame of a face is its hinge frame (see MeshArrays) for the edge it is
+    attached to its parent by, for the root face it is the frame of its first
+    face edge. These are the frames treeToModel unfolds the faces in, so the
+    composed transforms to the root place the faces as in the model.
+
+    Returns the hinge (begin, end) vertex arrays and the N x 2 x 3 transforms,
+    the transform of the root is the identity.
+    """
+    faces = np.asarray(tree.values, dtype=np.int64)
+    parents = tree.parents.tolist()
+    begins = np.empty(len(tree), dtype=np.int64)
+    ends = np.empty(len(tree), dtype=np.int64)
+    for node, parent in enumerate(parents):
+        if parent < 0:
+            (begins[node], ends[node]) = meshArrays.rootHinge(faces[node])
+        else:
+            (begins[node], ends[node]) = meshArrays.hinge(faces[parent], faces[node])
+
+    (origins, xAxes, yAxes) = meshArrays.hingeFrames(faces, begins, ends)
+    transforms = transform2d.identity((len(tree),))
+    children = tree.bfsOrder[1:]
+    childParents = tree.parents[children]
+    # the hinge of the child expressed in the frame of the parent
+    relativeBegins = meshArrays.vertices[begins[children]] - origins[childParents]
+    relativeEnds = meshArrays.vertices[ends[children]] - origins[childParents]
+    hingeOrigins = np.stack((np.einsum('ij,ij->i', relativeBegins, xAxes[childParents]),
+                             np.einsum('ij,ij->i', relativeBegins, yAxes[childParents])), axis=-1)
+    hingeEnds = np.stack((np.einsum('ij,ij->i', relativeEnds, xAxes[childParents]),
+                          np.einsum('ij,ij->i', relativeEnds, yAxes[childParents])), axis=-1)
+    directions = hingeEnds - hingeOrigins
+    directions /= np.linalg.norm(directions, axis=1)[:, np.newaxis]
+    transforms[children] = transform2d.rigidTransforms(hingeOrigins, directions)
+    return begins, ends, transforms
+
+
+class AncestorIndex:
+    """ Ancestor, path and relative transform queries on a rooted tree.
+
+    jumps[k][n] is the 2^k-th ancestor of node n (the root for jumps beyond
+    the root), jumpTransforms[k][n] maps the frame of n into the frame of
+    that ancestor. Both tables are built with O(n log n) vectorized steps,
+    every query composes O(log n) jumps.
+
+    The parent transforms map the frame of a node into the frame of its
+    parent (see getHingeTransforms), without them only the tree queries work.
+    """
+
+    def __init__(self, tree: RootedTree, parentTransforms=None):
+        self.tree = tree
+        self.depths = tree.depths
+        numNodes = len(tree)
+        parents = np.where(tree.parents < 0, np.arange(numNodes), tree.parents)
+        parentTransforms = transform2d.identity((numNodes,)) if parentTransforms is None \
+            else np.array(parentTransforms, dtype=float)
+        # jumps beyond the root stay at the root
+        parentTransforms[tree.rootIndex] = transform2d.identity()
+        numLevels = max(1, int(self.depths.max(initial=0)).bit_length())
+        self.jumps = [parents]
+        self.jumpTransforms = [parentTransforms]
+        for level in range(1, numLevels):
+            prevJumps = self.jumps[-1]
+            prevTransforms = self.jumpTransforms[-1]
+            self.jumps.append(prevJumps[prevJumps])
+            self.jumpTransforms.append(transform2d.compose(prevTransforms[prevJumps], prevTransforms))
+        self._toRoot = None
+
+    @property
+    def toRoot(self):
+        """ The transforms of all nodes into the frame of the root. """
+        if self._toRoot is None:
+            nodes = np.arange(len(self.tree))
+            (_, self._toRoot) = self._liftMany(nodes, self.depths)
+        return self._toRoot
+
+    def ancestor(self, node, distance):
+        """ The ancestor distance edges above node. """
+        if not 0 <= distance <= self.depths[node]:
+            raise ValueError('Error node ' + str(node) + ' has no ancestor ' + str(distance) + ' levels up')
+        return self._lift(node, distance)[0]
+
+    def lowestCommonAncestor(self, fst, snd):
+        return self._lowestCommonAncestor(fst, snd)[0]
+
+    def distance(self, fst, snd):
+        """ The number of tree edges between two nodes. """
+        lca = self.lowestCommonAncestor(fst, snd)
+        return int(self.depths[fst] + self.depths[snd] - 2 * self.depths[lca])
+
+    def path(self, fst, snd):
+        """ The nodes on the tree path from fst to snd, both included. """
+        lca = self.lowestCommonAncestor(fst, snd)
+        parents = self.tree.parents
+        up = [fst]
+        while up[-1] != lca:
+            up.append(int(parents[up[-1]]))
+        down = [snd]
+        while down[-1] != lca:
+            down.append(int(parents[down[-1]]))
+        return up + down[-2::-1]
+
+    def transform(self, fst, snd):
+        """ The transform mapping the frame of node fst into the frame of node snd. """
+        (_, fstTransform, sndTransform) = self._lowestCommonAncestor(fst, snd)
+        return transform2d.compose(transform2d.invert(sndTransform), fstTransform)
+
+    # private
+
+    def _lift(self, node, distance):
+        """ Jump distance levels up, returns the ancestor and the transform into its frame. """
+        transform = transform2d.identity()
+        level = 0
+        while distance:
+            if distance & 1:
+                transform = transform2d.compose(self.jumpTransforms[level][node], transform)
+                node = self.jumps[level][node]
+            distance >>= 1
+            level += 1
+        return int(node), transform
+
+    def _liftMany(self, nodes, distances):
+        transforms = transform2d.identity((len(nodes),))
+        distances = np.asarray(distances).copy()
+        for jumps, jumpTransforms in zip(self.jumps, self.jumpTransforms):
+            mask = (distances & 1).astype(bool)
+            transforms[mask] = transform2d.compose(jumpTransforms[nodes[mask]], transforms[mask])
+            nodes = np.where(mask, jumps[nodes], nodes)
+            distances >>= 1
+        return nodes, transforms
+
+    def _lowestCommonAncestor(self, fst, snd):
+        """ The lowest common ancestor and the transforms of fst and snd into its frame. """
+        (fstDepth, sndDepth) = (int(self.depths[fst]), int(self.depths[snd]))
+        (fst, fstTransform) = self._lift(fst, max(0, fstDepth - sndDepth))
+        (snd, sndTransform) = self._lift(snd, max(0, sndDepth - fstDepth))
+        if fst == snd:
+            return fst, fstTransform, sndTransform
+        for level in reversed(range(len(self.jumps))):
+            (fstJump, sndJump) = (self.jumps[level][fst], self.jumps[level][snd])
+            if fstJump != sndJump:
+                fstTransform = transform2d.compose(self.jumpTransforms[level][fst], fstTransform)
+                sndTransform = transform2d.compose(self.jumpTransforms[level][snd], sndTransform)
+                (fst, snd) = (fstJump, sndJump)
+        fstTransform = transform2d.compose(self.jumpTransforms[0][fst], fstTransform)
+        sndTransform = transform2d.compose(self.jumpTransforms[0][snd], sndTransform)
+        return int(self.jumps[0][fst]), fstTransform, sndTransform
@@ -0,0 +1,173 @@
+from itertools import chain
+
+import numpy as np
+
+from unfolder.graph.graph_impl import GraphImpl
+from unfolder.tree.tree import Tree
+
+
+def graphToRootedTree(graph: GraphImpl, root=0):
+    return RootedTree(graph, root)
+
+
+class RootedTree:
+    """ A spanning tree rooted at one of its nodes, stored in flat arrays.
+
+    values       the node values of the graph, e.g. face indices
+    parents      the parent of every node, -1 for the root
+    parentEdges  the index in graph.edges of the edge to the parent, -1 for the root
+    depths       the number of edges between every node and the root
+    childOffsets the children of node n are children[childOffsets[n]:childOffsets[n + 1]]
+    children     the children of all nodes, in the order of their edges in graph.edges
+    bfsOrder     the nodes level by level, parents come before their children
+    dfsOrder     the nodes in depth first pre order, as Knot.getNames visits them
+
+    All arrays are built once in linear time: a breadth first search expands
+    one level at a time with numpy and the depth first order follows from the
+    subtree sizes. Node indices are the indices of graph.nodes. The root knot
+    (see root) can be passed to treeToModel instead of a Knot.
+    """
+
+    def __init__(self, graph: GraphImpl, root=0):
+        self.values = graph.nodes
+        self.rootIndex = root
+        numNodes = len(graph.nodes)
+        if len(graph.edges) != numNodes - 1:
+            raise ValueError('Error ' + repr(graph) + ' is not a tree')
+
+        (adjacencyOffsets, neighbours, neighbourEdges) = self._buildAdjacency(graph)
+        levels = self._traverse(adjacencyOffsets, neighbours, neighbourEdges)
+        # with one edge less than nodes, a graph reaching all nodes has no cycles
+        if (self.depths < 0).any():
+            raise ValueError('Error ' + repr(graph) + ' is not connected')
+        self.bfsOrder = np.concatenate(levels)
+        self._orderChildren(levels)
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def root(self):
+        return RootedKnot(self, self.rootIndex)
+
+    def getChildren(self, node):
+        return self.children[self.childOffsets[node]:self.childOffsets[node + 1]]
+
+    def getNames(self):
+        """ The node values in depth first pre order. """
+        return [self.values[node] for node in self.dfsOrder.tolist()]
+
+    def toFacetree(self):
+        """ Convert into an interactive face tree (see Tree). """
+        parents = self.parents.tolist()
+        nodes = [None] * len(self)
+        nodes[self.rootIndex] = tree = Tree(self.values[self.rootIndex])
+        for node in self.bfsOrder[1:].tolist():
+            nodes[node] = nodes[parents[node]].addChild(self.values[node])
+        return tree
+
+    # private
+
+    def _buildAdjacency(self, graph):
+        numNodes = len(graph.nodes)
+        endpoints = np.fromiter(chain.from_iterable(edge.nodes for edge in graph.edges), dtype=np.int64,
+                                count=2 * len(graph.edges))
+        # every edge shows up at both of its nodes, a stable sort keeps the edge order
+        order = np.argsort(endpoints, kind='stable')
+        neighbours = endpoints[order ^ 1]
+        neighbourEdges = order >> 1
+        adjacencyOffsets = np.zeros(numNodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(endpoints, minlength=numNodes), out=adjacencyOffsets[1:])
+        return adjacencyOffsets, neighbours, neighbourEdges
+
+    def _traverse(self, adjacencyOffsets, neighbours, neighbourEdges):
+        """ Breadth first search from the root, sets parents, parent edges and depths.
+
+        All nodes of a level are expanded at once. Returns the levels, the
+        nodes of a level are grouped by parent and come in edge order. In a
+        graph with cycles nodes may show up more than once.
+        """
+        numNodes = len(self.values)
+        self.parents = np.full(numNodes, -1, dtype=np.int64)
+        self.parentEdges = np.full(numNodes, -1, dtype=np.int64)
+        self.depths = np.full(numNodes, -1, dtype=np.int64)
+        self.depths[self.rootIndex] = 0
+        levels = [np.array([self.rootIndex], dtype=np.int64)]
+        while True:
+            frontier = levels[-1]
+            begins = adjacencyOffsets[frontier]
+            counts = adjacencyOffsets[frontier + 1] - begins
+            ends = counts.cumsum()
+            # the adjacency ranges of the frontier nodes, one after another
+            indices = (begins - ends + counts).repeat(counts) + np.arange(ends[-1])
+            nodes = neighbours[indices]
+            isNew = self.depths[nodes] < 0
+            if not isNew.any():
+                return levels
+            (indices, nodes) = (indices[isNew], nodes[isNew])
+            self.parents[nodes] = frontier.repeat(counts)[isNew]
+            self.parentEdges[nodes] = neighbourEdges[indices]
+            self.depths[nodes] = len(levels)
+            levels.append(nodes)
+
+    def _orderChildren(self, levels):
+        """ Set the children and the depth first order from the subtree sizes of the levels. """
+        numNodes = len(self.values)
+        levelNodes = self.bfsOrder[1:]
+        levelParents = self.parents[levelNodes]
+        # the position of every node among its siblings, siblings are adjacent within a level
+        groupBegins = np.flatnonzero(np.diff(levelParents, prepend=-1))
+        groupSizes = np.diff(groupBegins, append=len(levelNodes))
+        siblingRanks = np.arange(len(levelNodes)) - np.repeat(groupBegins, groupSizes)
+
+        self.childOffsets = np.zeros(numNodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(levelParents, minlength=numNodes), out=self.childOffsets[1:])
+        self.children = np.empty(len(levelNodes), dtype=np.int64)
+        self.children[self.childOffsets[levelParents] + siblingRanks] = levelNodes
+
+        sizes = np.ones(numNodes, dtype=np.int64)
+        for level in reversed(levels[1:]):
+            np.add.at(sizes, self.parents[level], sizes[level])
+        # a node follows its parent and the subtrees of its earlier siblings
+        earlierSizes = np.cumsum(sizes[levelNodes])
+        earlierSizes -= np.repeat(earlierSizes[groupBegins] - sizes[levelNodes][groupBegins], groupSizes) \
+            + sizes[levelNodes]
+        preorder = np.zeros(numNodes, dtype=np.int64)
+        levelOffsets = np.cumsum([0] + [len(level) for level in levels[1:]])
+        for levelBegin, level in zip(levelOffsets, levels[1:]):
+            levelEnd = levelBegin + len(level)
+            preorder[level] = preorder[self.parents[level]] + 1 + earlierSizes[levelBegin:levelEnd]
+        self.dfsOrder = np.empty(numNodes, dtype=np.int64)
+        self.dfsOrder[preorder] = np.arange(numNodes)
+
+
+class RootedKnot:
+    """ A node of a rooted tree, iterates its children like a Knot. """
+
+    def __init__(self, tree: RootedTree, index):
+        self.tree = tree
+        self.index = index
+
+    def __iter__(self):
+        """ Iterate the children of the node. """
+        for child in self.tree.getChildren(self.index).tolist():
+            yield RootedKnot(self.tree, child)
+
+    @property
+    def value(self):
+        return self.tree.values[self.index]
+
+    @property
+    def parent(self):
+        parent = self.tree.parents[self.index]
+        return RootedKnot(self.tree, int(parent)) if parent >= 0 else None
+
+    def getNames(self):
+        """ The values of the subtree in depth first pre order. """
+        ret = []
+        stack = [self]
+        while stack:
+            knot = stack.pop()
+            ret.append(knot.value)
+            stack.extend(reversed(list(knot)))
+        return ret
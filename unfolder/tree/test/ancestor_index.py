@@ -0,0 +1,74 @@
+from unittest import TestCase
+
+import numpy as np
+
+from unfolder.automatic_unfold.mesh_to_graph import meshToGraph
+from unfolder.graph.graph_builder import GraphBuilder
+from unfolder.mesh.face import FaceIter
+from unfolder.mesh.mesh_arrays import MeshArrays
+from unfolder.mesh.obj_importer import ObjImporter
+from unfolder.model.tree_to_model.tree_to_model import treeToModel
+from unfolder.tree.ancestor_index import AncestorIndex, getHingeTransforms
+from unfolder.tree.rooted_tree import RootedTree
+from unfolder.tree.test.sample_trees import createSimpleTree
+from unfolder.util import transform2d
+
+
+class AncestorIndexTests(TestCase):
+    def setUp(self):
+        # the simple sample tree, see createSimpleTree
+        knot = createSimpleTree()
+        self.index = AncestorIndex(RootedTree(knot.node.graphImpl, knot.node.index))
+
+    def test_ancestor(self):
+        self.assertEqual(self.index.ancestor(1, 0), 1)
+        self.assertEqual(self.index.ancestor(1, 1), 4)
+        self.assertEqual(self.index.ancestor(1, 3), 5)
+        with self.assertRaises(ValueError):
+            self.index.ancestor(1, 4)
+
+    def test_lowestCommonAncestor(self):
+        self.assertEqual(self.index.lowestCommonAncestor(1, 2), 3)
+        self.assertEqual(self.index.lowestCommonAncestor(1, 6), 5)
+        self.assertEqual(self.index.lowestCommonAncestor(7, 0), 0)
+        self.assertEqual(self.index.lowestCommonAncestor(7, 7), 7)
+
+    def test_path(self):
+        self.assertEqual(self.index.path(1, 7), [1, 4, 3, 5, 0, 7])
+        self.assertEqual(self.index.path(0, 6), [0, 6])
+        self.assertEqual(self.index.path(2, 2), [2])
+        self.assertEqual(self.index.distance(1, 7), 5)
+
+
+class FaceTransformTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        mesh = ObjImporter().read('resources/torus.obj')
+        cls.faces = FaceIter(mesh)
+        graph = meshToGraph(cls.faces, GraphBuilder()).getConnectedComponents()[0]
+        cls.tree = RootedTree(graph.getSpanningTree().impl)
+        cls.meshArrays = MeshArrays(mesh)
+        (cls.begins, cls.ends, transforms) = getHingeTransforms(cls.tree, cls.meshArrays)
+        cls.index = AncestorIndex(cls.tree, transforms)
+
+    def _facePolygon(self, node):
+        face = self.tree.values[node]
+        frame = self.meshArrays.hingeFrame(face, self.begins[node], self.ends[node])
+        return self.meshArrays.facePolygon(face, frame)
+
+    def test_toRoot(self):
+        # the faces end up where treeToModel puts them
+        model = treeToModel(self.tree, self.faces)
+        vertices = model.impl.vertexArray[:, :2]
+        patchVertices = {patch.name: vertices[patch.vertices] for patch in model.patches}
+        for node, face in enumerate(self.tree.values):
+            polygon = transform2d.apply(self.index.toRoot[node], self._facePolygon(node))
+            expected = patchVertices[face]
+            for vertex in polygon:
+                self.assertAlmostEqual(np.min(np.linalg.norm(expected - vertex, axis=1)), 0., places=6)
+
+    def test_transform(self):
+        toRoot = self.index.toRoot
+        for fst, snd in ((3, 40), (17, 5), (0, 31), (22, 22)):
+            expected = transform2d.compose(transform2d.invert(toRoot[snd]), toRoot[fst])
+            np.testing.assert_allclose(self.index.transform(fst, snd), expected, atol=1e-9)
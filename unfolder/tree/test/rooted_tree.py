@@ -0,0 +1,65 @@
+from unittest import TestCase
+from unfolder.graph.graph_impl import GraphImpl, EdgeImpl
+from unfolder.tree.rooted_tree import RootedTree, graphToRootedTree
+from unfolder.tree.test.sample_trees import createSimpleTree
+
+
+class RootedTreeTests(TestCase):
+    def setUp(self):
+        # the simple sample tree, see createSimpleTree
+        knot = createSimpleTree()
+        self.knot = knot
+        self.tree = RootedTree(knot.node.graphImpl, knot.node.index)
+
+    def test_structure(self):
+        self._compare(self.knot, self.tree.root)
+        self.assertEqual(self.tree.getNames(), self.knot.getNames())
+        self.assertEqual(self.tree.root.getNames(), self.knot.getNames())
+
+    def test_arrays(self):
+        tree = self.tree
+        self.assertEqual(tree.parents.tolist(), [5, 4, 3, 5, 3, -1, 0, 0])
+        self.assertEqual(tree.depths.tolist(), [1, 3, 2, 1, 2, 0, 2, 2])
+        self.assertEqual(tree.parentEdges.tolist(), [1, 5, 4, 3, 2, -1, 6, 0])
+        self.assertEqual(tree.bfsOrder.tolist(), [5, 0, 3, 7, 6, 4, 2, 1])
+        self.assertEqual(tree.dfsOrder.tolist(), [5, 0, 7, 6, 3, 4, 1, 2])
+        self.assertEqual(tree.getChildren(3).tolist(), [4, 2])
+        self.assertEqual(tree.getChildren(1).tolist(), [])
+
+    def test_toFacetree(self):
+        facetree = self.tree.toFacetree()
+        self.assertEqual(facetree.face, 'f')
+        self.assertEqual(sorted(facetree.getFaces()), sorted(self.knot.getNames()))
+        self.assertEqual([child.face for child in facetree.children], ['a', 'd'])
+
+    def test_path(self):
+        # deep trees are not a problem for the recursion limit
+        numNodes = 5000
+        edges = [EdgeImpl(index - 1, index) for index in range(1, numNodes)]
+        tree = graphToRootedTree(GraphImpl(list(range(numNodes)), edges))
+        self.assertEqual(tree.root.getNames(), list(range(numNodes)))
+        self.assertEqual(tree.depths[-1], numNodes - 1)
+
+    def test_singleNode(self):
+        tree = RootedTree(GraphImpl(['a'], []))
+        self.assertEqual(tree.dfsOrder.tolist(), [0])
+        self.assertEqual(tree.bfsOrder.tolist(), [0])
+        self.assertEqual(tree.getChildren(0).tolist(), [])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            RootedTree(GraphImpl([0, 1, 2], [EdgeImpl(0, 1)]))
+        with self.assertRaises(ValueError):
+            RootedTree(GraphImpl([0, 1, 2, 3], [EdgeImpl(0, 1), EdgeImpl(1, 2), EdgeImpl(0, 2)]))
+        with self.assertRaises(ValueError):
+            # node 3 is reached twice on the same level
+            RootedTree(GraphImpl([0, 1, 2, 3, 4], [EdgeImpl(0, 1), EdgeImpl(0, 2), EdgeImpl(1, 3), EdgeImpl(2, 3)]))
+
+    def _compare(self, knot, rootedKnot):
+        self.assertEqual(rootedKnot.value, knot.value)
+        children = list(knot)
+        rootedChildren = list(rootedKnot)
+        self.assertEqual([child.value for child in rootedChildren], [child.value for child in children])
+        for child, rootedChild in zip(children, rootedChildren):
+            self.assertEqual(rootedChild.parent.value, knot.value)
+            self._compare(child, rootedChild)
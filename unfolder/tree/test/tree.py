@@ -0,0 +1,89 @@
+from unittest import TestCase
+from unfolder.tree.tree import Tree
+
+
+class TreeTests(TestCase):
+    def setUp(self):
+        """
+                 0
+               /   \
+              1     2
+             / \     \
+            3   4     5
+        """
+        self.tree = Tree(0)
+        self.nodes = {0: self.tree}
+        for parent, face in ((0, 1), (0, 2), (1, 3), (1, 4), (2, 5)):
+            self.nodes[face] = self.nodes[parent].addChild(face)
+
+    def test_findSubtree(self):
+        for face, node in self.nodes.items():
+            self.assertIs(self.tree.findSubtree(face), node)
+            self.assertIs(node.findSubtree(face), node)
+        self.assertIsNone(self.tree.findSubtree(6))
+        # only the subtree of a node is searched
+        self.assertIs(self.nodes[1].findSubtree(4), self.nodes[4])
+        self.assertIsNone(self.nodes[1].findSubtree(5))
+        self.assertIsNone(self.nodes[3].findSubtree(0))
+
+    def test_getFaces(self):
+        self.assertEqual(self.tree.getFaces(), [0, 1, 3, 4, 2, 5])
+        self.assertEqual(self.nodes[1].getFaces(), [1, 3, 4])
+        self.assertEqual(self.nodes[5].getFaces(), [5])
+        self.assertTrue(self.nodes[4].hasFace(5))
+        self.assertFalse(self.tree.hasFace(6))
+        # a snapshot, the tree can change while it is used
+        faces = self.tree.getFaces()
+        for face in faces:
+            self.nodes[5].addChild(face + 6)
+        self.assertEqual(len(self.tree.getFaces()), 12)
+
+    def test_iterFaces(self):
+        faces = self.tree.iterFaces()
+        self.assertEqual(next(faces), 0)
+        self.assertEqual(list(faces), [1, 3, 4, 2, 5])
+        self.assertEqual(list(self.nodes[2].iterFaces()), [2, 5])
+
+    def test_getRoot(self):
+        for node in self.nodes.values():
+            self.assertIs(node.getRoot(), self.tree)
+
+    def test_addChild(self):
+        child = self.nodes[5].addChild(6)
+        self.assertIs(child.parent, self.nodes[5])
+        self.assertIs(self.tree.findSubtree(6), child)
+        self.assertIs(child.getRoot(), self.tree)
+        with self.assertRaises(ValueError):
+            self.nodes[3].addChild(2)
+
+    def test_remove(self):
+        self.assertIs(self.nodes[1].remove(), self.tree)
+
+        self.assertEqual(sorted(self.tree.getFaces()), [0, 2, 5])
+        self.assertIsNone(self.tree.findSubtree(3))
+        self.assertEqual([child.face for child in self.tree.children], [2])
+
+        # the removed subtree is a tree of its own
+        removed = self.nodes[1]
+        self.assertIsNone(removed.parent)
+        self.assertIs(self.nodes[4].getRoot(), removed)
+        self.assertEqual(sorted(removed.getFaces()), [1, 3, 4])
+        self.assertIs(removed.findSubtree(4), self.nodes[4])
+        self.assertIsNone(self.nodes[3].findSubtree(4))
+        self.assertIsNone(removed.remove())
+
+        # removed faces can be added again
+        self.nodes[5].addChild(1)
+        self.assertEqual(sorted(self.tree.getFaces()), [0, 1, 2, 5])
+
+    def test_deepTree(self):
+        node = self.tree
+        for face in range(6, 5006):
+            node = node.addChild(face)
+        self.assertIs(node.getRoot(), self.tree)
+        self.assertTrue(self.tree.hasFace(5005))
+        self.assertIs(self.tree.findSubtree(6).findSubtree(5005), node)
+        self.assertIsNone(self.nodes[2].findSubtree(5005))
+        self.assertIsNone(node.findSubtree(6))
+        node.remove()
+        self.assertEqual(len(list(self.tree.getFaces())), 5005)
@@ -2,6 +2,11 @@ class Tree:
     """ Nodes of a face tree.
 
     A face tree structure, where each sibling face only shares one edge with its parent.
+
+    All nodes of a tree share one index of their faces, so checking whether
+    a face is part of the tree, finding the root and finding the node of a
+    face take constant time. Every face can only be in a tree once, adding
+    a face a second time raises a ValueError.
     """
     def __init__(self, face):
         """ Create a new face tree with a root face.
@@ -9,45 +14,109 @@ class Tree:
         self.face = face
         self.children = []
         self.parent = None
+        self._index = TreeIndex(self)
 
     def addChild(self, childFace):
         """ Create a child to this node and return it.
         """
+        if childFace in self._index.nodes:
+            raise ValueError('Error face ' + repr(childFace) + ' is already in the face tree')
         child = Tree(childFace)
         self.children.append(child)
         child.parent = self
+        child._index = self._index
+        self._index.nodes[childFace] = child
+        self._index.orderValid = False
         return child
 
     def remove(self):
         """ Remove this node from the tree and return its parent.
+
+        The removed subtree becomes a face tree of its own.
         """
         parent = self.parent
         if self.parent:
             parent.children.remove(self)
+            self.parent = None
+            parent._index.orderValid = False
+            index = TreeIndex(self)
+            for node in self._iterNodes():
+                del parent._index.nodes[node.face]
+                node._index = index
+                index.nodes[node.face] = node
             return parent
         return None
 
+    def iterFaces(self):
+        """ Iterate the faces in the subtree of this node in depth first pre order.
+        """
+        for node in self._iterNodes():
+            yield node.face
+
     def getFaces(self):
-        """ Return all faces in the face tree.
+        """ Return all faces in the subtree of this node in depth first pre order.
+        """
+        return list(self.iterFaces())
+
+    def hasFace(self, face):
+        """ Check whether a face is part of the face tree.
         """
-        faces = [self.face]
-        for child in self.children:
-            faces.extend(child.getFaces())
-        return faces
+        return face in self._index.nodes
 
     def getRoot(self):
-        if self.parent:
-            return self.parent.getRoot()
-        else:
-            return self
+        return self._index.root
 
     def findSubtree(self, value):
-        """ Find the node in the tree that matches a certain face.
+        """ Find the node in the subtree of this node that matches a certain face.
         """
-        if self.face == value:
-            return self
-        for child in self.children:
-            subtree = child.findSubtree(value)
-            if subtree:
-                return subtree
-        return None
+        node = self._index.nodes.get(value)
+        if node is None or not self._index.isAncestor(self, node):
+            return None
+        return node
+
+    # private
+
+    def _iterNodes(self):
+        """ Iterate the nodes of this subtree in depth first order. """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+
+# private
+
+
+class TreeIndex:
+    """ The root and the nodes by face of a face tree, shared by all of its nodes.
+
+    For ancestry checks every node is numbered in depth first pre order, the
+    subtree of a node are the numbers order[node] .. order[node] + sizes[node] - 1.
+    The numbering is redone on the first check after the tree changed.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.nodes = {root.face: root}
+        self.orderValid = False
+        self._order = {}
+        self._sizes = {}
+
+    def isAncestor(self, ancestor, node):
+        """ Check whether node is in the subtree of ancestor. """
+        if not self.orderValid:
+            self._number()
+        begin = self._order[ancestor.face]
+        return begin <= self._order[node.face] < begin + self._sizes[ancestor.face]
+
+    # private
+
+    def _number(self):
+        nodes = list(self.root._iterNodes())
+        self._order = {node.face: number for number, node in enumerate(nodes)}
+        # children come after their parents, so the sizes are summed up backwards
+        self._sizes = dict.fromkeys(self._order, 1)
+        for node in reversed(nodes):
+            if node.parent is not None:
+                self._sizes[node.parent.face] += self._sizes[node.face]
+        self.orderValid = True
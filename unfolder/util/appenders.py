@@ -1,56 +1,86 @@
-from unfolder.util.vector import Vector
+import math
+from itertools import product
+from operator import add
 
-
-class Appender:
-    def __init__(self):
-        self.store = []
-
-    def push(self, elem):
-        index = len(self.store)
-        self.store.append(elem)
-        return index
-
-
-class NewAppender:
-    def __init__(self):
-        self.store = []
-        self.indices = {}
-
-    def push(self, elem):
-        if elem in self.indices:
-            return self.indices[elem]
-        else:
-            index = len(self.store)
-            self.store.append(elem)
-            self.indices[elem] = index
-            return index
-
-    def __getitem__(self, item):
-        return self.store[item]
+import numpy as np
 
 
 class VertexAppender:
+    """ Append vertices, vertices closer than tolerance to a stored one are merged.
+
+    The stored vertices are hashed into a grid of cells twice the tolerance
+    wide. A vertex closer than tolerance to a stored vertex lies in the same
+    cell or in the neighboring cells towards the closer cell border, so a
+    push compares against the vertices of 2^d cells at most. Vertices equal
+    to a stored one are found without any comparison. If several stored
+    vertices are close enough, the one pushed first is returned, just like
+    with a linear scan.
+    """
     def __init__(self, tolerance = 10E-10):
         self.tolerance = tolerance
         self.store = []
+        self._indices = {}
+        self._cells = {}
 
     def push(self, vertex):
-        index = self._indexOf(vertex)
+        key = tuple(vertex)
+        if key in self._indices:
+            return self._indices[key]
+        scaled = [coord / (2 * self.tolerance) for coord in key]
+        cell = tuple(math.floor(coord) for coord in scaled)
+        index = self._indexOf(key, scaled, cell)
         if index is not None:
             return index
         else:
             index = len(self.store)
             self.store.append(vertex)
+            self._indices[key] = index
+            self._cells.setdefault(cell, []).append(index)
             return index
 
     def __getitem__(self, item):
         return self.store[item]
 
-    def _indexOf(self, vertex):
-        for index, val in enumerate(self.store):
-            if (Vector(val) - vertex).norm() < self.tolerance:
-                return index
-        return None
+    def _indexOf(self, vertex, scaled, cell):
+        # the cells on the closer side of the cell border in every dimension
+        sides = [(0, -1) if coord - base < .5 else (0, 1) for coord, base in zip(scaled, cell)]
+        retval = None
+        for offset in product(*sides):
+            for index in self._cells.get(tuple(map(add, cell, offset)), ()):
+                if (retval is None or index < retval) and math.dist(self.store[index], vertex) < self.tolerance:
+                    retval = index
+        return retval
+
+
+def mergeVertices(vertices, tolerance=10E-10):
+    """ Push the rows of an N x D array into an empty VertexAppender at once.
+
+    Returns the stored vertices and the index push returns for every row.
+    Equal rows are merged with numpy and close pairs are found by hashing
+    the grid cells, only the rows that have a close partner are resolved
+    one by one in push order.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    (keys, firstRows, inverse) = np.unique(vertices, axis=0, return_index=True, return_inverse=True)
+    # the distinct rows in push order
+    order = np.argsort(firstRows, kind='stable')
+    keys = keys[order]
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+
+    (fst, snd) = _closePairs(keys, tolerance)
+    merged = np.arange(len(keys))
+    stored = np.ones(len(keys), dtype=bool)
+    # a row is merged into the first stored row close to it
+    pairOffsets = np.searchsorted(snd, np.arange(len(keys) + 1))
+    for row in np.unique(snd).tolist():
+        for candidate in fst[pairOffsets[row]:pairOffsets[row + 1]].tolist():
+            if stored[candidate]:
+                merged[row] = candidate
+                stored[row] = False
+                break
+    storeIndices = np.cumsum(stored) - 1
+    return keys[stored], storeIndices[merged][rank[inverse.reshape(-1)]]
 
 
 class MappingAppender():
@@ -94,14 +124,35 @@ class BucketFiller:
             return index
 
 
-class StackBuckets:
-    def __init__(self):
-        self.store = {}
-
-    def push(self, key, item):
-        if key in self.store:
-            self.store[key].append(item)
-        else:
-            self.store[key] = [item]
-
-
+# private
+
+
+def _closePairs(keys, tolerance):
+    """ All pairs of rows closer than tolerance, the earlier row first, sorted by the later row. """
+    cells = np.floor(keys / (2 * tolerance)).astype(np.int64)
+    cellHashes = _hashCells(cells)
+    order = np.argsort(cellHashes, kind='stable')
+    sortedHashes = cellHashes[order]
+    (fst, snd) = ([], [])
+    # a close row lies in the same cell or in a neighboring one
+    for offset in product((-1, 0, 1), repeat=keys.shape[1]):
+        neighbourHashes = _hashCells(cells + offset)
+        begins = np.searchsorted(sortedHashes, neighbourHashes, side='left')
+        ends = np.searchsorted(sortedHashes, neighbourHashes, side='right')
+        counts = ends - begins
+        rows = np.repeat(np.arange(len(keys)), counts)
+        candidates = order[np.repeat(begins - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())]
+        # hash collisions and far rows are dropped by the distance test
+        close = (candidates < rows) & (np.linalg.norm(keys[rows] - keys[candidates], axis=-1) < tolerance)
+        fst.append(candidates[close])
+        snd.append(rows[close])
+    (fst, snd) = (np.concatenate(fst), np.concatenate(snd))
+    order = np.lexsort((fst, snd))
+    return fst[order], snd[order]
+
+
+def _hashCells(cells):
+    hashes = np.zeros(len(cells), dtype=np.uint64)
+    for column in cells.T:
+        hashes = (hashes ^ column.astype(np.uint64)) * np.uint64(0x100000001B3)
+    return hashes
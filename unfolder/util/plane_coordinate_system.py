@@ -1,3 +1,6 @@
+import numpy as np
+
+from unfolder.util.transform2d import Affine2D
 from unfolder.util.vector import Vector
 
 
@@ -6,21 +9,41 @@ class PlaneCoordinateSystem:
 
     origin   the origin of the coordinate system realtive to global space
     e1, e2   orthogonal unit vectors
+    basis    the 3 x 2 matrix with columns e1 and e2
+
+    The ...Many methods map N x 3 or N x 2 arrays of points with a single
+    matrix multiplication.
     """
     def __init__(self, origin, e1, e2):
         self.origin = Vector(origin)
         self.e1 = Vector(e1)
         self.e2 = Vector(e2)
+        self._basis = None
+
+    @property
+    def basis(self):
+        if self._basis is None:
+            self._basis = np.array((tuple(self.e1), tuple(self.e2)), dtype=float).T
+        return self._basis
 
     def toLocal(self, vg):
         vLocalOrigin = Vector(vg) - self.origin
         return self.e1 * vLocalOrigin, self.e2 * vLocalOrigin
 
     def toGlobal(self, vl):
-        fst = self.e1
-        fst *= vl[0]
-        snd = self.e2
-        snd *= vl[1]
-        trd = self.origin
-        vLocalOrigin = fst + snd
-        return vLocalOrigin + trd
\ No newline at end of file
+        vLocalOrigin = self.e1 * vl[0] + self.e2 * vl[1]
+        return vLocalOrigin + self.origin
+
+    def toLocalMany(self, points):
+        """ Map N x 3 global points to N x 2 local coordinates. """
+        return (np.asarray(points, dtype=float) - tuple(self.origin)) @ self.basis
+
+    def toGlobalMany(self, points):
+        """ Map N x 2 local coordinates to N x 3 global points. """
+        return np.asarray(points, dtype=float) @ self.basis.T + tuple(self.origin)
+
+    def transformTo(self, other):
+        """ The transform of local coordinates into the local coordinates of a coordinate system in the same plane. """
+        linear = other.basis.T @ self.basis
+        offset = other.basis.T @ (np.array(tuple(self.origin), dtype=float) - tuple(other.origin))
+        return Affine2D(np.column_stack((linear, offset)))
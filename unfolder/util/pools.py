@@ -0,0 +1,190 @@
+import numpy as np
+
+
+class GrowableArray:
+    """ A numpy array with amortized constant time appends.
+
+    The capacity doubles whenever it runs out, array is a view of the filled
+    part and becomes stale when the array grows. Single values and rows are
+    written through a memoryview, which is a lot cheaper than numpy indexing.
+    """
+    def __init__(self, dtype, shape=(), capacity=16):
+        self._width = int(np.prod(shape, dtype=np.int64)) if shape else 0
+        self._setData(np.empty((max(capacity, 1),) + tuple(shape), dtype=dtype))
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, item):
+        return self.array[item]
+
+    @property
+    def array(self):
+        return self._data[:self._size]
+
+    def append(self, value):
+        index = self._size
+        if index == len(self._data):
+            self._reserve(index + 1)
+        if self._width:
+            base = index * self._width
+            for offset, item in enumerate(value):
+                self._flat[base + offset] = item
+        else:
+            self._flat[index] = value
+        self._size += 1
+        return index
+
+    def extend(self, values):
+        """ Append all values, returns the index of the first one. """
+        values = np.asarray(values, dtype=self._data.dtype)
+        index = self._size
+        self._reserve(index + len(values))
+        self._data[index:index + len(values)] = values
+        self._size += len(values)
+        return index
+
+    # private
+
+    def _setData(self, data):
+        self._data = data
+        self._flat = memoryview(data.reshape(-1))
+
+    def _reserve(self, size):
+        if size > len(self._data):
+            capacity = max(size, 2 * len(self._data))
+            data = np.empty((capacity,) + self._data.shape[1:], dtype=self._data.dtype)
+            data[:self._size] = self._data[:self._size]
+            self._setData(data)
+
+
+class EdgePool:
+    """ Interned undirected edges between vertex (or node) indices.
+
+    An edge is stored once as a row of the E x 2 array vertices, the smaller
+    index first. The index of the edges is an open addressing hash table
+    with linear probing over the edges packed into int64 keys (smaller index
+    in the high 32 bits, so indices are limited to 31 bits), it is kept at
+    most half full. Pushing or looking up an edge thus costs no Python
+    objects and no dict entries.
+    """
+    def __init__(self, capacity=16):
+        self._vertices = GrowableArray(np.int64, (2,), capacity)
+        self._initTable(2 * capacity)
+
+    def __len__(self):
+        return len(self._vertices)
+
+    @property
+    def vertices(self):
+        return self._vertices.array
+
+    def getVertices(self, index):
+        (fst, snd) = self._vertices.array[index].tolist()
+        return fst, snd
+
+    def push(self, fstIndex, sndIndex):
+        """ The index of the edge, it is added if it is new. """
+        key = _packEdge(fstIndex, sndIndex)
+        slot = self._findSlot(key)
+        index = self._slotIndexView[slot]
+        if index >= 0:
+            return index
+        index = self._vertices.append((key >> 32, key & 0xFFFFFFFF))
+        self._slotKeyView[slot] = key
+        self._slotIndexView[slot] = index
+        if 2 * len(self) > len(self._slotKeys):
+            self._rehash()
+        return index
+
+    def indexOf(self, fstIndex, sndIndex):
+        """ The index of the edge, None if it is not in the pool. """
+        index = self._slotIndexView[self._findSlot(_packEdge(fstIndex, sndIndex))]
+        return index if index >= 0 else None
+
+    def __contains__(self, edge):
+        return self.indexOf(*edge) is not None
+
+    # private
+
+    def _initTable(self, size):
+        # a power of two, so slots are the high bits of a multiplicative hash
+        self._bits = max(4, (size - 1).bit_length())
+        self._slotKeys = np.full(1 << self._bits, -1, dtype=np.int64)
+        self._slotIndices = np.full(1 << self._bits, -1, dtype=np.int64)
+        # element access through memoryviews returns plain ints
+        self._slotKeyView = memoryview(self._slotKeys)
+        self._slotIndexView = memoryview(self._slotIndices)
+
+    def _findSlot(self, key):
+        """ The slot of key or the empty slot it would go to. """
+        mask = len(self._slotKeys) - 1
+        slot = ((key * _HASH_MULTIPLIER) & _UINT64_MASK) >> (64 - self._bits)
+        slotKeys = self._slotKeyView
+        while True:
+            slotKey = slotKeys[slot]
+            if slotKey == key or slotKey < 0:
+                return slot
+            slot = (slot + 1) & mask
+
+    def _rehash(self):
+        vertices = self.vertices
+        self._initTable(4 * len(vertices))
+        keys = (vertices[:, 0] << 32) | vertices[:, 1]
+        for index, key in enumerate(keys.tolist()):
+            slot = self._findSlot(key)
+            self._slotKeyView[slot] = key
+            self._slotIndexView[slot] = index
+
+
+class ListPool:
+    """ Append only lists of indices stored in CSR form.
+
+    The items of list i are items[offsets[i]:offsets[i + 1]], a list is read
+    as a view of the items array.
+    """
+    def __init__(self, capacity=16):
+        self._offsets = GrowableArray(np.int64, (), capacity + 1)
+        self._offsets.append(0)
+        self._items = GrowableArray(np.int64, (), 4 * capacity)
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        offsets = self._offsets.array
+        return self._items.array[offsets[index]:offsets[index + 1]]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def offsets(self):
+        return self._offsets.array
+
+    @property
+    def items(self):
+        return self._items.array
+
+    def push(self, items):
+        """ Append a list, returns its index. """
+        self._items.extend(items)
+        return self._offsets.append(len(self._items)) - 1
+
+
+# private
+
+
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_UINT64_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def _packEdge(fstIndex, sndIndex):
+    (fstIndex, sndIndex) = (int(fstIndex), int(sndIndex))
+    if fstIndex > sndIndex:
+        (fstIndex, sndIndex) = (sndIndex, fstIndex)
+    if fstIndex < 0 or sndIndex >= 1 << 31:
+        raise ValueError('Error edge indices ' + repr((fstIndex, sndIndex)) + ' do not fit into 31 bits')
+    return (fstIndex << 32) | sndIndex
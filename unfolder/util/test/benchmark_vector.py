@@ -0,0 +1,40 @@
+""" Per operation cost of the small and the numpy backed vectors.
+
+Run from this directory: python benchmark_vector.py
+"""
+from timeit import Timer
+
+from unfolder.util.vector import ArrayVector, SmallVector
+
+
+OPERATIONS = [
+    ('create', lambda cls, fst, snd: lambda: cls(1., 2., 3.)),
+    ('add', lambda cls, fst, snd: lambda: fst + snd),
+    ('sub', lambda cls, fst, snd: lambda: fst - snd),
+    ('dot', lambda cls, fst, snd: lambda: fst * snd),
+    ('scale', lambda cls, fst, snd: lambda: fst * 2.5),
+    ('div', lambda cls, fst, snd: lambda: fst / 2.5),
+    ('cross', lambda cls, fst, snd: lambda: fst ^ snd),
+    ('norm', lambda cls, fst, snd: lambda: fst.norm()),
+    ('normalized', lambda cls, fst, snd: lambda: fst.normalized()),
+    ('eq', lambda cls, fst, snd: lambda: fst == snd),
+]
+
+
+def measure(cls, operation, number):
+    """ The cost of one operation in microseconds. """
+    (fst, snd) = (cls(1., 2., 3.), cls(-4., .5, 7.))
+    timer = Timer(operation(cls, fst, snd))
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e6
+
+
+def benchmark(number=20000):
+    print('%-12s %12s %12s %8s' % ('operation', 'ArrayVector', 'SmallVector', 'speedup'))
+    for name, operation in OPERATIONS:
+        arrayCost = measure(ArrayVector, operation, number)
+        smallCost = measure(SmallVector, operation, number)
+        print('%-12s %10.3fus %10.3fus %7.1fx' % (name, arrayCost, smallCost, arrayCost / smallCost))
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,69 @@
+import random
+from unittest import TestCase
+
+import numpy as np
+import numpy.linalg as lg
+
+from unfolder.util.appenders import VertexAppender, mergeVertices
+
+
+def linearIndexOf(store, vertex, tolerance):
+    for index, val in enumerate(store):
+        if lg.norm([a - b for a, b in zip(val, vertex)]) < tolerance:
+            return index
+    return None
+
+
+class TestVertexAppender(TestCase):
+    def test_push(self):
+        appender = VertexAppender()
+        self.assertEqual(appender.push((1., 2., 3.)), 0)
+        self.assertEqual(appender.push((1., 2., 3.5)), 1)
+        self.assertEqual(appender.push((1., 2., 3. + 1e-12)), 0)
+        self.assertEqual(appender.push((1., 2., 3. - 1e-12)), 0)
+        self.assertEqual(appender.store, [(1., 2., 3.), (1., 2., 3.5)])
+        self.assertEqual(appender[1], (1., 2., 3.5))
+
+    def test_tolerance(self):
+        appender = VertexAppender(.1)
+        appender.push((0., 0.))
+        self.assertEqual(appender.push((.06, .06)), 0)
+        self.assertEqual(appender.push((.08, .08)), 1)
+        self.assertEqual(appender.push((-.09, 0.)), 0)
+        self.assertEqual(appender.push((.1, 0.)), 1)
+        self.assertEqual(appender.push((.2, 0.)), 2)
+
+    def test_sameAsLinearScan(self):
+        # clusters of close vertices, the first vertex of a cluster wins
+        random.seed(7)
+        tolerance = .05
+        appender = VertexAppender(tolerance)
+        store = []
+        for _ in range(1000):
+            vertex = tuple(random.randrange(10) * .07 + random.uniform(-.04, .04) for _ in range(3))
+            expected = linearIndexOf(store, vertex, tolerance)
+            if expected is None:
+                expected = len(store)
+                store.append(vertex)
+            self.assertEqual(appender.push(vertex), expected)
+        self.assertEqual(appender.store, store)
+
+
+class TestMergeVertices(TestCase):
+    def test_sameAsVertexAppender(self):
+        random.seed(11)
+        tolerance = .05
+        vertices = [tuple(random.randrange(10) * .07 + random.uniform(-.04, .04) for _ in range(3))
+                    for _ in range(1000)]
+        vertices += vertices[:100]
+        appender = VertexAppender(tolerance)
+        indices = [appender.push(vertex) for vertex in vertices]
+        (store, mergedIndices) = mergeVertices(vertices, tolerance)
+        self.assertEqual(mergedIndices.tolist(), indices)
+        self.assertEqual(store.tolist(), [list(vertex) for vertex in appender.store])
+
+    def test_empty(self):
+        (store, indices) = mergeVertices(np.zeros((0, 2)))
+        self.assertEqual(store.shape, (0, 2))
+        self.assertEqual(len(indices), 0)
+
@@ -0,0 +1,38 @@
+from unittest import TestCase
+
+import numpy as np
+
+from unfolder.util.plane_coordinate_system import PlaneCoordinateSystem
+
+
+class TestPlaneCoordinateSystem(TestCase):
+    def setUp(self):
+        # a plane tilted around the x axis
+        (c, s) = (np.cos(.3), np.sin(.3))
+        self.system = PlaneCoordinateSystem((1., 2., 3.), (1., 0., 0.), (0., c, s))
+        self.otherSystem = PlaneCoordinateSystem((4., 2. + c, 3. + s), (0., c, s), (-1., 0., 0.))
+        rand = np.random.RandomState(5)
+        self.localPoints = rand.uniform(-10, 10, (50, 2))
+
+    def test_toLocal(self):
+        globalPoints = self.system.toGlobalMany(self.localPoints)
+        self.assertEqual(globalPoints.shape, (50, 3))
+        for localPoint, globalPoint in zip(self.localPoints, globalPoints):
+            np.testing.assert_allclose(tuple(self.system.toGlobal(localPoint)), globalPoint)
+            np.testing.assert_allclose(self.system.toLocal(globalPoint), localPoint)
+        np.testing.assert_allclose(self.system.toLocalMany(globalPoints), self.localPoints)
+
+    def test_toGlobal(self):
+        # e1 and e2 are not changed by mapping points
+        self.system.toGlobal((2., 3.))
+        self.assertEqual(self.system.e1, (1., 0., 0.))
+        np.testing.assert_allclose(tuple(self.system.toGlobal((2., 3.))),
+                                   (3., 2. + 3 * np.cos(.3), 3. + 3 * np.sin(.3)))
+
+    def test_transformTo(self):
+        transform = self.system.transformTo(self.otherSystem)
+        globalPoints = self.system.toGlobalMany(self.localPoints)
+        np.testing.assert_allclose(transform.apply(self.localPoints), self.otherSystem.toLocalMany(globalPoints),
+                                   atol=1e-12)
+        roundTrip = self.otherSystem.transformTo(self.system) @ transform
+        np.testing.assert_allclose(roundTrip.apply(self.localPoints), self.localPoints, atol=1e-12)
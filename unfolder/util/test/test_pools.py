@@ -0,0 +1,57 @@
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from unfolder.util.pools import EdgePool, GrowableArray, ListPool
+
+
+class TestGrowableArray(TestCase):
+    def test_append(self):
+        array = GrowableArray(np.int64, (2,), capacity=1)
+        for index in range(100):
+            self.assertEqual(array.append((index, -index)), index)
+        self.assertEqual(len(array), 100)
+        self.assertEqual(array[57].tolist(), [57, -57])
+        self.assertEqual(array.extend([(1, 2), (3, 4)]), 100)
+        self.assertEqual(array.array[-1].tolist(), [3, 4])
+
+
+class TestEdgePool(TestCase):
+    def test_push(self):
+        pool = EdgePool()
+        self.assertEqual(pool.push(3, 1), 0)
+        self.assertEqual(pool.push(1, 2), 1)
+        self.assertEqual(pool.push(1, 3), 0)
+        self.assertEqual(pool.getVertices(0), (1, 3))
+        self.assertEqual(pool.indexOf(2, 1), 1)
+        self.assertIsNone(pool.indexOf(2, 3))
+        self.assertIn((3, 1), pool)
+        with self.assertRaises(ValueError):
+            pool.push(-1, 2)
+
+    def test_sameAsDict(self):
+        rand = random.Random(11)
+        pool = EdgePool(capacity=1)
+        indices = {}
+        for _ in range(5000):
+            (fst, snd) = (rand.randrange(200), rand.randrange(200))
+            key = (min(fst, snd), max(fst, snd))
+            expected = indices.setdefault(key, len(indices))
+            self.assertEqual(pool.push(fst, snd), expected)
+        self.assertEqual(len(pool), len(indices))
+        self.assertEqual([tuple(edge) for edge in pool.vertices.tolist()], list(indices))
+
+
+class TestListPool(TestCase):
+    def test_push(self):
+        pool = ListPool(capacity=1)
+        self.assertEqual(pool.push([1, 2, 3]), 0)
+        self.assertEqual(pool.push([]), 1)
+        self.assertEqual(pool.push(range(50)), 2)
+        self.assertEqual(pool[0].tolist(), [1, 2, 3])
+        self.assertEqual(pool[1].tolist(), [])
+        self.assertEqual(pool[2].tolist(), list(range(50)))
+        self.assertEqual(pool.offsets.tolist(), [0, 3, 3, 53])
+        self.assertEqual(len(list(pool)), 3)
+
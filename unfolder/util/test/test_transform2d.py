@@ -0,0 +1,33 @@
+from unittest import TestCase
+
+import numpy as np
+
+from unfolder.util import transform2d
+
+
+class TestTransform2d(TestCase):
+    def test_rigidTransforms(self):
+        transform = transform2d.rigidTransforms((1., 2.), (0., 1.))
+        np.testing.assert_allclose(transform2d.apply(transform, [(0., 0.), (1., 0.), (0., 1.)]),
+                                   [(1., 2.), (1., 3.), (0., 2.)])
+
+    def test_compose(self):
+        fst = transform2d.rigidTransforms((1., 2.), (0., 1.))
+        snd = transform2d.rigidTransforms((-3., 1.), (np.sqrt(.5), np.sqrt(.5)))
+        points = np.array([(0., 0.), (2., -1.), (.5, 4.)])
+        np.testing.assert_allclose(transform2d.apply(transform2d.compose(fst, snd), points),
+                                   transform2d.apply(fst, transform2d.apply(snd, points)))
+
+    def test_invert(self):
+        transforms = transform2d.rigidTransforms([(1., 2.), (0., -1.)], [(0., 1.), (.6, .8)])
+        np.testing.assert_allclose(transform2d.compose(transform2d.invert(transforms), transforms),
+                                   transform2d.identity((2,)), atol=1e-12)
+
+    def test_affine2D(self):
+        fst = transform2d.Affine2D.rigid((1., 2.), (0., 1.))
+        snd = transform2d.Affine2D.translation((-3., 1.))
+        points = np.array([(0., 0.), (2., -1.), (.5, 4.)])
+        np.testing.assert_allclose((fst @ snd).apply(points), fst.apply(snd.apply(points)))
+        np.testing.assert_allclose((fst.inverse() @ fst).matrix, transform2d.identity(), atol=1e-12)
+        np.testing.assert_allclose(fst.apply((1., 0.)), (1., 3.))
+        self.assertEqual(transform2d.Affine2D(), transform2d.Affine2D.translation((0., 0.)))
@@ -0,0 +1,46 @@
+import bisect
+import random
+from unittest import TestCase
+
+from unfolder.util.treap import Treap
+
+
+def depth(node):
+    return 0 if node is None else 1 + max(depth(node.left), depth(node.right))
+
+
+class TestTreap(TestCase):
+    def test_sameAsSortedList(self):
+        rand = random.Random(5)
+        treap = Treap(seed=5)
+        nodes = {}
+        items = []
+        for _ in range(3000):
+            if items and rand.random() < .4:
+                item = items.pop(rand.randrange(len(items)))
+                treap.remove(nodes.pop(item))
+            else:
+                item = rand.random()
+                nodes[item] = treap.insert(item, lambda other: item < other)
+                bisect.insort(items, item)
+        self.assertEqual(len(treap), len(items))
+        self.assertEqual(list(treap), items)
+        self.assertLess(depth(treap._root), 40)
+        for (index, item) in enumerate(items):
+            predecessor = treap.predecessor(nodes[item])
+            successor = treap.successor(nodes[item])
+            self.assertEqual(predecessor.item if predecessor else None, items[index - 1] if index else None)
+            self.assertEqual(successor.item if successor else None,
+                             items[index + 1] if index + 1 < len(items) else None)
+
+    def test_swap(self):
+        treap = Treap(seed=1)
+        nodes = [treap.insert(item, lambda other, item=item: item < other) for item in [3, 1, 2]]
+        treap.swap(nodes[0], nodes[1])
+        self.assertEqual(list(treap), [3, 2, 1])
+        # the order is fixed, a new item is placed by comparing with the items it passes
+        treap.insert(0, lambda other: other == 1)
+        self.assertEqual(list(treap), [3, 2, 0, 1])
+        treap.remove(nodes[2])
+        self.assertEqual(list(treap), [3, 0, 1])
+        self.assertIs(treap.successor(treap.first()), treap.predecessor(nodes[0]))
@@ -0,0 +1,36 @@
+from unittest import TestCase
+
+import numpy as np
+
+from unfolder.util.uniform_grid import boxPairs
+
+
+def bruteForcePairs(boxes, otherBoxes):
+    return [[fst, snd] for fst in range(len(boxes)) for snd in range(len(otherBoxes))
+            if np.all(boxes[fst, 0] <= otherBoxes[snd, 1]) and np.all(otherBoxes[snd, 0] <= boxes[fst, 1])]
+
+
+class TestBoxPairs(TestCase):
+    def setUp(self):
+        random = np.random.default_rng(7)
+        corners = random.uniform(-10., 10., (60, 2))
+        self.boxes = np.stack((corners, corners + random.uniform(0., 3., (60, 2))), axis=1)
+
+    def test_boxPairs(self):
+        expected = [[fst, snd] for fst, snd in bruteForcePairs(self.boxes, self.boxes) if fst < snd]
+        self.assertEqual(boxPairs(self.boxes).tolist(), expected)
+        # the cell size does not change the pairs
+        self.assertEqual(boxPairs(self.boxes, cellSize=.1).tolist(), expected)
+        self.assertEqual(boxPairs(self.boxes, cellSize=100.).tolist(), expected)
+
+    def test_otherBoxes(self):
+        (fst, snd) = (self.boxes[:25], self.boxes[25:])
+        self.assertEqual(boxPairs(fst, snd).tolist(), bruteForcePairs(fst, snd))
+
+    def test_touching(self):
+        boxes = [[[0., 0.], [1., 1.]], [[1., 0.], [2., 1.]], [[3., 3.], [3., 3.]]]
+        self.assertEqual(boxPairs(boxes).tolist(), [[0, 1]])
+
+    def test_empty(self):
+        self.assertEqual(boxPairs(np.empty((0, 2, 2))).shape, (0, 2))
+        self.assertEqual(boxPairs(self.boxes, np.empty((0, 2, 2))).shape, (0, 2))
@@ -1,7 +1,10 @@
-from copy import copy
+import pickle
+import random
+from copy import copy, deepcopy
 from unittest import TestCase
-from unfolder.util.vector import Vector
+from unfolder.util.vector import ArrayVector, DimensionError, SmallVector, Vector
 
+import numpy as np
 import numpy.linalg as lg
 
 
@@ -180,3 +183,49 @@ class TestVector(TestCase):
 
         v4 = Vector(1, 2, 3, 4)
         self.assertEqual(len(v4), 4)
+
+
+class TestSmallVector(TestCase):
+    def test_dispatch(self):
+        self.assertIsInstance(Vector(1, 2), SmallVector)
+        self.assertIsInstance(Vector((1., 2., 3.)), SmallVector)
+        self.assertIsInstance(Vector(np.array([1., 2., 3.])), SmallVector)
+        self.assertIsInstance(Vector(1, 2, 3, 4), ArrayVector)
+        self.assertIsInstance(Vector(1), ArrayVector)
+        self.assertIsInstance(ArrayVector(1, 2, 3), ArrayVector)
+        self.assertIsInstance(Vector(1, 2) + ArrayVector(1, 2), SmallVector)
+        self.assertIsInstance(ArrayVector(1, 2) + Vector(1, 2), SmallVector)
+
+    def test_sameAsArrayVector(self):
+        rand = random.Random(3)
+        for dim in (2, 3):
+            for _ in range(100):
+                (fst, snd) = ([rand.uniform(-10, 10) for _ in range(dim)] for _ in range(2))
+                scalar = rand.uniform(.5, 2)
+                (smallFst, smallSnd) = (Vector(fst), Vector(snd))
+                (arrayFst, arraySnd) = (ArrayVector(fst), ArrayVector(snd))
+                self.assertEqual(smallFst + smallSnd, arrayFst + arraySnd)
+                self.assertEqual(smallFst - snd, arrayFst - snd)
+                self.assertAlmostEqual(smallFst * smallSnd, arrayFst * arraySnd, places=12)
+                self.assertEqual(smallFst * scalar, arrayFst * scalar)
+                self.assertEqual(smallFst / scalar, arrayFst / scalar)
+                self.assertAlmostEqual(smallFst.norm(), arrayFst.norm(), places=12)
+                np.testing.assert_allclose(tuple(smallFst.normalized()), tuple(arrayFst.normalized()), atol=1e-15)
+                np.testing.assert_allclose((smallFst ^ smallSnd).v, (arrayFst ^ arraySnd).v, atol=1e-12)
+
+    def test_types(self):
+        v = Vector(np.array([1., 2., 3.]))
+        self.assertIs(type(v[0]), float)
+        self.assertIs(type(Vector(1, 2)[0]), int)
+        self.assertEqual(repr(Vector(1., 2.5)), '(1.0, 2.5)')
+        self.assertTrue(np.array_equal(v.v, np.array([1., 2., 3.])))
+        with self.assertRaises(DimensionError):
+            Vector(1, 2) + Vector(1, 2, 3)
+        with self.assertRaises(DimensionError):
+            SmallVector(1, 2, 3, 4)
+
+    def test_pickle(self):
+        for v in (Vector(1., 2., 3.), Vector(1, 2), ArrayVector(1., 2.), Vector(1., 2., 3., 4.)):
+            for restored in (pickle.loads(pickle.dumps(v)), deepcopy(v)):
+                self.assertIs(type(restored), type(v))
+                self.assertEqual(restored, v)
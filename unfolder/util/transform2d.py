@@ -0,0 +1,95 @@
+""" Rigid and affine 2D transforms stored as (..., 2, 3) arrays [A | t].
+
+A transform maps a point p to A p + t. Stacks of transforms are processed
+with the same functions, leading dimensions broadcast.
+"""
+import numpy as np
+
+
+def identity(shape=()):
+    retval = np.zeros(shape + (2, 3))
+    retval[..., 0, 0] = 1.
+    retval[..., 1, 1] = 1.
+    return retval
+
+
+def rigidTransforms(origins, directions):
+    """ Rotate the x axis onto directions (unit vectors) and translate to origins. """
+    origins = np.asarray(origins, dtype=float)
+    directions = np.asarray(directions, dtype=float)
+    retval = np.empty(np.broadcast_shapes(origins.shape, directions.shape)[:-1] + (2, 3))
+    retval[..., 0, 0] = directions[..., 0]
+    retval[..., 0, 1] = -directions[..., 1]
+    retval[..., 1, 0] = directions[..., 1]
+    retval[..., 1, 1] = directions[..., 0]
+    retval[..., :, 2] = origins
+    return retval
+
+
+def compose(fst, snd):
+    """ The transform applying snd first and fst second. """
+    retval = np.empty(np.broadcast_shapes(fst.shape, snd.shape))
+    retval[..., :, :2] = fst[..., :, :2] @ snd[..., :, :2]
+    retval[..., :, 2] = (fst[..., :, :2] @ snd[..., :, 2, np.newaxis])[..., 0] + fst[..., :, 2]
+    return retval
+
+
+def invert(transforms):
+    """ The inverse transforms, works for any invertible affine transform. """
+    linear = np.linalg.inv(transforms[..., :, :2])
+    retval = np.empty(transforms.shape)
+    retval[..., :, :2] = linear
+    retval[..., :, 2] = -(linear @ transforms[..., :, 2, np.newaxis])[..., 0]
+    return retval
+
+
+def apply(transforms, points):
+    """ Map points (..., N, 2) with transforms (..., 2, 3). """
+    points = np.asarray(points, dtype=float)
+    return points @ np.swapaxes(transforms[..., :, :2], -1, -2) + transforms[..., np.newaxis, :, 2]
+
+
+class Affine2D:
+    """ A single 2D affine transform, composable with @ like matrices.
+
+    (fst @ snd) applies snd first and fst second, so chains of frames read
+    from left to right as outermost to innermost frame.
+    """
+
+    def __init__(self, matrix=None):
+        self.matrix = identity() if matrix is None else np.array(matrix, dtype=float).reshape(2, 3)
+
+    @classmethod
+    def rigid(cls, origin, direction):
+        """ The transform rotating the x axis onto direction (unit vector) and translating to origin. """
+        return cls(rigidTransforms(origin, direction))
+
+    @classmethod
+    def translation(cls, offset):
+        retval = cls()
+        retval.matrix[:, 2] = offset
+        return retval
+
+    @property
+    def linear(self):
+        return self.matrix[:, :2]
+
+    @property
+    def offset(self):
+        return self.matrix[:, 2]
+
+    def __matmul__(self, other):
+        return Affine2D(compose(self.matrix, other.matrix))
+
+    def inverse(self):
+        return Affine2D(invert(self.matrix))
+
+    def apply(self, points):
+        """ Map a point or an N x 2 array of points. """
+        return np.asarray(points, dtype=float) @ self.linear.T + self.offset
+
+    def __eq__(self, other):
+        return isinstance(other, Affine2D) and np.array_equal(self.matrix, other.matrix)
+
+    def __repr__(self):
+        return 'Affine2D(' + repr(self.matrix.tolist()) + ')'
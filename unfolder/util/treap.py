@@ -0,0 +1,130 @@
+import random
+
+
+class TreapNode:
+    __slots__ = ('item', 'priority', 'left', 'right', 'parent')
+
+    def __init__(self, item, priority):
+        self.item = item
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.parent = None
+
+
+class Treap:
+    """ A balanced binary tree of items in an order defined by the caller.
+
+    The tree does not compare items on its own, insert asks the caller where
+    a new item goes and from then on its position is fixed. So the order may
+    change over time as long as the caller swaps the items that trade places,
+    like the segments cut by a sweep line. Nodes know their parent, so the
+    neighbors of a node are found and a node is removed without comparing
+    items. All operations take O(log n) expected time.
+    """
+    def __init__(self, seed=None):
+        self._root = None
+        self._size = 0
+        self._random = random.Random(seed)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        node = self.first()
+        while node is not None:
+            yield node.item
+            node = self.successor(node)
+
+    def first(self):
+        node = self._root
+        if node is not None:
+            while node.left is not None:
+                node = node.left
+        return node
+
+    def insert(self, item, isBefore):
+        """ Add an item and return its node, isBefore(other) tells whether item goes before the item other. """
+        node = TreapNode(item, self._random.random())
+        parent = None
+        child = self._root
+        isLeft = False
+        while child is not None:
+            parent = child
+            isLeft = isBefore(child.item)
+            child = child.left if isLeft else child.right
+        node.parent = parent
+        if parent is None:
+            self._root = node
+        elif isLeft:
+            parent.left = node
+        else:
+            parent.right = node
+        while node.parent is not None and node.priority < node.parent.priority:
+            self._rotateUp(node)
+        self._size += 1
+        return node
+
+    def remove(self, node):
+        while node.left is not None or node.right is not None:
+            if node.right is None or (node.left is not None and node.left.priority < node.right.priority):
+                self._rotateUp(node.left)
+            else:
+                self._rotateUp(node.right)
+        self._replace(node, None)
+        node.parent = None
+        self._size -= 1
+
+    def predecessor(self, node):
+        if node.left is not None:
+            node = node.left
+            while node.right is not None:
+                node = node.right
+            return node
+        while node.parent is not None and node is node.parent.left:
+            node = node.parent
+        return node.parent
+
+    def successor(self, node):
+        if node.right is not None:
+            node = node.right
+            while node.left is not None:
+                node = node.left
+            return node
+        while node.parent is not None and node is node.parent.right:
+            node = node.parent
+        return node.parent
+
+    def swap(self, fst, snd):
+        """ Exchange the items of two nodes, the nodes stay where they are. """
+        (fst.item, snd.item) = (snd.item, fst.item)
+
+    # private
+
+    def _replace(self, node, other):
+        """ Put other in the place of node below the parent of node. """
+        parent = node.parent
+        if parent is None:
+            self._root = other
+        elif node is parent.left:
+            parent.left = other
+        else:
+            parent.right = other
+        if other is not None:
+            other.parent = parent
+
+    def _rotateUp(self, node):
+        parent = node.parent
+        isLeft = node is parent.left
+        self._replace(parent, node)
+        if isLeft:
+            parent.left = node.right
+            if node.right is not None:
+                node.right.parent = parent
+            node.right = parent
+        else:
+            parent.right = node.left
+            if node.left is not None:
+                node.left.parent = parent
+            node.left = parent
+        parent.parent = node
@@ -0,0 +1,79 @@
+import numpy as np
+
+
+def boxPairs(boxes, otherBoxes=None, cellSize=None):
+    """ The index pairs of overlapping axis aligned boxes, found with a uniform grid.
+
+    Boxes are given as N x 2 x 2 (min, max) corners. Every box is put into
+    all grid cells it covers, only boxes sharing a cell are compared. Without
+    otherBoxes the pairs (i, j), i < j, of overlapping boxes are returned,
+    otherwise the pairs of boxes[i] and otherBoxes[j]. Boxes that only touch
+    overlap. The pairs come as a P x 2 array, sorted and without duplicates.
+
+    The cell size defaults to the mean box extent, so a box covers only a
+    few cells.
+    """
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 2, 2)
+    sameBoxes = otherBoxes is None
+    otherBoxes = boxes if sameBoxes else np.asarray(otherBoxes, dtype=float).reshape(-1, 2, 2)
+    if not len(boxes) or not len(otherBoxes):
+        return np.empty((0, 2), dtype=np.int64)
+    allBoxes = np.concatenate((boxes, otherBoxes)) if not sameBoxes else boxes
+    if cellSize is None:
+        cellSize = getCellSize(allBoxes)
+    origin = allBoxes[:, 0].min(axis=0)
+    numRows = int(np.floor((allBoxes[:, 1, 1].max() - origin[1]) / cellSize)) + 1
+
+    (items, cells) = _cellEntries(boxes, origin, cellSize, numRows)
+    (otherItems, otherCells) = (items, cells) if sameBoxes else _cellEntries(otherBoxes, origin, cellSize, numRows)
+    order = np.argsort(otherCells, kind='stable')
+    (otherItems, otherCells) = (otherItems[order], otherCells[order])
+    begins = np.searchsorted(otherCells, cells, side='left')
+    counts = np.searchsorted(otherCells, cells, side='right') - begins
+    fst = np.repeat(items, counts)
+    snd = otherItems[_expandRanges(begins, counts)]
+    cells = np.repeat(cells, counts)
+
+    if sameBoxes:
+        keep = fst < snd
+        (fst, snd, cells) = (fst[keep], snd[keep], cells[keep])
+    # a pair shares several cells, it is only reported in the cell of the lower corner of the intersection
+    keep = np.ones(len(fst), dtype=bool)
+    lowCells = []
+    for axis in range(2):
+        lows = np.maximum(boxes[:, 0, axis][fst], otherBoxes[:, 0, axis][snd])
+        keep &= lows <= np.minimum(boxes[:, 1, axis][fst], otherBoxes[:, 1, axis][snd])
+        lowCells.append(np.floor((lows - origin[axis]) / cellSize).astype(np.int64))
+    keep &= lowCells[0] * numRows + lowCells[1] == cells
+    pairs = np.stack((fst[keep], snd[keep]), axis=-1)
+    return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+
+def getCellSize(boxes):
+    """ The mean extent of boxes, never 0. """
+    extents = boxes[:, 1] - boxes[:, 0]
+    cellSize = float(extents.max(axis=1).mean()) if len(boxes) else 0.
+    return cellSize if cellSize > 0 else 1.
+
+
+# private
+
+
+def _cellEntries(boxes, origin, cellSize, numRows):
+    """ The box and the cell key of every (box, covered cell) pair. """
+    lows = np.floor((boxes[:, 0] - origin) / cellSize).astype(np.int64)
+    highs = np.floor((boxes[:, 1] - origin) / cellSize).astype(np.int64)
+    extents = highs - lows + 1
+    numCells = extents[:, 0] * extents[:, 1]
+    items = np.repeat(np.arange(len(boxes)), numCells)
+    local = _expandRanges(np.zeros(len(boxes), dtype=np.int64), numCells)
+    columns = lows[items, 0] + local // extents[items, 1]
+    rows = lows[items, 1] + local % extents[items, 1]
+    return items, columns * numRows + rows
+
+
+def _expandRanges(begins, counts):
+    """ The concatenation of the ranges begins[i] .. begins[i] + counts[i]. """
+    total = int(counts.sum())
+    offsets = np.cumsum(counts) - counts
+    return np.arange(total) - np.repeat(offsets - begins, counts)
@@ -1,9 +1,28 @@
 from copy import copy
+from math import sqrt
+from numbers import Number, Real
+
 import numpy as np
 import numpy.linalg as lg
 
 
 class Vector:
+    """ A vector of any dimension.
+
+    Creating a Vector of dimension 2 or 3 from real coordinates returns a
+    SmallVector, all other vectors are stored in numpy arrays. Both behave
+    the same, ArrayVector always uses a numpy array.
+    """
+    __slots__ = ('v',)
+
+    def __new__(cls, *v):
+        if cls is Vector:
+            coords = _getSmallCoords(v)
+            if coords is not None:
+                return _fromCoords(coords)
+            cls = ArrayVector
+        return object.__new__(cls)
+
     def __init__(self, *v):
         if len(v) < 1:
             raise DimensionError('Vector must have finite dimension!')
@@ -24,7 +43,7 @@ class Vector:
 
     def __mul__(self, other):
         # works for vectors and scalars
-        res = np.dot(self.v, other)
+        res = np.dot(self.v, other.v if isVector(other) else other)
         return res if not isinstance(res, np.ndarray) else Vector(res)
 
     def __truediv__(self, scalar):
@@ -80,9 +99,164 @@ class Vector:
     def _hasSameDim(self, v):
         return len(self) == len(v)
 
+
+class ArrayVector(Vector):
+    """ A vector stored in a numpy array, whatever its dimension. """
+    __slots__ = ()
+
+
+class SmallVector(Vector):
+    """ A 2D or 3D vector stored in a tuple.
+
+    Vector returns these for 2 and 3 real coordinates, they do the math on
+    plain floats instead of numpy arrays, which costs a fraction of the numpy
+    call overhead. The coordinates are Python numbers.
+    """
+    __slots__ = ('coords',)
+
+    def __new__(cls, *v):
+        coords = _getSmallCoords(v)
+        if coords is None:
+            raise DimensionError('Small vectors need 2 or 3 real coordinates!')
+        return _fromCoords(coords)
+
+    def __init__(self, *v):
+        pass
+
+    def __reduce__(self):
+        return SmallVector, self.coords
+
+    @property
+    def v(self):
+        return np.array(self.coords)
+
+    def __add__(self, other):
+        coords = self.coords
+        otherCoords = _getCoords(other)
+        if len(coords) != len(otherCoords):
+            raise DimensionError('Can not sum vectors with different dimensions!')
+        if len(coords) == 3:
+            return _fromCoords((coords[0] + otherCoords[0], coords[1] + otherCoords[1],
+                                coords[2] + otherCoords[2]))
+        return _fromCoords((coords[0] + otherCoords[0], coords[1] + otherCoords[1]))
+
+    def __sub__(self, other):
+        coords = self.coords
+        otherCoords = _getCoords(other)
+        if len(coords) != len(otherCoords):
+            raise DimensionError('Can not subtract vectors with different dimensions!')
+        if len(coords) == 3:
+            return _fromCoords((coords[0] - otherCoords[0], coords[1] - otherCoords[1],
+                                coords[2] - otherCoords[2]))
+        return _fromCoords((coords[0] - otherCoords[0], coords[1] - otherCoords[1]))
+
+    def __mul__(self, other):
+        # works for vectors and scalars
+        coords = self.coords
+        if isinstance(other, Number):
+            if isinstance(other, np.generic):
+                other = other.item()
+            if len(coords) == 3:
+                return _fromCoords((coords[0] * other, coords[1] * other, coords[2] * other))
+            return _fromCoords((coords[0] * other, coords[1] * other))
+        otherCoords = _getCoords(other)
+        if len(coords) != len(otherCoords):
+            raise ValueError('Can not multiply vectors with different dimensions')
+        if len(coords) == 3:
+            return coords[0] * otherCoords[0] + coords[1] * otherCoords[1] + coords[2] * otherCoords[2]
+        return coords[0] * otherCoords[0] + coords[1] * otherCoords[1]
+
+    def __truediv__(self, scalar):
+        if not isinstance(scalar, (int, float, complex)):
+            raise DimensionError('Divisor must be scalar!')
+        if scalar == 0:
+            raise Exception('Cannot rescale vector by divisor 0')
+        coords = self.coords
+        if len(coords) == 3:
+            return _fromCoords((float(coords[0]) / scalar, float(coords[1]) / scalar, float(coords[2]) / scalar))
+        return _fromCoords((float(coords[0]) / scalar, float(coords[1]) / scalar))
+
+    def __xor__(self, other):
+        coords = self.coords
+        otherCoords = _getCoords(other)
+        if len(coords) != len(otherCoords):
+            raise DimensionError('Can not cross multiply vectors with different dimensions')
+        if len(coords) == 2:
+            # like numpy the cross product of 2D vectors is the z coordinate
+            return Vector(coords[0] * otherCoords[1] - coords[1] * otherCoords[0])
+        (x, y, z) = coords
+        (otherX, otherY, otherZ) = otherCoords
+        return _fromCoords((y * otherZ - z * otherY, z * otherX - x * otherZ, x * otherY - y * otherX))
+
+    def norm(self):
+        coords = self.coords
+        if len(coords) == 3:
+            return sqrt(coords[0] * coords[0] + coords[1] * coords[1] + coords[2] * coords[2])
+        return sqrt(coords[0] * coords[0] + coords[1] * coords[1])
+
+    def __len__(self):
+        return len(self.coords)
+
+    def __getitem__(self, item):
+        return self.coords[item]
+
+    def __iter__(self):
+        return iter(self.coords)
+
+    def __eq__(self, other):
+        if len(self.coords) != len(other):
+            raise DimensionError('Can not compare two vectors of different dimension')
+        for item, otherItem in zip(self.coords, other):
+            if item != otherItem:
+                return False
+        return True
+
+    def __copy__(self):
+        return _fromCoords(self.coords)
+
+    def __repr__(self):
+        return '(' + ', '.join(repr(coord) for coord in self.coords) + ')'
+
+
 def isVector(x):
     return isinstance(x, Vector)
 
+
 class DimensionError(Exception):
     def __init__(self, msg):
-        super(msg)
\ No newline at end of file
+        super().__init__(msg)
+
+
+# private
+
+
+def _getSmallCoords(v):
+    """ The coordinates as tuple of Python numbers if they make a small vector, otherwise None. """
+    if len(v) == 1:
+        v = v[0]
+        if isinstance(v, SmallVector):
+            return v.coords
+        if isinstance(v, np.ndarray):
+            if v.ndim != 1 or v.dtype.kind not in 'iuf':
+                return None
+            v = v.tolist()
+        elif not isinstance(v, (tuple, list)):
+            return None
+    if not 2 <= len(v) <= 3:
+        return None
+    for coord in v:
+        if not isinstance(coord, (int, float)):
+            if not isinstance(coord, Real):
+                return None
+            return tuple(coord.item() if isinstance(coord, np.generic) else coord for coord in v)
+    return tuple(v)
+
+
+def _fromCoords(coords):
+    self = object.__new__(SmallVector)
+    self.coords = coords
+    return self
+
+
+def _getCoords(v):
+    return v.coords if isinstance(v, SmallVector) else tuple(v)